@@ -0,0 +1,122 @@
+"""
+Write precompressed `.br` and `.gz` variants of the static assets.
+
+The server sends a variant instead of the original file to browsers that accept
+its encoding, so text assets (JS, CSS, JSON motions and model settings) are not
+compressed on every request. Run it again after updating the frontend or adding
+models; up-to-date variants are skipped and stale ones are rewritten. Brotli
+variants need the `Brotli` package (installed with the `bilibili` extra).
+
+Usage:
+    python scripts/precompress_static.py [dir ...] [--min-size 1024] [--clean]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DIRECTORIES = ["frontend", "web_tool", "live2d-models"]
+COMPRESSIBLE_EXTENSIONS = {
+    ".html",
+    ".js",
+    ".mjs",
+    ".css",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".wasm",
+    ".moc3",
+}
+# Variants saving less than this are not worth a second file
+MIN_SAVING = 0.1
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    compressors = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    except ImportError:
+        print("Brotli is not installed, only writing .gz variants.")
+    return compressors
+
+
+def _assets(directory: Path, min_size: int) -> Iterator[Path]:
+    for root, _, files in os.walk(directory):
+        for file in files:
+            path = Path(root) / file
+            if (
+                path.suffix.lower() in COMPRESSIBLE_EXTENSIONS
+                and path.stat().st_size >= min_size
+            ):
+                yield path
+
+
+def precompress(directory: Path, min_size: int) -> Dict[str, int]:
+    stats = {"written": 0, "up_to_date": 0, "skipped": 0, "saved_bytes": 0}
+    compressors = _compressors()
+    for path in _assets(directory, min_size):
+        source_stat = path.stat()
+        data = None
+        for suffix, compress in compressors.items():
+            variant = path.with_name(path.name + suffix)
+            if (
+                variant.exists()
+                and variant.stat().st_mtime_ns >= source_stat.st_mtime_ns
+            ):
+                stats["up_to_date"] += 1
+                continue
+            if data is None:
+                data = path.read_bytes()
+            compressed = compress(data)
+            if len(compressed) > len(data) * (1 - MIN_SAVING):
+                variant.unlink(missing_ok=True)
+                stats["skipped"] += 1
+                continue
+            variant.write_bytes(compressed)
+            stats["written"] += 1
+            stats["saved_bytes"] += len(data) - len(compressed)
+    return stats
+
+
+def clean(directory: Path) -> int:
+    removed = 0
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith((".br", ".gz")) and (Path(root) / file[:-3]).exists():
+                (Path(root) / file).unlink()
+                removed += 1
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directories", nargs="*", default=DEFAULT_DIRECTORIES)
+    parser.add_argument("--min-size", type=int, default=1024)
+    parser.add_argument(
+        "--clean", action="store_true", help="remove the variants instead"
+    )
+    args = parser.parse_args()
+
+    for name in args.directories:
+        directory = Path(name)
+        if not directory.is_absolute():
+            directory = REPO_ROOT / directory
+        if not directory.is_dir():
+            print(f"{name}: not a directory, skipped")
+            continue
+        if args.clean:
+            print(f"{name}: removed {clean(directory)} variants")
+        else:
+            print(f"{name}: {precompress(directory, args.min_size)}")
+
+
+if __name__ == "__main__":
+    main()
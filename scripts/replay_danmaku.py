@@ -0,0 +1,102 @@
+"""
+Replay a danmaku log through the aggregation stage of the Bilibili client.
+
+The log has one JSON object per line: {"time": seconds, "uid": ..., "uname": ...,
+"text": ...}. Without a log, a synthetic busy room is generated. The VTuber is
+simulated by answering every digest in --turn-seconds.
+
+Usage:
+    python scripts/replay_danmaku.py [log.jsonl] [--turn-seconds 8] [--window 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from open_llm_vtuber.live.danmaku_aggregator import (  # noqa: E402
+    Danmaku,
+    DanmakuAggregator,
+    load_danmaku_log,
+    replay,
+)
+
+SYNTHETIC_PHRASES = [
+    "666",
+    "哈哈哈哈",
+    "主播晚上好",
+    "唱首歌吧",
+    "今天玩什么游戏",
+    "好可爱",
+    "?",
+    "草",
+    "主播吃饭了吗",
+    "这个模型是谁做的",
+]
+
+
+def synthetic_room(minutes: float, rate: float, users: int, seed: int) -> List[Danmaku]:
+    """A room sending `rate` messages per second, mostly short and repetitive."""
+    rng = random.Random(seed)
+    messages = []
+    t = 0.0
+    while t < minutes * 60:
+        t += rng.expovariate(rate)
+        uid = rng.randrange(users)
+        text = rng.choice(SYNTHETIC_PHRASES)
+        if rng.random() < 0.3:
+            text = f"{text}{'!' * rng.randrange(1, 4)}"
+        if rng.random() < 0.2:
+            text = f"问题{rng.randrange(1000)}: {text}"
+        messages.append(Danmaku(text, str(uid), f"user{uid}", t))
+    return messages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("log", nargs="?", help="danmaku log (JSON lines)")
+    parser.add_argument("--turn-seconds", type=float, default=8.0)
+    parser.add_argument("--window", type=float, default=2.0)
+    parser.add_argument("--digest-size", type=int, default=5)
+    parser.add_argument("--user-per-minute", type=int, default=4)
+    parser.add_argument("--similarity", type=float, default=0.8)
+    parser.add_argument("--minutes", type=float, default=2.0, help="synthetic log")
+    parser.add_argument("--rate", type=float, default=20.0, help="synthetic log")
+    parser.add_argument("--quiet", action="store_true", help="only print stats")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            messages = list(load_danmaku_log(f))
+    else:
+        messages = synthetic_room(args.minutes, args.rate, users=200, seed=0)
+
+    aggregator = DanmakuAggregator(
+        window_seconds=args.window,
+        similarity_threshold=args.similarity,
+        user_messages_per_minute=args.user_per_minute,
+        digest_size=args.digest_size,
+        seed=0,
+    )
+    digests = replay(aggregator, messages, args.turn_seconds)
+
+    if not args.quiet:
+        for at, text in digests:
+            print(f"[{at:8.2f}s] {text}\n")
+    stats = aggregator.stats.to_dict()
+    stats["conversation_turns"] = len(digests)
+    stats["window_seconds"] = round(aggregator.current_window, 2)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, project_root)
 
 from src.open_llm_vtuber.live.bilibili_live import BiliBiliLivePlatform
+from src.open_llm_vtuber.live.danmaku_aggregator import DanmakuAggregator
 from src.open_llm_vtuber.config_manager.utils import read_yaml, validate_config
 
 
@@ -36,9 +37,22 @@ async def main():
 
         logger.info(f"Connecting to BiliBili Live rooms: {bilibili_config.room_ids}")
 
+        aggregator = None
+        if bilibili_config.aggregate_danmaku:
+            aggregator = DanmakuAggregator(
+                window_seconds=bilibili_config.danmaku_window_seconds,
+                dedup_seconds=bilibili_config.danmaku_dedup_seconds,
+                similarity_threshold=bilibili_config.danmaku_similarity,
+                user_messages_per_minute=bilibili_config.danmaku_user_per_minute,
+                digest_size=bilibili_config.danmaku_digest_size,
+            )
+
         # Initialize and run the BiliBili Live platform
         platform = BiliBiliLivePlatform(
-            room_ids=bilibili_config.room_ids, sessdata=bilibili_config.sessdata
+            room_ids=bilibili_config.room_ids,
+            sessdata=bilibili_config.sessdata,
+            aggregator=aggregator,
+            record_path=bilibili_config.danmaku_record_path,
         )
 
         await platform.run()
@@ -10,6 +10,7 @@ from .agent_interface import AgentInterface
 from ..output_types import AudioOutput, Actions, DisplayText
 from ..input_types import BatchInput
 from ...chat_history_manager import get_metadata, update_metadate
+from ...utils.cache_manager import cache_manager
 
 
 class HumeAIAgent(AgentInterface):
@@ -50,7 +51,7 @@ class HumeAIAgent(AgentInterface):
         self._current_history_uid = None
 
         # Create cache directory if it doesn't exist
-        self.cache_dir = Path("./cache")
+        self.cache_dir = Path(cache_manager.directory)
         self.cache_dir.mkdir(exist_ok=True)
 
     async def connect(self, resume_chat_group_id: Optional[str] = None):
@@ -198,7 +199,9 @@ class HumeAIAgent(AgentInterface):
                     elif msg_type == "audio_output":
                         if msg_id == self._current_id and self._current_text:
                             audio_data = base64.b64decode(response_data["data"])
-                            cache_file = self.cache_dir / f"evi_audio_{msg_id}.wav"
+                            cache_file = cache_manager.file_path(
+                                f"evi_audio_{msg_id}.wav", owner="HumeAIAgent"
+                            )
 
                             with open(cache_file, "wb") as f:
                                 f.write(audio_data)
@@ -206,7 +209,7 @@ class HumeAIAgent(AgentInterface):
 
                             # Create AudioOutput with DisplayText
                             yield AudioOutput(
-                                audio_path=str(cache_file),
+                                audio_path=cache_file,
                                 display_text=DisplayText(text=self._current_text),
                                 transcript=self._current_text,
                                 actions=Actions(),
@@ -251,6 +254,6 @@ class HumeAIAgent(AgentInterface):
         # Clean up cache files
         try:
             for file in self.cache_dir.glob("evi_audio_*.wav"):
-                file.unlink()
+                cache_manager.remove(str(file))
         except Exception as e:
             logger.error(f"Error cleaning up cache files: {e}")
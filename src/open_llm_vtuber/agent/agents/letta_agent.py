@@ -9,6 +9,7 @@ from ..transformers import (
 )
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
+from ...utils.async_utils import iterate_in_thread
 from letta_client import Letta
 
 
@@ -57,18 +58,17 @@ class LettaAgent(AgentInterface):
     def handle_interrupt(self, heard_response: str) -> None:
         pass
 
-    async def generator_to_async(self, gen):
-        for item in gen:
-            yield item
-
     async def chat(self, input_data: BatchInput) -> AsyncIterator[SentenceOutput]:
         messages = self._to_messages(input_data)
-        stream = self.generator_to_async(
-            self.client.agents.messages.create_stream(
+        # The Letta client is synchronous; open and consume the stream on a
+        # worker thread so the event loop is not blocked between tokens
+        stream = iterate_in_thread(
+            lambda: self.client.agents.messages.create_stream(
                 agent_id=self.id,
                 messages=messages,
                 stream_tokens=True,
-            )
+            ),
+            thread_name="letta-stream",
         )
 
         complete_response = ""
@@ -32,6 +32,7 @@ class DisplayText:
     text: str
     name: Optional[str] = "AI"  # Keep the name field for frontend display
     avatar: Optional[str] = None
+    sentence_id: Optional[int] = None  # Links the audio to streamed text deltas
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
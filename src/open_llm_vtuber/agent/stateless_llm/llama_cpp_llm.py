@@ -2,12 +2,12 @@
 This class provides a stateless interface to llama.cpp for language generation.
 """
 
-import asyncio
 from typing import AsyncIterator, List, Dict, Any
 from llama_cpp import Llama
 from loguru import logger
 
 from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.async_utils import iterate_in_thread
 
 
 class LLM(StatelessLLMInterface):
@@ -55,17 +55,18 @@ class LLM(StatelessLLMInterface):
                     *messages,
                 ]
 
-            # Create chat completion in a separate thread to avoid blocking
-            chat_completion = await asyncio.get_event_loop().run_in_executor(
-                None,
+            # Both creating the completion and pulling every chunk from it are
+            # blocking calls, so the whole stream is consumed on a worker thread
+            chat_completion = iterate_in_thread(
                 lambda: self.llm.create_chat_completion(
                     messages=messages_with_system,
                     stream=True,
                 ),
+                thread_name="llama-cpp-stream",
             )
 
             # Process chunks
-            for chunk in chat_completion:
+            async for chunk in chat_completion:
                 if chunk.get("choices") and chunk["choices"][0].get("delta"):
                     content = chunk["choices"][0]["delta"].get("content", "")
                     if content:
@@ -1,4 +1,5 @@
 import atexit
+import threading
 import requests
 from loguru import logger
 from .openai_compatible_llm import AsyncLLM
@@ -27,16 +28,27 @@ class OllamaLLM(AsyncLLM):
             project_id=project_id,
             temperature=temperature,
         )
+        # Preloading can take a long time for large models. The agent is created
+        # from inside the event loop, so do it in the background instead of
+        # blocking every connected client until the model is resident.
+        threading.Thread(
+            target=self._preload_model, name="ollama-preload", daemon=True
+        ).start()
+        # If keep_alive is less than 0, register cleanup to unload the model
+        if unload_at_exit:
+            atexit.register(self.cleanup)
+
+    def _preload_model(self) -> None:
+        """Ask the Ollama server to load the model into memory"""
         try:
-            # preload model
             logger.info("Preloading model for Ollama")
             # Send the POST request to preload model
             logger.debug(
                 requests.post(
-                    base_url.replace("/v1", "") + "/api/chat",
+                    self.base_url.replace("/v1", "") + "/api/chat",
                     json={
-                        "model": model,
-                        "keep_alive": keep_alive,
+                        "model": self.model,
+                        "keep_alive": self.keep_alive,
                     },
                 )
             )
@@ -47,9 +59,6 @@ class OllamaLLM(AsyncLLM):
             )
         except Exception as e:
             logger.error(f"Failed to preload model: {e}")
-        # If keep_alive is less than 0, register cleanup to unload the model
-        if unload_at_exit:
-            atexit.register(self.cleanup)
 
     def __del__(self):
         """Destructor to unload the model"""
@@ -4,6 +4,7 @@ compatible endpoints for language generation where the language model is not
 trained using a ChatML format.
 """
 
+import asyncio
 import requests
 import json
 from jinja2 import Template
@@ -11,6 +12,7 @@ from loguru import logger
 from typing import AsyncIterator, List, Dict, Any
 
 from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.async_utils import iterate_in_thread
 
 
 TEMPLATES = {
@@ -157,20 +159,28 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
                 "temperature": self.temperature,
                 "prompt": prompt,
             }
-            with requests.post(
-                self.completion_url, headers=self.prompt_headers, json=data, stream=True
-            ) as response:
-                for line in response.iter_lines():
-                    if line:
-                        line = self._clean_raw_bytes(line)
-                        next_token = self._process_line(line)
-                        if next_token:
-                            if next_token == self.eot_token:
-                                break
-                            yield next_token
+            # requests is blocking, so both the connection and the line reads
+            # run on worker threads to keep the event loop responsive
+            stream = await asyncio.to_thread(
+                requests.post,
+                self.completion_url,
+                headers=self.prompt_headers,
+                json=data,
+                stream=True,
+            )
+            async for line in iterate_in_thread(
+                stream.iter_lines, on_cancel=stream.close
+            ):
+                if line:
+                    line = self._clean_raw_bytes(line)
+                    next_token = self._process_line(line)
+                    if next_token:
+                        if next_token == self.eot_token:
+                            break
+                        yield next_token
         except Exception as e:
             logger.error(f"LLM API WITH TEMPLATE: Error occurred: {e}")
-            logger.info(f"Base URL: {self.base_url}")
+            logger.info(f"Base URL: {self.completion_url}")
             logger.info(f"Model: {self.model}")
             logger.info(f"Messages: {messages}")
             logger.info(f"temperature: {self.temperature}")
@@ -178,9 +188,9 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
         finally:
             # make sure the stream is properly closed
             # so when interrupted, no more tokens will being generated.
-            if stream:
+            if stream is not None:
                 logger.debug("Chat completion finished.")
-                await stream.close()
+                stream.close()
                 logger.debug("Stream closed.")
 
     def _clean_raw_bytes(self, line):
@@ -5,8 +5,8 @@ from .output_types import Actions, SentenceOutput, DisplayText
 from ..utils.tts_preprocessor import tts_filter as filter_text
 from ..live2d_model import Live2dModel
 from ..config_manager import TTSPreprocessorConfig
-from ..utils.sentence_divider import SentenceDivider
-from ..utils.sentence_divider import SentenceWithTags, TagState
+from ..utils.sentence_divider import DeltaFilter, SentenceDivider
+from ..utils.sentence_divider import SentenceWithTags, TagState, text_delta
 from loguru import logger
 
 
@@ -46,7 +46,7 @@ def sentence_divider(
             async for item in divider.process_stream(stream_from_func):
                 if isinstance(item, SentenceWithTags):
                     logger.debug(f"sentence_divider yielding sentence: {item}")
-                elif isinstance(item, dict):
+                elif isinstance(item, dict) and item.get("type") != "text-delta":
                     logger.debug(f"sentence_divider yielding dict: {item}")
                 yield item  # Yield either SentenceWithTags or dict
             # Flushing is handled within divider.process_stream
@@ -59,6 +59,7 @@ def sentence_divider(
 def actions_extractor(live2d_model: Live2dModel):
     """
     Decorator that extracts actions from sentences, passing through dicts.
+    The emotion keys are removed from text deltas.
     """
 
     def decorator(
@@ -75,8 +76,17 @@ def actions_extractor(live2d_model: Live2dModel):
             Union[Tuple[SentenceWithTags, Actions], Dict[str, Any]]
         ]:  # Yield type hint
             stream = func(*args, **kwargs)
+            emotion_filter = DeltaFilter(
+                [f"[{key}]" for key in live2d_model.emo_map.keys()]
+            )
+            last_sentence_id = None
             async for item in stream:
-                if isinstance(item, SentenceWithTags):
+                if isinstance(item, dict) and item.get("type") == "text-delta":
+                    last_sentence_id = item["sentence_id"]
+                    text = emotion_filter.feed(item["text"])
+                    if text:
+                        yield {**item, "text": text}
+                elif isinstance(item, SentenceWithTags):
                     sentence = item
                     actions = Actions()
                     # Only extract emotions for non-tag text
@@ -95,6 +105,10 @@ def actions_extractor(live2d_model: Live2dModel):
                     logger.warning(
                         f"actions_extractor received unexpected type: {type(item)}"
                     )
+            # A "[" at the very end that never became an emotion key
+            text = emotion_filter.flush()
+            if text:
+                yield text_delta(last_sentence_id, text)
 
         return wrapper
 
@@ -140,7 +154,7 @@ def display_processor():
                             elif tag.state == TagState.END:
                                 text = ")"
 
-                    display = DisplayText(text=text)  # Simplified DisplayText creation
+                    display = DisplayText(text=text, sentence_id=sentence.sentence_id)
                     yield sentence, display, actions  # Yield the tuple
                 elif isinstance(item, dict):
                     # Pass through dictionaries
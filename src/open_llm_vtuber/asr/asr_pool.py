@@ -0,0 +1,450 @@
+"""
+ASR execution layer with model replicas, a fair request queue and metrics.
+
+Every session shares one ASR engine. Calling a single faster-whisper or sherpa
+model from many threads at once oversubscribes the CPU/GPU and gives no control
+over waiting times, so transcription requests go through `ASRWorkerPool`:
+
+- `replicas` copies of the model each serve one request at a time.
+- Replicas run on threads, or in worker processes for engines whose Python-side
+  work holds the GIL. Audio is handed to worker processes through shared memory,
+  so the array itself is never pickled.
+- Waiting requests are served round-robin per source (see `asr_request_source`),
+  so a burst of uploads on the HTTP endpoint does not starve live sessions.
+- Engines that can decode several utterances at once (`transcribe_batch`, e.g.
+  faster-whisper) get the requests that arrive within a short window as a batch.
+- Each request can time out, and queue/run times are recorded in `metrics`.
+"""
+
+import asyncio
+import contextvars
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Deque, Dict, List, Literal
+
+import numpy as np
+from loguru import logger
+
+from .asr_interface import ASRInterface
+
+# Identifies who is asking for a transcription; requests are served round-robin
+# between sources. Set it (e.g. to "http") around a call to change the source.
+asr_request_source: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "asr_request_source", default="default"
+)
+
+
+@dataclass
+class _Job:
+    audio: np.ndarray
+    future: asyncio.Future
+    source: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class _FairQueue:
+    """Round-robin queue over per-source FIFO queues."""
+
+    def __init__(self):
+        self._by_source: "OrderedDict[str, Deque[_Job]]" = OrderedDict()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(len(jobs) for jobs in self._by_source.values())
+
+    def put(self, job: _Job) -> None:
+        self._by_source.setdefault(job.source, deque()).append(job)
+        self._changed.set()
+
+    def get_nowait(self) -> _Job | None:
+        if not self._by_source:
+            return None
+        source, jobs = next(iter(self._by_source.items()))
+        job = jobs.popleft()
+        if jobs:
+            # Let the other sources go first next time
+            self._by_source.move_to_end(source)
+        else:
+            del self._by_source[source]
+        return job
+
+    async def get(self) -> _Job:
+        while True:
+            job = self.get_nowait()
+            if job is not None:
+                return job
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def get_batch(self, max_size: int, window: float) -> List[_Job]:
+        """Wait for a job, then collect more for up to `window` seconds."""
+        batch = [await self.get()]
+        deadline = time.monotonic() + window
+        while len(batch) < max_size:
+            job = self.get_nowait()
+            if job is not None:
+                batch.append(job)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+
+class ASRPoolMetrics:
+    """Rolling queue-time and run-time statistics of an ASR worker pool."""
+
+    def __init__(self, window: int = 200):
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self._queue_times: Deque[float] = deque(maxlen=window)
+        self._run_times: Deque[float] = deque(maxlen=window)
+
+    def record(self, queue_time: float, run_time: float, ok: bool) -> None:
+        self._queue_times.append(queue_time)
+        self._run_times.append(run_time)
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    @staticmethod
+    def _summary(values: Deque[float]) -> Dict[str, float]:
+        if not values:
+            return {"avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(values)
+        return {
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "queue_time": self._summary(self._queue_times),
+            "run_time": self._summary(self._run_times),
+        }
+
+
+def _process_worker_main(
+    conn: Connection, asr_model: str, settings: Dict[str, Any]
+) -> None:
+    """Entry point of an ASR worker process: load the model once, serve jobs."""
+    from .asr_factory import ASRFactory
+
+    try:
+        engine = ASRFactory.get_asr_system(asr_model, **settings)
+    except Exception as e:
+        conn.send(("error", f"Failed to load ASR model: {e}"))
+        return
+    conn.send(("ready", hasattr(engine, "transcribe_batch")))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        # One shared memory block holds all utterances of the job back to back
+        shm_name, lengths = job
+        shm = SharedMemory(name=shm_name)
+        audios = []
+        try:
+            offset = 0
+            for length in lengths:
+                audios.append(
+                    np.ndarray(
+                        (length,), dtype=np.float32, buffer=shm.buf, offset=offset
+                    )
+                )
+                offset += length * 4
+            if len(audios) > 1:
+                texts = engine.transcribe_batch(audios)
+            else:
+                texts = [engine.transcribe_np(audios[0])]
+            conn.send(("ok", texts))
+        except Exception as e:
+            conn.send(("error", str(e)))
+        finally:
+            audios = None
+            try:
+                shm.close()
+            except BufferError:
+                # The engine still references the buffer; the parent unlinks it
+                pass
+
+
+class _ThreadReplica:
+    """A model replica used from the event loop (blocking calls go to threads)."""
+
+    def __init__(self, asr_model: str, settings: Dict[str, Any]):
+        from .asr_factory import ASRFactory
+
+        self.engine: ASRInterface = ASRFactory.get_asr_system(asr_model, **settings)
+        self.lock = threading.Lock()
+        self.supports_batch = hasattr(self.engine, "transcribe_batch")
+
+    async def transcribe(self, audio: np.ndarray) -> str:
+        await self._acquire()
+        try:
+            # Keep native async implementations (e.g. Azure) instead of forcing a thread
+            return await self.engine.async_transcribe_np(audio)
+        finally:
+            self.lock.release()
+
+    async def transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        return await asyncio.to_thread(self._transcribe_batch_blocking, audios)
+
+    def transcribe_blocking(self, audio: np.ndarray) -> str:
+        with self.lock:
+            return self.engine.transcribe_np(audio)
+
+    def _transcribe_batch_blocking(self, audios: List[np.ndarray]) -> List[str]:
+        with self.lock:
+            return self.engine.transcribe_batch(audios)
+
+    async def _acquire(self) -> None:
+        """Take the lock without blocking the event loop."""
+        if self.lock.acquire(blocking=False):
+            return
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self.lock.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The thread still gets the lock; hand it back once it does
+            acquiring.add_done_callback(
+                lambda done: done.cancelled() or self.lock.release()
+            )
+            raise
+
+    def close(self) -> None:
+        pass
+
+
+class _ProcessReplica:
+    """A model replica living in its own process, restarted if it crashes."""
+
+    def __init__(self, asr_model: str, settings: Dict[str, Any]):
+        self.asr_model = asr_model
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.supports_batch = False
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._start()
+
+    def _start(self) -> None:
+        # spawn works the same on every platform and is safe with CUDA
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_process_worker_main,
+            args=(child_conn, self.asr_model, self.settings),
+            name="asr-worker",
+            daemon=True,
+        )
+        self._process.start()
+        self._conn = parent_conn
+        try:
+            status, detail = self._conn.recv()
+        except (EOFError, OSError) as e:
+            status, detail = "error", f"ASR worker process exited while loading: {e}"
+        if status != "ready":
+            self._process.join(timeout=1)
+            raise RuntimeError(detail)
+        self.supports_batch = detail
+        logger.info(f"ASR worker process {self._process.pid} ready")
+
+    async def transcribe(self, audio: np.ndarray) -> str:
+        return await asyncio.to_thread(self.transcribe_blocking, audio)
+
+    async def transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        return await asyncio.to_thread(self._run_job, audios)
+
+    def transcribe_blocking(self, audio: np.ndarray) -> str:
+        return self._run_job([audio])[0]
+
+    def _run_job(self, audios: List[np.ndarray]) -> List[str]:
+        with self.lock:
+            if not self._process or not self._process.is_alive():
+                logger.warning("ASR worker process is not running, restarting it")
+                self._start()
+            total = sum(audio.nbytes for audio in audios)
+            shm = SharedMemory(create=True, size=max(total, 1))
+            try:
+                np.ndarray((total // 4,), dtype=np.float32, buffer=shm.buf)[:] = (
+                    np.concatenate(audios)
+                )
+                self._conn.send((shm.name, [len(audio) for audio in audios]))
+                try:
+                    status, result = self._conn.recv()
+                except (EOFError, OSError) as e:
+                    self._process.join(timeout=1)
+                    raise RuntimeError(f"ASR worker process crashed: {e}") from e
+            finally:
+                shm.close()
+                shm.unlink()
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def close(self) -> None:
+        if self._process and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+
+
+class ASRWorkerPool(ASRInterface):
+    """Serves transcription requests with a fixed number of model replicas."""
+
+    def __init__(
+        self,
+        asr_model: str,
+        settings: Dict[str, Any],
+        replicas: int = 1,
+        mode: Literal["thread", "process"] = "thread",
+        request_timeout: float | None = None,
+        batch_window_ms: float = 0,
+        max_batch_size: int = 8,
+    ):
+        """
+        Args:
+            asr_model: Name of the ASR model, as accepted by ASRFactory.
+            settings: Keyword arguments for the selected ASR model.
+            replicas: Number of model copies serving requests in parallel.
+            mode: "thread" keeps replicas in this process, "process" runs each
+                replica in its own worker process.
+            request_timeout: Seconds a request may wait and run in total.
+                None waits indefinitely.
+            batch_window_ms: How long a replica waits for more requests to decode
+                together, for engines supporting batches. 0 disables batching.
+            max_batch_size: Maximum number of utterances decoded in one batch.
+        """
+        self.asr_model = asr_model
+        self.mode = mode
+        self.request_timeout = request_timeout
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self.metrics = ASRPoolMetrics()
+        replica_cls = _ProcessReplica if mode == "process" else _ThreadReplica
+        self._replicas = [
+            replica_cls(asr_model, settings) for _ in range(max(1, replicas))
+        ]
+        self._queue: _FairQueue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        logger.info(
+            f"ASR worker pool ready: {len(self._replicas)} x {asr_model} ({mode})"
+        )
+
+    def _ensure_workers(self) -> None:
+        """Start the worker tasks on the running loop (once per loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        for task in self._workers:
+            task.cancel()
+        self._loop = loop
+        self._queue = _FairQueue()
+        self._workers = [
+            loop.create_task(self._worker(replica)) for replica in self._replicas
+        ]
+
+    async def _worker(self, replica: _ThreadReplica | _ProcessReplica) -> None:
+        batching = (
+            replica.supports_batch and self.batch_window > 0 and self.max_batch_size > 1
+        )
+        while True:
+            if batching:
+                jobs = await self._queue.get_batch(
+                    self.max_batch_size, self.batch_window
+                )
+            else:
+                jobs = [await self._queue.get()]
+            # Skip requests that timed out or were cancelled while queued
+            jobs = [job for job in jobs if not job.future.done()]
+            if not jobs:
+                continue
+            started = time.monotonic()
+            ok = False
+            try:
+                if len(jobs) > 1:
+                    texts = await replica.transcribe_batch([j.audio for j in jobs])
+                else:
+                    texts = [await replica.transcribe(jobs[0].audio)]
+                ok = True
+                for job, text in zip(jobs, texts):
+                    if not job.future.done():
+                        job.future.set_result(text)
+            except asyncio.CancelledError:
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.cancel()
+                raise
+            except Exception as e:
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            finally:
+                run_time = time.monotonic() - started
+                for job in jobs:
+                    queue_time = started - job.enqueued_at
+                    self.metrics.record(queue_time, run_time, ok)
+                    logger.debug(
+                        f"ASR request from '{job.source}': queued "
+                        f"{queue_time * 1000:.0f} ms, ran {run_time * 1000:.0f} ms "
+                        f"(batch of {len(jobs)}), {len(self._queue)} waiting"
+                    )
+
+    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+        """Queue a transcription and wait for a free replica to process it."""
+        self._ensure_workers()
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        job = _Job(
+            audio=audio,
+            future=self._loop.create_future(),
+            source=asr_request_source.get(),
+        )
+        self._queue.put(job)
+        try:
+            return await asyncio.wait_for(job.future, timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.timed_out += 1
+            logger.warning(
+                f"ASR request timed out after {self.request_timeout}s "
+                f"({len(self._queue)} requests waiting)"
+            )
+            raise
+
+    def transcribe_np(self, audio: np.ndarray) -> str:
+        """Transcribe synchronously on the first replica, bypassing the queue."""
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        return self._replicas[0].transcribe_blocking(audio)
+
+    def close(self) -> None:
+        """Stop worker tasks and worker processes."""
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+        for replica in self._replicas:
+            replica.close()
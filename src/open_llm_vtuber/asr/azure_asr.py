@@ -4,12 +4,11 @@ import numpy as np
 from loguru import logger
 import azure.cognitiveservices.speech as speechsdk
 from .asr_interface import ASRInterface
+from ..utils.cache_manager import cache_manager
 import soundfile as sf
 import uuid
 import asyncio
 
-CACHE_DIR = "cache"
-
 
 class VoiceRecognition(ASRInterface):
     def __init__(
@@ -77,10 +76,9 @@ class VoiceRecognition(ASRInterface):
         Raises:
             Exception: If transcription fails
         """
-        temp_file = os.path.join(CACHE_DIR, f"{uuid.uuid4()}.wav")
+        temp_file = cache_manager.file_path(f"{uuid.uuid4()}.wav", owner="AzureASR")
 
         try:
-            os.makedirs(CACHE_DIR, exist_ok=True)
             sf.write(temp_file, audio, 16000, "PCM_16")
 
             audio_config = speechsdk.AudioConfig(filename=temp_file)
@@ -119,8 +117,7 @@ class VoiceRecognition(ASRInterface):
             raise
         finally:
             try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+                cache_manager.remove(temp_file)
             except Exception as e:
                 logger.debug(f"Failed to remove temporary file {temp_file}: {e}")
 
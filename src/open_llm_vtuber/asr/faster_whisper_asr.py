@@ -1,12 +1,16 @@
 import numpy as np
-from typing import Any, Optional
+from typing import Any, List, Optional
 from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
 from .asr_interface import ASRInterface
 
 
 class VoiceRecognition(ASRInterface):
     BEAM_SEARCH = True
     ALLOWED_LANGUAGES = {"en", "ko"}
+    # Utterances longer than one Whisper window are transcribed one by one
+    MAX_BATCH_SECONDS = 30
     # SAMPLE_RATE # Defined in asr_interface.py
 
     def __init__(
@@ -57,3 +61,77 @@ class VoiceRecognition(ASRInterface):
             return ""
         else:
             return "".join(text)
+
+    def transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        """
+        Transcribe several utterances with one batched encoder/decoder pass.
+
+        Each utterance fits in a single 30 s Whisper window, so the mel features are
+        stacked into one batch and decoded together, which is much faster than
+        decoding them one by one. Batched decoding skips the temperature fallback
+        of `transcribe()`; longer utterances go through `transcribe_np`.
+
+        Args:
+            audios: Utterances as float32 arrays sampled at 16 kHz.
+
+        Returns:
+            List[str]: The transcriptions, in the order of `audios`.
+        """
+        results = [""] * len(audios)
+        batch = []
+        for i, audio in enumerate(audios):
+            if len(audio) > self.MAX_BATCH_SECONDS * self.SAMPLE_RATE:
+                results[i] = self.transcribe_np(audio)
+            elif len(audio) > 0:
+                batch.append(i)
+        if not batch:
+            return results
+
+        features = np.stack(
+            [pad_or_trim(self.model.feature_extractor(audios[i])) for i in batch]
+        )
+        encoder_output = self.model.encode(features)
+
+        language = self.LANG if self.LANG and self.LANG != "auto" else None
+        if language or not self.model.model.is_multilingual:
+            languages = [language or "en"] * len(batch)
+        else:
+            languages = [
+                probabilities[0][0][2:-2]  # "<|en|>" -> "en"
+                for probabilities in self.model.model.detect_language(encoder_output)
+            ]
+
+        tokenizers = {}
+        prompts = []
+        for lang in languages:
+            if lang not in tokenizers:
+                tokenizers[lang] = Tokenizer(
+                    self.model.hf_tokenizer,
+                    self.model.model.is_multilingual,
+                    task="transcribe",
+                    language=lang,
+                )
+            tokenizer = tokenizers[lang]
+            previous_tokens = (
+                tokenizer.encode(" " + self.prompt.strip()) if self.prompt else []
+            )
+            prompts.append(
+                self.model.get_prompt(
+                    tokenizer, previous_tokens, without_timestamps=True
+                )
+            )
+
+        outputs = self.model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=5 if self.BEAM_SEARCH else 1,
+            max_length=self.model.max_length - max(len(p) for p in prompts),
+            suppress_blank=True,
+            suppress_tokens=[-1],
+        )
+
+        for i, lang, output in zip(batch, languages, outputs):
+            if lang.lower() not in self.ALLOWED_LANGUAGES:
+                continue
+            results[i] = tokenizers[lang].decode(output.sequences_ids[0])
+        return results
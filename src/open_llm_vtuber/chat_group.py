@@ -4,6 +4,8 @@ from fastapi import WebSocket
 import json
 from loguru import logger
 
+from .client_sender import ClientSender, OutboundPayload
+
 
 @dataclass
 class Group:
@@ -290,10 +292,21 @@ async def broadcast_to_group(
     client_connections: Dict[str, WebSocket],
     exclude_uid: Optional[str] = None,
 ) -> None:
-    """Broadcasts a message to all members in a group except the sender"""
+    """
+    Broadcasts a message to all members in a group except the sender
+
+    The message is serialized once. Client connections with a send queue
+    (`ClientSender`) get it queued without waiting, so a slow member does not
+    delay the others.
+    """
+    payload = OutboundPayload(message)
     for member_uid in group_members:
         if member_uid != exclude_uid and member_uid in client_connections:
+            connection = client_connections[member_uid]
             try:
-                await client_connections[member_uid].send_text(json.dumps(message))
+                if isinstance(connection, ClientSender):
+                    connection.enqueue(payload)
+                else:
+                    await connection.send_text(payload.text)
             except Exception as e:
                 logger.error(f"Failed to broadcast to {member_uid}: {e}")
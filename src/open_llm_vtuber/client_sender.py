@@ -0,0 +1,223 @@
+"""
+Per-connection outbound queues for the client WebSocket.
+
+Every client connection gets a `ClientSender`: messages are put in a bounded
+queue and a writer task sends them in order. Putting a message in the queue never
+waits for the network, so a group broadcast reaches all members at the same time
+and one slow viewer cannot hold up the others or the conversation.
+
+When a client falls too far behind, the slow-consumer policy decides what
+happens to new audio messages:
+
+- "drop_audio": audio messages are dropped.
+- "keep_text": audio is stripped but the message is kept, so subtitles and
+  expressions still arrive.
+- "disconnect": the connection is closed; the client can reconnect.
+
+Messages are wrapped in `OutboundPayload`, which serializes them once, so a
+broadcast does not run `json.dumps` (base64 audio included) for every member.
+"""
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Literal
+
+from fastapi import WebSocket
+from loguru import logger
+
+SlowConsumerPolicy = Literal["drop_audio", "keep_text", "disconnect"]
+
+# Non-audio messages may exceed the buffer limit up to this factor before the
+# connection is considered dead and closed, whatever the policy
+HARD_LIMIT_FACTOR = 4
+# "Try again later"
+_CLOSE_CODE_SLOW_CONSUMER = 1013
+
+
+class OutboundPayload:
+    """A message serialized once, ready to be sent to any number of clients."""
+
+    __slots__ = ("text", "_message", "_is_audio", "_text_only")
+
+    def __init__(self, message: Dict[str, Any] | str):
+        if isinstance(message, str):
+            self.text = message
+            # Parsed only if needed, i.e. when the client is slow
+            self._message = None
+        else:
+            self.text = json.dumps(message)
+            self._message = message
+        self._is_audio: bool | None = None
+        self._text_only: "OutboundPayload | None" = None
+
+    @property
+    def size(self) -> int:
+        return len(self.text)
+
+    @property
+    def is_audio(self) -> bool:
+        """Whether the message carries audio the slow-consumer policy may drop."""
+        if self._is_audio is None:
+            message = self._parsed()
+            self._is_audio = (
+                isinstance(message, dict)
+                and message.get("type") == "audio"
+                and bool(message.get("audio"))
+            )
+        return self._is_audio
+
+    def text_only(self) -> "OutboundPayload":
+        """The same message without its audio (created once, on demand)."""
+        if self._text_only is None:
+            self._text_only = OutboundPayload(
+                {**self._parsed(), "audio": None, "volumes": []}
+            )
+        return self._text_only
+
+    def _parsed(self) -> Any:
+        if self._message is None:
+            try:
+                self._message = json.loads(self.text)
+            except ValueError:
+                # Not JSON: sent as is, never treated as audio
+                self._message = self.text
+        return self._message
+
+
+class ClientSender:
+    """
+    Queued sender for one client WebSocket.
+
+    Can be used in place of the WebSocket: `send_text` / `send_json` queue the
+    message and return at once, everything else is delegated to the WebSocket.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        client_uid: str,
+        max_buffer_bytes: int = 16 * 1024 * 1024,
+        policy: SlowConsumerPolicy = "keep_text",
+    ):
+        """
+        Args:
+            websocket: The client WebSocket.
+            client_uid: Client identifier, for logging.
+            max_buffer_bytes: Queued bytes above which the client counts as slow.
+            policy: What to do with audio sent to a slow client.
+        """
+        self.websocket = websocket
+        self.client_uid = client_uid
+        self.max_buffer_bytes = max_buffer_bytes
+        self.policy = policy
+        self.dropped_audio = 0
+        self._queue: Deque[OutboundPayload] = deque()
+        self._queued_bytes = 0
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._slow = False
+        self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def queued_bytes(self) -> int:
+        return self._queued_bytes
+
+    def enqueue(self, payload: OutboundPayload) -> None:
+        """
+        Queue a payload without waiting for it to be sent.
+
+        Raises:
+            RuntimeError: If the connection is closed.
+        """
+        if self._closed:
+            raise RuntimeError(f"Connection to client {self.client_uid} is closed")
+
+        if self._queued_bytes >= self.max_buffer_bytes:
+            if not self._slow:
+                self._slow = True
+                logger.warning(
+                    f"Client {self.client_uid} is not keeping up "
+                    f"({self._queued_bytes / 1024:.0f} KB queued), "
+                    f"applying slow consumer policy '{self.policy}'"
+                )
+            if payload.is_audio:
+                if self.policy == "disconnect":
+                    self._abort("send buffer full")
+                    return
+                self.dropped_audio += 1
+                if self.policy == "drop_audio":
+                    return
+                payload = payload.text_only()
+            if self._queued_bytes >= self.max_buffer_bytes * HARD_LIMIT_FACTOR:
+                self._abort("send buffer overflow")
+                return
+
+        self._queue.append(payload)
+        self._queued_bytes += payload.size
+        self._wakeup.set()
+
+    async def send_text(self, data: str) -> None:
+        """Queue a text message (drop-in for `WebSocket.send_text`)."""
+        self.enqueue(OutboundPayload(data))
+
+    async def send_json(self, data: Any, mode: str = "text") -> None:
+        """Queue a JSON message (drop-in for `WebSocket.send_json`)."""
+        self.enqueue(OutboundPayload(data))
+
+    async def stop(self) -> None:
+        """
+        Stop the writer task and drop unsent messages.
+
+        The connection itself stays open: `close()` is the WebSocket's.
+        """
+        self._closed = True
+        self._queue.clear()
+        self._queued_bytes = 0
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+
+    def __getattr__(self, name: str) -> Any:
+        # receive_json, close, client_state, ... come from the WebSocket
+        return getattr(self.websocket, name)
+
+    async def _write_loop(self) -> None:
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            payload = self._queue.popleft()
+            try:
+                await self.websocket.send_text(payload.text)
+            except Exception as e:
+                logger.debug(f"Sending to client {self.client_uid} failed: {e}")
+                self._closed = True
+                self._queue.clear()
+                self._queued_bytes = 0
+                return
+            self._queued_bytes -= payload.size
+            if self._slow and self._queued_bytes < self.max_buffer_bytes // 2:
+                self._slow = False
+                logger.info(
+                    f"Client {self.client_uid} caught up "
+                    f"({self.dropped_audio} audio messages degraded so far)"
+                )
+
+    def _abort(self, reason: str) -> None:
+        """Close a connection that cannot keep up."""
+        logger.warning(f"Disconnecting slow client {self.client_uid}: {reason}")
+        self._closed = True
+        self._queue.clear()
+        self._queued_bytes = 0
+        self._writer.cancel()
+        # The receive loop of the connection sees the close and cleans up
+        asyncio.create_task(self._close_websocket(reason))
+
+    async def _close_websocket(self, reason: str) -> None:
+        try:
+            await self.websocket.close(code=_CLOSE_CODE_SLOW_CONSUMER, reason=reason)
+        except Exception as e:
+            logger.debug(f"Error closing connection of {self.client_uid}: {e}")
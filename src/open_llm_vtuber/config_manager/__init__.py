@@ -63,6 +63,7 @@ from .utils import (
     scan_config_alts_directory,
     scan_bg_directory,
 )
+from .file_index import ConfigFileIndex, config_file_index
 
 __all__ = [
     # Main configuration classes
@@ -122,4 +123,6 @@ __all__ = [
     "save_config",
     "scan_config_alts_directory",
     "scan_bg_directory",
+    "ConfigFileIndex",
+    "config_file_index",
 ]
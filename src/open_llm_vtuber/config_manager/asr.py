@@ -330,6 +330,15 @@ class ASRConfig(I18nMixin):
     sherpa_onnx_asr: Optional[SherpaOnnxASRConfig] = Field(
         None, alias="sherpa_onnx_asr"
     )
+    asr_replicas: int = Field(1, alias="asr_replicas", ge=1)
+    asr_worker_mode: Literal["thread", "process"] = Field(
+        "thread", alias="asr_worker_mode"
+    )
+    asr_request_timeout: Optional[float] = Field(
+        None, alias="asr_request_timeout", gt=0
+    )
+    asr_batch_window_ms: float = Field(0, alias="asr_batch_window_ms", ge=0)
+    asr_max_batch_size: int = Field(8, alias="asr_max_batch_size", ge=1)
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "asr_model": Description(
@@ -350,6 +359,26 @@ class ASRConfig(I18nMixin):
         "sherpa_onnx_asr": Description(
             en="Configuration for Sherpa Onnx ASR", zh="Sherpa Onnx ASR 配置"
         ),
+        "asr_replicas": Description(
+            en="Number of model copies transcribing in parallel (each uses its own memory)",
+            zh="并行转录的模型副本数量（每个副本单独占用内存）",
+        ),
+        "asr_worker_mode": Description(
+            en="Run replicas on threads ('thread') or in worker processes ('process', for GIL-bound engines)",
+            zh="在线程中（'thread'）或工作进程中（'process'，适用于受 GIL 限制的引擎）运行副本",
+        ),
+        "asr_request_timeout": Description(
+            en="Seconds a transcription may wait and run before it fails; empty waits indefinitely",
+            zh="转录请求（含排队）的超时秒数；留空表示无限等待",
+        ),
+        "asr_batch_window_ms": Description(
+            en="Milliseconds to collect concurrent utterances into one batch (faster_whisper only); 0 disables batching",
+            zh="将并发语音收集为一个批次的等待毫秒数（仅 faster_whisper）；0 表示不批处理",
+        ),
+        "asr_max_batch_size": Description(
+            en="Maximum number of utterances decoded in one batch",
+            zh="单个批次最多解码的语音条数",
+        ),
     }
 
     @model_validator(mode="after")
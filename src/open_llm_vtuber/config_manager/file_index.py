@@ -0,0 +1,232 @@
+"""In-memory index of the character configs and background images.
+
+`fetch-configs` used to read and parse every YAML file in `config_alts_dir`
+(encoding guessing and env substitution included) and `fetch-backgrounds` used
+to walk `backgrounds/`, once per request. The index keeps both listings in
+memory and a filesystem watcher marks them stale when something changes below
+the watched directories, so requests are served without touching the disk.
+
+- The watcher uses `watchfiles` (inotify on Linux, installed with
+  uvicorn[standard]). Without it, or if it fails, the directories are polled
+  with `os.stat` every `poll_interval` seconds instead.
+- A stale listing is rebuilt on the next request. Display names are cached per
+  file and modification time, so only changed files are parsed again.
+- Until the watcher runs (e.g. in scripts), every request rebuilds the listing
+  from the per-file cache, which costs a `stat` per file but no parsing.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .utils import read_yaml
+
+DEFAULT_CONFIG_FILE = "conf.yaml"
+BACKGROUNDS_DIR = "backgrounds"
+BACKGROUND_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif")
+DEFAULT_POLL_INTERVAL = 2.0
+
+_Snapshot = Dict[str, Tuple[int, int]]
+
+
+def _snapshot(directory: str) -> _Snapshot:
+    """Modification time and size of every file below a directory."""
+    snapshot = {}
+    for root, _, files in os.walk(directory):
+        for file in files:
+            path = os.path.join(root, file)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class ConfigFileIndex:
+    """Cached listings of the config files and backgrounds, kept current."""
+
+    def __init__(
+        self,
+        config_alts_dir: str = "characters",
+        bg_dir: str = BACKGROUNDS_DIR,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Args:
+            config_alts_dir: Directory of the alternative character configs.
+            bg_dir: Directory of the background images.
+            poll_interval: Seconds between two scans when polling.
+        """
+        self.config_alts_dir = config_alts_dir
+        self.bg_dir = bg_dir
+        self.poll_interval = poll_interval
+        # path -> (mtime_ns, display name)
+        self._names: Dict[str, Tuple[int, str]] = {}
+        self._configs: Optional[List[dict]] = None
+        self._backgrounds: Optional[List[str]] = None
+        # Directories whose changes are currently reported by the watcher
+        self._watched: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def configure(self, config_alts_dir: str) -> None:
+        if config_alts_dir != self.config_alts_dir:
+            self.config_alts_dir = config_alts_dir
+            self._configs = None
+
+    # -- listings ------------------------------------------------------------
+
+    def config_files(self, config_alts_dir: Optional[str] = None) -> List[dict]:
+        """
+        The default config and the configs in `config_alts_dir`, in the format of
+        `scan_config_alts_directory`.
+        """
+        if config_alts_dir is not None:
+            self.configure(config_alts_dir)
+        default = {
+            "filename": DEFAULT_CONFIG_FILE,
+            "name": self._display_name(DEFAULT_CONFIG_FILE, DEFAULT_CONFIG_FILE),
+        }
+        if self._configs is None or self.config_alts_dir not in self._watched:
+            self._configs = self._scan_configs()
+        return [default, *self._configs]
+
+    def background_files(self) -> List[str]:
+        """File names of the background images, like `scan_bg_directory`."""
+        if self._backgrounds is None or self.bg_dir not in self._watched:
+            self._backgrounds = [
+                file
+                for _, _, files in os.walk(self.bg_dir)
+                for file in files
+                if file.endswith(BACKGROUND_EXTENSIONS)
+            ]
+        return list(self._backgrounds)
+
+    def invalidate(self) -> None:
+        """Forget both listings, e.g. after writing files into the directories."""
+        self._configs = None
+        self._backgrounds = None
+
+    def _scan_configs(self) -> List[dict]:
+        configs = []
+        seen = set()
+        for root, _, files in os.walk(self.config_alts_dir):
+            for file in files:
+                if file.endswith(".yaml"):
+                    path = os.path.join(root, file)
+                    seen.add(path)
+                    configs.append(
+                        {"filename": file, "name": self._display_name(path, file)}
+                    )
+        # Drop the names of deleted files
+        for path in [p for p in self._names if p not in seen]:
+            if path != DEFAULT_CONFIG_FILE:
+                del self._names[path]
+        logger.debug(f"Indexed config files: {configs}")
+        return configs
+
+    def _display_name(self, path: str, fallback: str) -> str:
+        """`conf_name` of a config file, parsed again only when the file changed."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._names.pop(path, None)
+            return fallback
+        cached = self._names.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            config = read_yaml(path)
+        except Exception as e:
+            logger.warning(f"Could not read config file {path}: {e}")
+            config = None
+        name = fallback
+        if isinstance(config, dict):
+            name = (config.get("character_config") or {}).get("conf_name", fallback)
+        self._names[path] = (mtime, name)
+        return name
+
+    # -- watching ------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start watching the directories."""
+        if self._task is not None and not self._task.done():
+            return
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._watch(self._stop))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stop.set()
+        try:
+            await asyncio.wait_for(task, timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            task.cancel()
+        except Exception:
+            pass
+        self._watched.clear()
+
+    def _on_change(self, path: str) -> None:
+        path = os.path.abspath(path)
+
+        def below(directory: str) -> bool:
+            directory = os.path.abspath(directory)
+            return path == directory or path.startswith(directory + os.sep)
+
+        if below(self.config_alts_dir):
+            self._configs = None
+        if below(self.bg_dir):
+            self._backgrounds = None
+
+    async def _watch(self, stop: asyncio.Event) -> None:
+        directories = [
+            d for d in (self.config_alts_dir, self.bg_dir) if os.path.isdir(d)
+        ]
+        if not directories:
+            return
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            logger.info("watchfiles is not installed, polling config directories.")
+            await self._poll(directories, stop)
+            return
+
+        try:
+            # Changes made before the watcher was ready are picked up by a rebuild
+            self.invalidate()
+            watcher = awatch(*directories, stop_event=stop)
+            self._watched.update(directories)
+            logger.debug(f"Watching {directories} for config and background changes.")
+            async for changes in watcher:
+                for _, path in changes:
+                    self._on_change(path)
+        except Exception as e:
+            logger.warning(f"File watcher failed ({e}), polling config directories.")
+            self._watched.clear()
+            self.invalidate()
+            await self._poll(directories, stop)
+
+    async def _poll(self, directories: List[str], stop: asyncio.Event) -> None:
+        snapshots = {d: await asyncio.to_thread(_snapshot, d) for d in directories}
+        self.invalidate()
+        self._watched.update(directories)
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), self.poll_interval)
+                break
+            except asyncio.TimeoutError:
+                pass
+            for directory in directories:
+                snapshot = await asyncio.to_thread(_snapshot, directory)
+                if snapshot != snapshots[directory]:
+                    snapshots[directory] = snapshot
+                    self._on_change(directory)
+
+
+# Shared by all sessions
+config_file_index = ConfigFileIndex()
@@ -1,4 +1,4 @@
-from pydantic import Field
+from pydantic import Field, model_validator
 from typing import Dict, ClassVar, List
 from .i18n import I18nMixin, Description
 
@@ -8,6 +8,13 @@ class BiliBiliLiveConfig(I18nMixin):
 
     room_ids: List[int] = Field([], alias="room_ids")
     sessdata: str = Field("", alias="sessdata")
+    aggregate_danmaku: bool = Field(True, alias="aggregate_danmaku")
+    danmaku_window_seconds: float = Field(2.0, alias="danmaku_window_seconds")
+    danmaku_dedup_seconds: float = Field(30.0, alias="danmaku_dedup_seconds")
+    danmaku_similarity: float = Field(0.8, alias="danmaku_similarity")
+    danmaku_user_per_minute: int = Field(4, alias="danmaku_user_per_minute")
+    danmaku_digest_size: int = Field(5, alias="danmaku_digest_size")
+    danmaku_record_path: str = Field("", alias="danmaku_record_path")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "room_ids": Description(
@@ -17,8 +24,51 @@ class BiliBiliLiveConfig(I18nMixin):
             en="SESSDATA cookie value for authenticated requests (optional)",
             zh="用于认证请求的SESSDATA cookie值（可选）",
         ),
+        "aggregate_danmaku": Description(
+            en="Merge danmaku into digests instead of starting a conversation for each one",
+            zh="将弹幕合并为摘要，而不是每条弹幕都触发一轮对话",
+        ),
+        "danmaku_window_seconds": Description(
+            en="Minimum seconds between two digests (grows to the measured reply time)",
+            zh="两次弹幕摘要之间的最短秒数（会随实测的回复时间增长）",
+        ),
+        "danmaku_dedup_seconds": Description(
+            en="Seconds during which a repeated danmaku is counted instead of forwarded",
+            zh="重复弹幕在多少秒内只计数、不再转发",
+        ),
+        "danmaku_similarity": Description(
+            en="Similarity (0-1) above which two danmaku count as the same (1 = identical only)",
+            zh="两条弹幕相似度（0-1）高于此值即视为重复（1 表示仅完全相同）",
+        ),
+        "danmaku_user_per_minute": Description(
+            en="Danmaku per user admitted per minute (0 = no limit)",
+            zh="每个用户每分钟最多被采纳的弹幕数（0 表示不限制）",
+        ),
+        "danmaku_digest_size": Description(
+            en="Maximum number of distinct danmaku in one digest",
+            zh="单个摘要中最多包含的不同弹幕数",
+        ),
+        "danmaku_record_path": Description(
+            en="File to record received danmaku to, for replaying with scripts/replay_danmaku.py (empty = off)",
+            zh="记录收到的弹幕的文件，可用 scripts/replay_danmaku.py 回放（留空表示不记录）",
+        ),
     }
 
+    @model_validator(mode="after")
+    def check_danmaku_aggregation(cls, values):
+        if values.danmaku_window_seconds < 0 or values.danmaku_dedup_seconds < 0:
+            raise ValueError(
+                "danmaku_window_seconds and danmaku_dedup_seconds must be non-negative"
+            )
+        if not 0 <= values.danmaku_similarity <= 1:
+            raise ValueError("danmaku_similarity must be between 0 and 1")
+        if values.danmaku_user_per_minute < 0 or values.danmaku_digest_size < 1:
+            raise ValueError(
+                "danmaku_user_per_minute must be non-negative and "
+                "danmaku_digest_size at least 1"
+            )
+        return values
+
 
 class LiveConfig(I18nMixin):
     """Configuration for live streaming platforms integration."""
@@ -1,6 +1,6 @@
 # config_manager/system.py
 from pydantic import Field, model_validator
-from typing import Dict, ClassVar
+from typing import Dict, ClassVar, List, Literal
 from .i18n import I18nMixin, Description
 
 
@@ -13,6 +13,28 @@ class SystemConfig(I18nMixin):
     config_alts_dir: str = Field(..., alias="config_alts_dir")
     tool_prompts: Dict[str, str] = Field(..., alias="tool_prompts")
     enable_proxy: bool = Field(False, alias="enable_proxy")
+    loop_lag_threshold_ms: int = Field(0, alias="loop_lag_threshold_ms")
+    deferred_engines: List[str] = Field([], alias="deferred_engines")
+    engine_pool_memory_mb: int = Field(2048, alias="engine_pool_memory_mb")
+    client_send_buffer_mb: float = Field(16, alias="client_send_buffer_mb")
+    slow_client_policy: Literal["drop_audio", "keep_text", "disconnect"] = Field(
+        "keep_text", alias="slow_client_policy"
+    )
+    proxy_queue_max_length: int = Field(100, alias="proxy_queue_max_length")
+    proxy_queue_eviction: Literal["drop_lowest", "drop_oldest", "reject_new"] = Field(
+        "drop_lowest", alias="proxy_queue_eviction"
+    )
+    proxy_coalesce_max: int = Field(1, alias="proxy_coalesce_max")
+    mcp_server_idle_seconds: float = Field(300, alias="mcp_server_idle_seconds")
+    static_max_age_seconds: int = Field(3600, alias="static_max_age_seconds")
+    adaptive_chunking: bool = Field(False, alias="adaptive_chunking")
+    stream_text_deltas: bool = Field(False, alias="stream_text_deltas")
+    cache_max_size_mb: float = Field(1024, alias="cache_max_size_mb")
+    cache_max_age_seconds: float = Field(3600, alias="cache_max_age_seconds")
+    cache_sweep_interval_seconds: float = Field(
+        60, alias="cache_sweep_interval_seconds"
+    )
+    cache_in_memory: bool = Field(False, alias="cache_in_memory")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -29,6 +51,70 @@ class SystemConfig(I18nMixin):
             en="Enable proxy mode for multiple clients",
             zh="启用代理模式以支持多个客户端使用一个 ws 连接",
         ),
+        "loop_lag_threshold_ms": Description(
+            en="Debug: log the coroutine blocking the event loop when it stalls longer than this many milliseconds (0 disables)",
+            zh="调试用：当事件循环阻塞超过该毫秒数时，记录阻塞它的协程（0 表示禁用）",
+        ),
+        "deferred_engines": Description(
+            en="Engines to load on first use instead of at startup ('asr', 'translate')",
+            zh="首次使用时才加载、而非启动时加载的引擎（'asr'、'translate'）",
+        ),
+        "engine_pool_memory_mb": Description(
+            en="Estimated memory (MB) that ASR/TTS/VAD engines shared between configs may use before idle ones are unloaded",
+            zh="多个配置共享的 ASR/TTS/VAD 引擎可占用的估计内存（MB），超出后卸载空闲引擎",
+        ),
+        "client_send_buffer_mb": Description(
+            en="Unsent data (MB) queued for a client before it is treated as a slow consumer",
+            zh="客户端未发送数据的排队上限（MB），超出后视为慢速客户端",
+        ),
+        "slow_client_policy": Description(
+            en="What to send a slow client: 'drop_audio' drops audio, 'keep_text' sends text without audio, 'disconnect' closes the connection",
+            zh="如何对待慢速客户端：'drop_audio' 丢弃音频，'keep_text' 只发送文本不带音频，'disconnect' 断开连接",
+        ),
+        "proxy_queue_max_length": Description(
+            en="Maximum number of messages waiting in the proxy queue",
+            zh="代理队列中最多等待的消息数",
+        ),
+        "proxy_queue_eviction": Description(
+            en="Message dropped when the proxy queue is full: 'drop_lowest' (lowest priority), 'drop_oldest' or 'reject_new'",
+            zh="代理队列已满时丢弃的消息：'drop_lowest'（最低优先级）、'drop_oldest'（最旧）或 'reject_new'（新消息）",
+        ),
+        "proxy_coalesce_max": Description(
+            en="Maximum number of queued proxy messages merged into one conversation turn (1 disables merging)",
+            zh="合并为一轮对话的代理队列消息的最大数量（1 表示不合并）",
+        ),
+        "mcp_server_idle_seconds": Description(
+            en="Seconds an MCP server no session uses keeps running before it is shut down",
+            zh="没有会话使用的 MCP 服务器在关闭前保持运行的秒数",
+        ),
+        "static_max_age_seconds": Description(
+            en="Seconds browsers may reuse Live2D models, backgrounds and avatars without asking the server again",
+            zh="浏览器无需再次询问服务器即可复用 Live2D 模型、背景和头像的秒数",
+        ),
+        "adaptive_chunking": Description(
+            en="Size the text sent to TTS by the measured TTS speed: split at commas when audio is about to run out, merge sentences when plenty is queued",
+            zh="根据实测的 TTS 速度调整送往 TTS 的文本长度：音频即将播完时在逗号处切分，缓冲充足时合并句子",
+        ),
+        "stream_text_deltas": Description(
+            en="Send the LLM output to the client token by token (text-delta messages) before its audio is synthesized",
+            zh="在语音合成完成前，将 LLM 输出逐 token 发送给客户端（text-delta 消息）",
+        ),
+        "cache_max_size_mb": Description(
+            en="Size the cache directory is kept under by removing the oldest temporary files (0 for no limit)",
+            zh="缓存目录的大小上限，超出时删除最旧的临时文件（0 表示不限制）",
+        ),
+        "cache_max_age_seconds": Description(
+            en="Age after which temporary files in the cache directory are removed (0 for no limit)",
+            zh="缓存目录中临时文件的最长保留秒数（0 表示不限制）",
+        ),
+        "cache_sweep_interval_seconds": Description(
+            en="Seconds between two sweeps of the cache directory",
+            zh="两次清理缓存目录之间的秒数",
+        ),
+        "cache_in_memory": Description(
+            en="Keep the cache directory on tmpfs (/dev/shm) so temporary audio never touches the disk",
+            zh="将缓存目录放在 tmpfs（/dev/shm）上，使临时音频不写入磁盘",
+        ),
     }
 
     @model_validator(mode="after")
@@ -36,4 +122,30 @@ class SystemConfig(I18nMixin):
         port = values.port
         if port < 0 or port > 65535:
             raise ValueError("Port must be between 0 and 65535")
+        if values.loop_lag_threshold_ms < 0:
+            raise ValueError("loop_lag_threshold_ms must be non-negative")
+        if values.engine_pool_memory_mb < 0:
+            raise ValueError("engine_pool_memory_mb must be non-negative")
+        if values.client_send_buffer_mb <= 0:
+            raise ValueError("client_send_buffer_mb must be positive")
+        if values.proxy_queue_max_length < 1 or values.proxy_coalesce_max < 1:
+            raise ValueError(
+                "proxy_queue_max_length and proxy_coalesce_max must be at least 1"
+            )
+        if values.mcp_server_idle_seconds < 0:
+            raise ValueError("mcp_server_idle_seconds must be non-negative")
+        if values.static_max_age_seconds < 0:
+            raise ValueError("static_max_age_seconds must be non-negative")
+        if values.cache_max_size_mb < 0 or values.cache_max_age_seconds < 0:
+            raise ValueError(
+                "cache_max_size_mb and cache_max_age_seconds must be non-negative"
+            )
+        if values.cache_sweep_interval_seconds <= 0:
+            raise ValueError("cache_sweep_interval_seconds must be positive")
+        unknown_engines = set(values.deferred_engines) - {"asr", "translate"}
+        if unknown_engines:
+            raise ValueError(
+                f"Unsupported deferred_engines: {sorted(unknown_engines)}. "
+                "Only 'asr' and 'translate' can be deferred."
+            )
         return values
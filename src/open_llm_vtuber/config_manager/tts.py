@@ -151,12 +151,17 @@ class EdgeTTSConfig(I18nMixin):
     """Configuration for Edge TTS."""
 
     voice: str = Field(..., alias="voice")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "voice": Description(
             en="Voice name to use for Edge TTS (use 'edge-tts --list-voices' to list available voices)",
             zh="Edge TTS 使用的语音名称（使用 'edge-tts --list-voices' 列出可用语音）",
         ),
+        "streaming": Description(
+            en="Decode the audio in memory as it arrives and play it chunk by chunk (incremental with PyAV, the `streaming` extra)",
+            zh="在内存中边接收边解码音频并逐块播放（安装 PyAV，即 `streaming` 可选依赖后为增量解码）",
+        ),
     }
 
 
@@ -374,6 +379,7 @@ class SherpaOnnxTTSConfig(I18nMixin):
     num_threads: int = Field(1, alias="num_threads")
     speed: float = Field(1.0, alias="speed")
     debug: bool = Field(False, alias="debug")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "vits_model": Description(en="Path to VITS model file", zh="VITS 模型文件路径"),
@@ -405,6 +411,10 @@ class SherpaOnnxTTSConfig(I18nMixin):
         "num_threads": Description(en="Number of computation threads", zh="计算线程数"),
         "speed": Description(en="Speech speed multiplier", zh="语速倍数"),
         "debug": Description(en="Enable debug mode", zh="启用调试模式"),
+        "streaming": Description(
+            en="Send audio batch by batch while the rest of the sentence is synthesized",
+            zh="在合成句子其余部分的同时按批次发送音频",
+        ),
     }
 
 
@@ -607,6 +617,7 @@ class PiperTTSConfig(I18nMixin):
     volume: float = Field(1.0, alias="volume")
     normalize_audio: bool = Field(True, alias="normalize_audio")
     use_cuda: bool = Field(False, alias="use_cuda")
+    streaming: bool = Field(False, alias="streaming")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_path": Description(
@@ -640,6 +651,10 @@ class PiperTTSConfig(I18nMixin):
             en="Whether to use GPU acceleration (requires onnxruntime-gpu)",
             zh="是否使用 GPU 加速（需要安装 onnxruntime-gpu）",
         ),
+        "streaming": Description(
+            en="Send audio sentence by sentence while the rest is synthesized",
+            zh="在合成其余部分的同时逐句发送音频",
+        ),
     }
 
 
@@ -786,6 +801,10 @@ class TTSConfig(I18nMixin):
     elevenlabs_tts: ElevenLabsTTSConfig | None = Field(None, alias="elevenlabs_tts")
     cartesia_tts: CartesiaTTSConfig | None = Field(None, alias="cartesia_tts")
     piper_tts: Optional[PiperTTSConfig] = Field(None, alias="piper_tts")
+    tts_worker_mode: Literal["thread", "process"] = Field(
+        "thread", alias="tts_worker_mode"
+    )
+    tts_workers: int = Field(1, alias="tts_workers", ge=1)
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "tts_model": Description(
@@ -832,6 +851,14 @@ class TTSConfig(I18nMixin):
             en="Configuration for Cartesia TTS", zh="Cartesia TTS 配置"
         ),
         "piper_tts": Description(en="Configuration for Piper TTS", zh="Piper TTS 配置"),
+        "tts_worker_mode": Description(
+            en="Synthesize on threads ('thread') or in worker processes ('process', for local engines such as sherpa_onnx_tts or piper_tts)",
+            zh="在线程中（'thread'）或工作进程中（'process'，适用于 sherpa_onnx_tts、piper_tts 等本地引擎）合成语音",
+        ),
+        "tts_workers": Description(
+            en="Number of worker processes in 'process' mode (each loads its own copy of the model)",
+            zh="'process' 模式下的工作进程数量（每个进程加载一份模型）",
+        ),
     }
 
     @model_validator(mode="after")
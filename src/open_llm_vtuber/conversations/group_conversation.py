@@ -24,6 +24,8 @@ from .types import (
 from ..service_context import ServiceContext
 from ..chat_history_manager import store_message
 from .tts_manager import TTSTaskManager
+from ..utils.sentence_divider import stream_text_deltas
+from ..utils.speech_pacing import current_speech_pacer
 
 
 async def process_group_conversation(
@@ -348,6 +350,14 @@ async def process_member_response(
 ) -> str:
     """Process group member's response, handling text/audio and tool status events."""
     full_response = ""
+    tts_manager.pacer.use_engine(context.tts_engine)
+    pacer_token = None
+    if context.system_config.adaptive_chunking:
+        # Read by the sentence divider of the member's agent
+        pacer_token = current_speech_pacer.set(tts_manager.pacer)
+    deltas_token = None
+    if context.system_config.stream_text_deltas:
+        deltas_token = stream_text_deltas.set(True)
 
     try:
         # agent.chat now yields Union[SentenceOutput, Dict[str, Any]]
@@ -366,6 +376,14 @@ async def process_member_response(
                     logger.warning(
                         "Cannot broadcast tool status: broadcast_func or group_members missing."
                     )
+            elif (
+                isinstance(output_item, dict)
+                and output_item.get("type") == "text-delta"
+            ):
+                # Token ahead of its sentence's audio, to the speaker's client
+                # like the audio
+                output_item["name"] = context.character_config.character_name
+                await current_ws_send(json.dumps(output_item))
             elif isinstance(output_item, (SentenceOutput, AudioOutput)):
                 # Handle SentenceOutput or AudioOutput: Send to current user, broadcast audio later if needed
                 response_part = await process_agent_output(
@@ -390,5 +408,10 @@ async def process_member_response(
                 {"type": "error", "message": f"Error processing response: {str(e)}"}
             )
         )
+    finally:
+        if pacer_token is not None:
+            current_speech_pacer.reset(pacer_token)
+        if deltas_token is not None:
+            stream_text_deltas.reset(deltas_token)
 
     return full_response
@@ -15,6 +15,8 @@ from .conversation_utils import (
 )
 from .types import WebSocketSend
 from .tts_manager import TTSTaskManager
+from ..utils.sentence_divider import stream_text_deltas
+from ..utils.speech_pacing import SpeechPacer, current_speech_pacer
 from ..chat_history_manager import store_message
 from ..service_context import ServiceContext
 
@@ -46,7 +48,14 @@ async def process_single_conversation(
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(pacer=SpeechPacer(context.tts_engine))
+    pacer_token = None
+    if context.system_config.adaptive_chunking:
+        # Read by the sentence divider of the agent
+        pacer_token = current_speech_pacer.set(tts_manager.pacer)
+    deltas_token = None
+    if context.system_config.stream_text_deltas:
+        deltas_token = stream_text_deltas.set(True)
     full_response = ""  # Initialize full_response here
 
     try:
@@ -100,6 +109,14 @@ async def process_single_conversation(
 
                     await websocket_send(json.dumps(output_item))
 
+                elif (
+                    isinstance(output_item, dict)
+                    and output_item.get("type") == "text-delta"
+                ):
+                    # Token ahead of its sentence's audio
+                    output_item["name"] = context.character_config.character_name
+                    await websocket_send(json.dumps(output_item))
+
                 elif isinstance(output_item, (SentenceOutput, AudioOutput)):
                     # Handle SentenceOutput or AudioOutput
                     response_part = await process_agent_output(
@@ -172,3 +189,7 @@ async def process_single_conversation(
         raise
     finally:
         cleanup_conversation(tts_manager, session_emoji)
+        if pacer_token is not None:
+            current_speech_pacer.reset(pacer_token)
+        if deltas_token is not None:
+            stream_text_deltas.reset(deltas_token)
@@ -1,22 +1,91 @@
 import asyncio
 import json
 import re
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import AsyncIterator, Generic, List, Optional, Dict, Tuple, TypeVar
 from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
+from ..utils.speech_pacing import SpeechPacer, tts_rate_tracker
+from ..utils.stream_audio import (
+    PCMPayloadStream,
+    payload_duration,
+    prepare_audio_payload,
+)
 from .types import WebSocketSend
 
+T = TypeVar("T")
+
+
+class OrderedDelivery(Generic[T]):
+    """
+    Puts results produced in parallel back in sequence order.
+
+    Every sequence number gets one or more items, the last one added with
+    `final=True`. Items of the sequence next in line are released as they
+    arrive, and the sequence after it follows once it is final. Shared by
+    `TTSTaskManager` and `synthesize_in_order`.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[int, List[T]] = {}
+        self._finished: set[int] = set()
+        self.next_sequence = 0
+
+    def add(self, sequence: int, item: Optional[T], final: bool = True) -> None:
+        if item is not None:
+            self._items.setdefault(sequence, []).append(item)
+        if final:
+            self._finished.add(sequence)
+
+    def pop_ready(self) -> List[Tuple[int, List[T], bool]]:
+        """
+        Release what can be delivered now.
+
+        Returns:
+            (sequence, items, finished) in order, `finished` being True when the
+            sequence has no more items to come.
+        """
+        ready = []
+        while True:
+            sequence = self.next_sequence
+            items = self._items.pop(sequence, [])
+            finished = sequence in self._finished
+            if finished:
+                self._finished.discard(sequence)
+                self.next_sequence += 1
+            if items or finished:
+                ready.append((sequence, items, finished))
+            if not finished:
+                return ready
+
+    def pending(self) -> List[T]:
+        """Remove and return the items added but not released yet."""
+        items = [
+            item for sequence in sorted(self._items) for item in self._items[sequence]
+        ]
+        self._items.clear()
+        return items
+
 
 class TTSTaskManager:
     """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
 
-    def __init__(self) -> None:
+    def __init__(self, pacer: Optional[SpeechPacer] = None) -> None:
+        """
+        Args:
+            pacer: Told what is queued and sent, to adapt the sentence chunking.
+                Every manager has one; it is only consulted when the
+                conversation exposes it to the sentence divider.
+        """
+        self.pacer = pacer or SpeechPacer()
+        # Characters of each queued sentence, to update the pacer when sent
+        self._sequence_chars: Dict[int, int] = {}
         self.task_list: List[asyncio.Task] = []
         self._lock = asyncio.Lock()
         # Queue to store ordered payloads
@@ -25,7 +94,7 @@ class TTSTaskManager:
         self._sender_task: Optional[asyncio.Task] = None
         # Counter for maintaining order
         self._sequence_counter = 0
-        self._next_sequence_to_send = 0
+        self._delivery: OrderedDelivery[Dict] = OrderedDelivery()
 
     async def speak(
         self,
@@ -69,6 +138,9 @@ class TTSTaskManager:
         # Get current sequence number
         current_sequence = self._sequence_counter
         self._sequence_counter += 1
+        self.pacer.use_engine(tts_engine)
+        self.pacer.sentence_queued(len(tts_text))
+        self._sequence_chars[current_sequence] = len(tts_text)
 
         # Start sender task if not running
         if not self._sender_task or self._sender_task.done():
@@ -93,20 +165,26 @@ class TTSTaskManager:
         """
         Process and send payloads in correct order.
         Runs continuously until all payloads are processed.
-        """
-        buffered_payloads: Dict[int, Dict] = {}
 
+        A streamed sentence queues several payloads under its sequence number;
+        they are sent as they arrive once the sentence is next in line, and the
+        next sentence follows when its last payload (final=True) is in.
+        """
         while True:
             try:
                 # Get payload from queue
-                payload, sequence_number = await self._payload_queue.get()
-                buffered_payloads[sequence_number] = payload
+                payload, sequence_number, final = await self._payload_queue.get()
+                self._delivery.add(sequence_number, payload, final)
 
                 # Send payloads in order
-                while self._next_sequence_to_send in buffered_payloads:
-                    next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
-                    self._next_sequence_to_send += 1
+                for sequence, payloads, finished in self._delivery.pop_ready():
+                    for next_payload in payloads:
+                        await websocket_send(json.dumps(next_payload))
+                        self.pacer.audio_sent(payload_duration(next_payload))
+                    if finished:
+                        self.pacer.sentence_finished(
+                            self._sequence_chars.pop(sequence, 0)
+                        )
 
                 self._payload_queue.task_done()
 
@@ -125,7 +203,7 @@ class TTSTaskManager:
             display_text=display_text,
             actions=actions,
         )
-        await self._payload_queue.put((audio_payload, sequence_number))
+        await self._payload_queue.put((audio_payload, sequence_number, True))
 
     async def _process_tts(
         self,
@@ -137,16 +215,26 @@ class TTSTaskManager:
         sequence_number: int,
     ) -> None:
         """Process TTS generation and queue the result for ordered delivery"""
+        if tts_engine.streaming:
+            await self._stream_tts(
+                tts_text, display_text, actions, tts_engine, sequence_number
+            )
+            return
         audio_file_path = None
         try:
+            started = time.perf_counter()
             audio_file_path = await self._generate_audio(tts_engine, tts_text)
+            elapsed = time.perf_counter() - started
             payload = prepare_audio_payload(
                 audio_path=audio_file_path,
                 display_text=display_text,
                 actions=actions,
             )
+            tts_rate_tracker.record(
+                tts_engine, len(tts_text), elapsed, payload_duration(payload)
+            )
             # Queue the payload with its sequence number
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         except Exception as e:
             logger.error(f"Error preparing audio payload: {e}")
@@ -156,27 +244,149 @@ class TTSTaskManager:
                 display_text=display_text,
                 actions=actions,
             )
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         finally:
             if audio_file_path:
                 tts_engine.remove_file(audio_file_path)
                 logger.debug("Audio cache file cleaned.")
 
+    async def _stream_tts(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        tts_engine: TTSInterface,
+        sequence_number: int,
+    ) -> None:
+        """Queue the audio of a sentence chunk by chunk while it is synthesized"""
+        stream = PCMPayloadStream(display_text=display_text, actions=actions)
+        audio_seconds = 0.0
+        try:
+            logger.debug(f"🏃Streaming audio for '''{tts_text}'''...")
+            started = time.perf_counter()
+            async for samples, sample_rate in tts_engine.async_stream_audio(tts_text):
+                if len(samples) == 0:
+                    continue
+                audio_seconds += len(samples) / sample_rate
+                payload = stream.payload(samples, sample_rate)
+                await self._payload_queue.put((payload, sequence_number, False))
+            tts_rate_tracker.record(
+                tts_engine,
+                len(tts_text),
+                time.perf_counter() - started,
+                audio_seconds,
+            )
+        except Exception as e:
+            logger.error(f"Error streaming audio: {e}")
+
+        payload = None
+        if stream.chunks_sent == 0:
+            # Nothing was heard, show the text anyway
+            payload = prepare_audio_payload(
+                audio_path=None,
+                display_text=display_text,
+                actions=actions,
+            )
+        await self._payload_queue.put((payload, sequence_number, True))
+
     async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
         """Generate audio file from text"""
-        logger.debug(f"🏃Generating audio for '''{text}'''...")
-        return await tts_engine.async_generate_audio(
-            text=text,
-            file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
-        )
+        return await generate_audio_file(tts_engine, text)
 
     def clear(self) -> None:
-        """Clear all pending tasks and reset state"""
+        """Cancel and clear all pending tasks and reset state"""
+        # Cancelling aborts in-flight synthesis (see TTSInterface.async_generate_audio)
+        # instead of letting it run to completion for a turn nobody will hear
+        for task in self.task_list:
+            if not task.done():
+                task.cancel()
         self.task_list.clear()
         if self._sender_task:
             self._sender_task.cancel()
         self._sequence_counter = 0
-        self._next_sequence_to_send = 0
+        self._delivery = OrderedDelivery()
+        self._sequence_chars.clear()
+        self.pacer.reset()
         # Create a new queue to clear any pending items
         self._payload_queue = asyncio.Queue()
+
+
+async def generate_audio_file(tts_engine: TTSInterface, text: str) -> str:
+    """Generate an audio file for `text` under a unique cache file name"""
+    logger.debug(f"🏃Generating audio for '''{text}'''...")
+    return await tts_engine.async_generate_audio(
+        text=text,
+        file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
+    )
+
+
+@dataclass
+class SynthesizedSentence:
+    """Result of synthesizing one sentence with `synthesize_in_order`"""
+
+    index: int
+    text: str
+    audio_path: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+async def synthesize_in_order(
+    tts_engine: TTSInterface, sentences: List[str], max_concurrency: int = 4
+) -> AsyncIterator[SynthesizedSentence]:
+    """
+    Synthesize sentences in parallel and yield the results in sentence order.
+
+    Like `TTSTaskManager`, every sentence is synthesized as its own task and
+    `OrderedDelivery` keeps delivery ordered: a sentence is yielded as soon as it
+    and all sentences before it are done. An engine returning no file is an
+    error result. The caller owns the yielded audio files. If iteration stops
+    early, pending synthesis is cancelled and finished but undelivered files are
+    removed.
+
+    Args:
+        tts_engine: TTS engine instance
+        sentences: Sentences to synthesize
+        max_concurrency: Maximum number of sentences synthesized at once
+
+    Yields:
+        SynthesizedSentence: One result per sentence, in order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    results: asyncio.Queue[SynthesizedSentence] = asyncio.Queue()
+
+    async def synthesize(index: int, text: str) -> None:
+        result = SynthesizedSentence(index, text)
+        try:
+            async with semaphore:
+                result.audio_path = await generate_audio_file(tts_engine, text)
+            if result.audio_path is None:
+                raise RuntimeError("The TTS engine produced no audio")
+        except Exception as e:
+            logger.error(f"Error synthesizing sentence {index}: {e}")
+            result.error = e
+        await results.put(result)
+
+    tasks = [
+        asyncio.create_task(synthesize(index, sentence))
+        for index, sentence in enumerate(sentences)
+    ]
+    delivery: OrderedDelivery[SynthesizedSentence] = OrderedDelivery()
+    # Released in order but not yielded yet
+    ready: List[SynthesizedSentence] = []
+    try:
+        while delivery.next_sequence < len(sentences):
+            result = await results.get()
+            delivery.add(result.index, result)
+            ready = [item for _, items, _ in delivery.pop_ready() for item in items]
+            while ready:
+                yield ready.pop(0)
+    finally:
+        for task in tasks:
+            task.cancel()
+        undelivered = ready + delivery.pending()
+        while not results.empty():
+            undelivered.append(results.get_nowait())
+        for result in undelivered:
+            if result.audio_path:
+                tts_engine.remove_file(result.audio_path, verbose=False)
@@ -0,0 +1,257 @@
+"""
+Process-wide pool of ASR / TTS / VAD engines shared between sessions.
+
+Engines are keyed by a canonical hash of the configuration they were built from,
+so every session that uses the same configuration shares one instance instead of
+loading its own copy of the model. Instances are reference counted: a session
+acquires (or retains) an engine while it uses it and releases it when it
+switches configuration or disconnects. Engines nobody uses any more stay in the
+pool, so switching back to a recently used character is instant, until the pool
+exceeds its memory budget; then the least recently used idle engines are dropped.
+
+Engine sizes are estimates: the growth of the process's resident memory while
+the engine was built. Engines built at the same time (concurrent startup, see
+`InitPlanner`) cannot be told apart, so their size is recorded as unknown and
+only the `MAX_IDLE_ENGINES` bound applies to them. Engines running in worker
+processes report the memory of those processes through `memory_bytes()`.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from loguru import logger
+
+
+@dataclass
+class _PoolEntry:
+    key: str
+    kind: str
+    engine: Any
+    size_bytes: int
+    refcount: int = 0
+    last_used: float = 0.0
+
+
+def rss_bytes(pid: int | None = None) -> int | None:
+    """Resident memory of this process (or `pid`), or None if it cannot be measured."""
+    try:
+        import psutil
+
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class EnginePool:
+    """Reference-counted, LRU-evicted cache of engine instances."""
+
+    # Upper bound on idle engines when memory usage cannot be measured
+    MAX_IDLE_ENGINES = 8
+
+    def __init__(self, memory_budget_mb: float = 2048):
+        """
+        Args:
+            memory_budget_mb: Estimated memory the pool may hold before idle
+                engines are evicted. 0 evicts engines as soon as they are idle.
+        """
+        self.memory_budget_mb = memory_budget_mb
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._by_engine_id: Dict[int, _PoolEntry] = {}
+        self._lock = threading.RLock()
+        self._creation_locks: Dict[str, threading.Lock] = {}
+        # Engines being built -> whether another build overlapped with theirs
+        self._building: Dict[str, bool] = {}
+
+    def configure(self, memory_budget_mb: float) -> None:
+        """Update the memory budget and evict idle engines that no longer fit."""
+        with self._lock:
+            self.memory_budget_mb = memory_budget_mb
+            self._evict_idle()
+
+    @staticmethod
+    def make_key(kind: str, config: Dict[str, Any]) -> str:
+        """Build a canonical key from the engine kind and its configuration."""
+        canonical = json.dumps(
+            {"kind": kind, "config": config},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def acquire(
+        self, kind: str, config: Dict[str, Any], factory: Callable[[], Any]
+    ) -> Any:
+        """
+        Get the engine for a configuration, creating it if it is not pooled yet.
+
+        The caller owns one reference and must `release()` the engine later.
+
+        Args:
+            kind: Engine kind, e.g. "asr", "tts" or "vad".
+            config: The configuration that fully determines the engine.
+            factory: Builds the engine when no pooled instance exists.
+
+        Returns:
+            The (possibly shared) engine instance.
+        """
+        key = self.make_key(kind, config)
+        with self._lock:
+            entry = self._take_entry(key)
+            if entry:
+                logger.info(f"Reusing pooled {kind} engine ({key[:8]})")
+                return entry.engine
+            creation_lock = self._creation_locks.setdefault(key, threading.Lock())
+
+        # Build outside the pool lock so other engines can be acquired meanwhile;
+        # the per-key lock keeps two sessions from loading the same model twice.
+        with creation_lock:
+            with self._lock:
+                entry = self._take_entry(key)
+                if entry:
+                    return entry.engine
+
+            with self._lock:
+                overlapped = bool(self._building)
+                for other in self._building:
+                    self._building[other] = True
+                self._building[key] = overlapped
+            try:
+                rss_before = rss_bytes()
+                engine = factory()
+                rss_after = rss_bytes()
+            finally:
+                with self._lock:
+                    overlapped = self._building.pop(key)
+            size_bytes = self._engine_size(
+                engine, None if overlapped else rss_before, rss_after
+            )
+
+            with self._lock:
+                entry = _PoolEntry(key, kind, engine, size_bytes, refcount=1)
+                entry.last_used = time.monotonic()
+                self._entries[key] = entry
+                self._by_engine_id[id(engine)] = entry
+                self._creation_locks.pop(key, None)
+                logger.info(
+                    f"Pooled new {kind} engine {type(engine).__name__} ({key[:8]}), "
+                    + (
+                        f"~{size_bytes / 1024 / 1024:.0f} MB"
+                        if size_bytes
+                        else "size unknown (built alongside other engines)"
+                    )
+                )
+                self._evict_idle()
+            return engine
+
+    @staticmethod
+    def _engine_size(engine: Any, rss_before: int | None, rss_after: int | None) -> int:
+        """Estimated memory of an engine, 0 if unknown."""
+        size = 0
+        if rss_before is not None and rss_after is not None:
+            size = max(0, rss_after - rss_before)
+        # Memory held outside this process, e.g. by worker processes
+        memory_bytes = getattr(engine, "memory_bytes", None)
+        if callable(memory_bytes):
+            try:
+                size += memory_bytes()
+            except Exception as e:
+                logger.debug(f"Could not measure engine memory: {e}")
+        return size
+
+    def retain(self, engine: Any) -> None:
+        """Add a reference to an engine obtained from another holder."""
+        if engine is None:
+            return
+        with self._lock:
+            entry = self._by_engine_id.get(id(engine))
+            if entry:
+                entry.refcount += 1
+
+    def release(self, engine: Any) -> None:
+        """Drop a reference to an engine. Unknown engines are ignored."""
+        if engine is None:
+            return
+        with self._lock:
+            entry = self._by_engine_id.get(id(engine))
+            if not entry:
+                return
+            entry.refcount = max(0, entry.refcount - 1)
+            entry.last_used = time.monotonic()
+            if entry.refcount == 0:
+                logger.debug(f"{entry.kind} engine {entry.key[:8]} is now idle")
+                self._evict_idle()
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the pooled engines, for logging and diagnostics."""
+        with self._lock:
+            return {
+                "memory_budget_mb": self.memory_budget_mb,
+                "engines": [
+                    {
+                        "kind": entry.kind,
+                        "key": entry.key[:8],
+                        "type": type(entry.engine).__name__,
+                        "refcount": entry.refcount,
+                        "size_mb": round(entry.size_bytes / 1024 / 1024, 1),
+                    }
+                    for entry in self._entries.values()
+                ],
+            }
+
+    def _take_entry(self, key: str) -> _PoolEntry | None:
+        """Add a reference to a pooled entry and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry:
+            entry.refcount += 1
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+        return entry
+
+    def _evict_idle(self) -> None:
+        """Drop least recently used idle engines until the pool fits its budget."""
+        budget_bytes = self.memory_budget_mb * 1024 * 1024
+        while True:
+            idle = [e for e in self._entries.values() if e.refcount == 0]
+            if not idle:
+                return
+            total = sum(e.size_bytes for e in self._entries.values())
+            fits = (
+                self.memory_budget_mb > 0
+                and total <= budget_bytes
+                and len(idle) <= self.MAX_IDLE_ENGINES
+            )
+            if fits:
+                return
+            victim = min(idle, key=lambda e: e.last_used)
+            self._entries.pop(victim.key, None)
+            self._by_engine_id.pop(id(victim.engine), None)
+            logger.info(
+                f"Evicted idle {victim.kind} engine {type(victim.engine).__name__} "
+                f"({victim.key[:8]}) from the engine pool"
+            )
+            # Engines owning threads or processes stop them here
+            close = getattr(victim.engine, "close", None)
+            if callable(close) and not inspect.iscoroutinefunction(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Error closing evicted engine: {e}")
+
+
+# Shared by every ServiceContext in this process
+engine_pool = EnginePool()
@@ -0,0 +1,258 @@
+"""
+Concurrent and deferred engine initialization.
+
+Loading the engines of a character (Live2D, ASR, TTS, VAD, MCP tools, agent,
+translator) one after another makes a cold start as slow as the sum of all of
+them. `InitPlanner` runs independent initialization steps at the same time
+(blocking steps on worker threads) and only serializes the steps that really
+depend on each other, so a start is about as slow as the slowest engine.
+
+Rarely used engines can instead be wrapped in a deferred proxy that builds the
+real engine on first use. Every step reports its state and load time through
+`EngineStatus`, which is exposed by the readiness endpoint.
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable
+
+import numpy as np
+from loguru import logger
+
+from .asr.asr_interface import ASRInterface
+from .translate.translate_interface import TranslateInterface
+
+
+@dataclass
+class EngineStatus:
+    """Load state of a single engine."""
+
+    name: str
+    state: str = "pending"  # pending | loading | ready | deferred | failed
+    load_time: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "load_time": round(self.load_time, 3)
+            if self.load_time is not None
+            else None,
+            "error": self.error,
+        }
+
+
+class DependencyFailed(RuntimeError):
+    """A step was skipped because a step it depends on failed."""
+
+
+@dataclass
+class _InitStep:
+    name: str
+    func: Callable
+    args: tuple
+    depends_on: tuple = field(default_factory=tuple)
+
+
+class InitPlanner:
+    """
+    Runs initialization steps concurrently while honoring their dependencies.
+
+    Synchronous steps run on worker threads, coroutine functions run on the event
+    loop. A step starts as soon as all steps it depends on have finished.
+    """
+
+    def __init__(self, statuses: Dict[str, EngineStatus] | None = None):
+        """
+        Args:
+            statuses: Status table to update. A new one is created if omitted.
+        """
+        self.statuses: Dict[str, EngineStatus] = (
+            statuses if statuses is not None else {}
+        )
+        self._steps: Dict[str, _InitStep] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable,
+        *args: Any,
+        depends_on: Iterable[str] = (),
+    ) -> None:
+        """
+        Register an initialization step.
+
+        Args:
+            name: Unique step name, used in the status table and logs.
+            func: Sync function or coroutine function performing the step.
+            *args: Arguments passed to `func`.
+            depends_on: Names of steps that must finish before this one starts.
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate initialization step: {name}")
+        self._steps[name] = _InitStep(name, func, args, tuple(depends_on))
+
+    async def run(self) -> Dict[str, EngineStatus]:
+        """
+        Run all registered steps and wait for them to finish.
+
+        Returns:
+            Dict[str, EngineStatus]: The status table.
+
+        Raises:
+            Exception: The first error raised by a step, after every step settled.
+                Steps skipped because of a failed dependency are reported as
+                failed, but the error of the dependency is the one raised.
+        """
+        for step in self._steps.values():
+            unknown = [dep for dep in step.depends_on if dep not in self._steps]
+            if unknown:
+                raise ValueError(f"Step '{step.name}' depends on unknown {unknown}")
+
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: _InitStep) -> None:
+            status = self.statuses.setdefault(step.name, EngineStatus(step.name))
+            if step.depends_on:
+                results = await asyncio.gather(
+                    *(tasks[dep] for dep in step.depends_on), return_exceptions=True
+                )
+                for dep, result in zip(step.depends_on, results):
+                    if isinstance(result, BaseException):
+                        status.state = "failed"
+                        status.error = f"dependency {dep} failed"
+                        raise DependencyFailed(
+                            f"Step '{step.name}' skipped: {status.error}"
+                        )
+            status.state, status.error = "loading", None
+            step_started = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(step.func):
+                    await step.func(*step.args)
+                else:
+                    await asyncio.to_thread(step.func, *step.args)
+            except Exception as e:
+                status.state, status.error = "failed", str(e)
+                status.load_time = time.perf_counter() - step_started
+                raise
+            # A step may have marked its engine as deferred instead of loading it
+            if status.state == "loading":
+                status.state = "ready"
+                status.load_time = time.perf_counter() - step_started
+
+        for step in self._steps.values():
+            tasks[step.name] = asyncio.create_task(run_step(step))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        logger.info(
+            "Engine initialization finished in "
+            f"{time.perf_counter() - started:.2f}s: "
+            + ", ".join(
+                f"{s.name}={s.state}"
+                + (f" ({s.load_time:.2f}s)" if s.load_time is not None else "")
+                for s in self.statuses.values()
+                if s.name in self._steps
+            )
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        # Raise the root cause rather than a step that was skipped because of it
+        errors.sort(key=lambda e: isinstance(e, DependencyFailed))
+        if errors:
+            raise errors[0]
+        return self.statuses
+
+
+class _DeferredLoader:
+    """Builds an engine on first use, exactly once, and records its status."""
+
+    def __init__(self, status: EngineStatus, factory: Callable[[], Any]):
+        self.status = status
+        self.status.state = "deferred"
+        self.status.load_time = None
+        self._factory = factory
+        self._engine = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Any:
+        """The engine if it has been loaded, else None."""
+        return self._engine
+
+    def load(self) -> Any:
+        if self._engine is not None:
+            return self._engine
+        with self._lock:
+            if self._engine is None:
+                logger.info(f"Loading deferred engine on first use: {self.status.name}")
+                self.status.state = "loading"
+                started = time.perf_counter()
+                try:
+                    self._engine = self._factory()
+                except Exception as e:
+                    self.status.state, self.status.error = "failed", str(e)
+                    raise
+                finally:
+                    self.status.load_time = time.perf_counter() - started
+                self.status.state = "ready"
+        return self._engine
+
+    async def aload(self) -> Any:
+        if self._engine is not None:
+            return self._engine
+        return await asyncio.to_thread(self.load)
+
+
+class _DeferredProxy:
+    """
+    Forwards attribute access to the engine, loading it first.
+
+    `memory_bytes` and `close` are answered without loading: the engine pool
+    probes them on every pooled engine, and a deferred engine that was never
+    used holds no memory and has nothing to close.
+    """
+
+    _loader: _DeferredLoader
+
+    def memory_bytes(self) -> int:
+        memory_bytes = getattr(self._loader.engine, "memory_bytes", None)
+        return memory_bytes() if callable(memory_bytes) else 0
+
+    def close(self) -> None:
+        close = getattr(self._loader.engine, "close", None)
+        if callable(close) and not inspect.iscoroutinefunction(close):
+            close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes the proxy itself does not define
+        if name == "_loader":
+            raise AttributeError(name)
+        return getattr(self._loader.load(), name)
+
+
+class DeferredASR(_DeferredProxy, ASRInterface):
+    """ASR engine proxy that creates the real engine on the first transcription."""
+
+    def __init__(self, status: EngineStatus, factory: Callable[[], ASRInterface]):
+        self._loader = _DeferredLoader(status, factory)
+
+    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+        engine = await self._loader.aload()
+        return await engine.async_transcribe_np(audio)
+
+    def transcribe_np(self, audio: np.ndarray) -> str:
+        return self._loader.load().transcribe_np(audio)
+
+
+class DeferredTranslator(_DeferredProxy, TranslateInterface):
+    """Translator proxy that creates the real translator on the first request."""
+
+    def __init__(self, status: EngineStatus, factory: Callable[[], TranslateInterface]):
+        self._loader = _DeferredLoader(status, factory)
+
+    def translate(self, text: str) -> str:
+        return self._loader.load().translate(text)
@@ -1,6 +1,7 @@
 import asyncio
 import http.cookies
 import random
+import time
 import traceback
 import json
 from typing import Callable, Dict, Any, List, Optional
@@ -11,6 +12,8 @@ import sys
 import os
 
 from .live_interface import LivePlatformInterface
+from .danmaku_aggregator import Danmaku, DanmakuAggregator
+from ..proxy_message_queue import SOURCE_DANMAKU, SOURCE_SUPER_CHAT
 
 # Import the blivedm library
 try:
@@ -29,6 +32,9 @@ except ImportError as e:
     logger.warning("BiliBili live functionality will not be available.")
     BLIVEDM_AVAILABLE = False
 
+# Seconds between two writes of the recorded danmaku to the replay log
+RECORD_FLUSH_INTERVAL = 1.0
+
 
 class BiliBiliLivePlatform(LivePlatformInterface):
     """
@@ -36,13 +42,23 @@ class BiliBiliLivePlatform(LivePlatformInterface):
     Connects to a BiliBili live room and forwards danmaku messages to the VTuber.
     """
 
-    def __init__(self, room_ids: List[int], sessdata: str = ""):
+    def __init__(
+        self,
+        room_ids: List[int],
+        sessdata: str = "",
+        aggregator: Optional[DanmakuAggregator] = None,
+        record_path: str = "",
+    ):
         """
         Initialize the BiliBili Live platform client.
 
         Args:
             room_ids: List of room IDs to monitor
             sessdata: Optional SESSDATA cookie value for authentication
+            aggregator: Aggregation stage for danmaku. Without one, every
+                danmaku is forwarded as it arrives.
+            record_path: If set, received danmaku are appended to this file as
+                a log that scripts/replay_danmaku.py can replay.
         """
         if not BLIVEDM_AVAILABLE:
             raise ImportError(
@@ -58,6 +74,11 @@ class BiliBiliLivePlatform(LivePlatformInterface):
         self._running = False
         self._message_handlers: List[Callable[[Dict[str, Any]], None]] = []
         self._conversation_active = False
+        self._aggregator = aggregator
+        self._flush_wakeup = asyncio.Event()
+        self._record_path = record_path
+        # Recorded danmaku not written to the replay log yet
+        self._record_buffer: List[str] = []
 
     @property
     def is_connected(self) -> bool:
@@ -135,6 +156,9 @@ class BiliBiliLivePlatform(LivePlatformInterface):
             except Exception as e:
                 logger.warning(f"Error while closing HTTP session: {e}")
 
+        # Write what was recorded since the last batch
+        await self._flush_records()
+
         self._connected = False
         logger.info("Disconnected from BiliBili Live and proxy server")
 
@@ -167,25 +191,49 @@ class BiliBiliLivePlatform(LivePlatformInterface):
         self._message_handlers.append(handler)
         logger.debug("Registered new message handler")
 
-    async def _handle_danmaku(self, danmaku_text: str):
+    async def _handle_danmaku(
+        self,
+        danmaku_text: str,
+        source: str = SOURCE_DANMAKU,
+        user_id: str = "",
+        uname: str = "",
+    ):
         """
         Process received danmaku message and forward it to VTuber.
 
+        Plain danmaku go through the aggregator when there is one; super chats
+        are always forwarded at once.
+
         Args:
             danmaku_text: The danmaku text received from BiliBili
+            source: Kind of message, which sets its priority in the proxy queue
+                (super chats go first)
+            user_id: ID of the sender, for the per-user rate limit
+            uname: Name of the sender, shown in digests
         """
+        if self._record_path:
+            self._record_danmaku(danmaku_text, user_id, uname)
+
+        if self._aggregator and source == SOURCE_DANMAKU:
+            self._aggregator.add(
+                Danmaku(danmaku_text, user_id, uname, time.monotonic())
+            )
+            self._flush_wakeup.set()
+            return
+
         try:
             # Send danmaku directly to proxy
-            await self._send_to_proxy(danmaku_text)
+            await self._send_to_proxy(danmaku_text, source)
         except Exception as e:
             logger.error(f"Error forwarding danmaku to proxy: {e}")
 
-    async def _send_to_proxy(self, text: str) -> bool:
+    async def _send_to_proxy(self, text: str, source: str = SOURCE_DANMAKU) -> bool:
         """
         Send danmaku text to the proxy.
 
         Args:
             text: The danmaku text to send
+            source: Kind of message, which sets its priority in the proxy queue
 
         Returns:
             bool: True if sent successfully
@@ -195,7 +243,7 @@ class BiliBiliLivePlatform(LivePlatformInterface):
             return False
 
         try:
-            message = {"type": "text-input", "text": text}
+            message = {"type": "text-input", "text": text, "source": source}
             await self._websocket.send(json.dumps(message))
             logger.info(f"Sent danmaku to VTuber: {text}")
             return True
@@ -204,6 +252,64 @@ class BiliBiliLivePlatform(LivePlatformInterface):
             self._connected = False
             return False
 
+    def _record_danmaku(self, text: str, user_id: str, uname: str) -> None:
+        """Queue a danmaku for the replay log, written by `_write_records`."""
+        record = {"time": time.time(), "uid": user_id, "uname": uname, "text": text}
+        self._record_buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def _write_records(self) -> None:
+        """Append the recorded danmaku to the replay log in batches."""
+        while self._running:
+            await asyncio.sleep(RECORD_FLUSH_INTERVAL)
+            await self._flush_records()
+
+    async def _flush_records(self) -> None:
+        if not self._record_buffer or not self._record_path:
+            return
+        lines, self._record_buffer = self._record_buffer, []
+        try:
+            # Off the event loop: a busy room records many danmaku per second
+            await asyncio.to_thread(self._append_records, self._record_path, lines)
+        except OSError as e:
+            logger.warning(f"Could not record danmaku to {self._record_path}: {e}")
+            self._record_path = ""
+
+    @staticmethod
+    def _append_records(path: str, lines: List[str]) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def _flush_aggregated(self) -> None:
+        """Forward a digest of the aggregated danmaku whenever one is due."""
+        aggregator = self._aggregator
+        while self._running:
+            wait = aggregator.seconds_until_due(time.monotonic())
+            if wait != 0:
+                # Sleep until the window ends, or until a danmaku arrives or
+                # the VTuber finishes answering
+                self._flush_wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._flush_wakeup.wait(),
+                        # While the VTuber is busy, check now and then in case
+                        # the end of its turn was missed
+                        timeout=aggregator.max_window_seconds if wait is None else wait,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            digest = aggregator.flush(time.monotonic())
+            if digest is None:
+                continue
+            # Count the turn from now: the start signal comes from the server
+            aggregator.turn_started(time.monotonic())
+            try:
+                await self._send_to_proxy(digest)
+            except Exception as e:
+                logger.error(f"Error forwarding danmaku digest to proxy: {e}")
+            logger.debug(f"Danmaku aggregation stats: {aggregator.stats.to_dict()}")
+
     async def start_receiving(self) -> None:
         """
         Start receiving messages from the proxy WebSocket.
@@ -252,6 +358,14 @@ class BiliBiliLivePlatform(LivePlatformInterface):
         Args:
             message: The message received from the VTuber
         """
+        if self._aggregator and message.get("type") == "control":
+            # Measure how long the VTuber takes to answer, to pace the digests
+            if message.get("text") == "conversation-chain-start":
+                self._aggregator.turn_started(time.monotonic())
+            elif message.get("text") == "conversation-chain-end":
+                self._aggregator.turn_finished(time.monotonic())
+                self._flush_wakeup.set()
+
         # Process the message with all registered handlers
         for handler in self._message_handlers:
             try:
@@ -279,7 +393,36 @@ class BiliBiliLivePlatform(LivePlatformInterface):
                 message: The danmaku message
             """
             logger.debug(f"[Room {client.room_id}] {message.uname}: {message.msg}")
-            asyncio.create_task(self.platform._handle_danmaku(message.msg))
+            asyncio.create_task(
+                self.platform._handle_danmaku(
+                    message.msg, user_id=str(message.uid), uname=message.uname
+                )
+            )
+
+        def _on_super_chat(
+            self, client: blivedm.BLiveClient, message: web_models.SuperChatMessage
+        ):
+            """
+            Handle super chat message from BiliBili Live.
+
+            Super chats are paid messages, so they skip ahead of plain danmaku.
+
+            Args:
+                client: The BiliBili Live client
+                message: The super chat message
+            """
+            logger.debug(
+                f"[Room {client.room_id}] Super chat ¥{message.price} "
+                f"{message.uname}: {message.message}"
+            )
+            asyncio.create_task(
+                self.platform._handle_danmaku(
+                    message.message,
+                    SOURCE_SUPER_CHAT,
+                    user_id=str(message.uid),
+                    uname=message.uname,
+                )
+            )
 
         def _on_heartbeat(
             self, client: blivedm.BLiveClient, message: web_models.HeartbeatMessage
@@ -315,6 +458,16 @@ class BiliBiliLivePlatform(LivePlatformInterface):
 
             # Start background task for receiving messages from the proxy
             receive_task = asyncio.create_task(self.start_receiving())
+            flush_task = (
+                asyncio.create_task(self._flush_aggregated())
+                if self._aggregator
+                else None
+            )
+            record_task = (
+                asyncio.create_task(self._write_records())
+                if self._record_path
+                else None
+            )
 
             # Randomly select a room ID if multiple are provided
             room_id = random.choice(self._room_ids)
@@ -333,13 +486,14 @@ class BiliBiliLivePlatform(LivePlatformInterface):
             finally:
                 await self._client.stop_and_close()
 
-            # Clean up receive task if necessary
-            if not receive_task.done():
-                receive_task.cancel()
-                try:
-                    await receive_task
-                except asyncio.CancelledError:
-                    pass
+            # Clean up background tasks if necessary
+            for task in (receive_task, flush_task, record_task):
+                if task and not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
 
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt, shutting down")
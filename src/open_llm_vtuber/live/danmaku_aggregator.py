@@ -0,0 +1,380 @@
+"""
+Aggregation of live chat (danmaku) before it reaches the VTuber.
+
+A busy room sends far more messages than the LLM and TTS can answer. Instead of
+forwarding each of them as its own conversation turn, `DanmakuAggregator`
+collects them and hands out one digest at a time:
+
+- Near-identical messages seen within the dedup window are folded into the
+  first one and counted ("666" x 12).
+- Each user may only get a few messages per minute into a digest.
+- When more messages arrive than a digest holds, a uniform sample of the
+  window is kept (reservoir sampling), popular messages first.
+- A digest is released at most once per window, and never while the VTuber is
+  still answering the previous one. The window grows to the measured duration
+  of a conversation turn, so admission follows the speed of the pipeline.
+
+The aggregator does no I/O and takes the current time as an argument, so a
+recorded danmaku log can be replayed through it (see `replay` and
+scripts/replay_danmaku.py).
+"""
+
+import json
+import random
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DIGEST_HEADER = "Chat says:"
+# Near-duplicates are only searched among this many recent distinct messages
+_SIMILARITY_LOOKBACK = 64
+# Weight of the latest turn duration in the moving average
+_TURN_EMA_ALPHA = 0.3
+_REPEATED_CHARS = re.compile(r"(.)\1{2,}")
+
+
+@dataclass
+class Danmaku:
+    """One chat message."""
+
+    text: str
+    user_id: str = ""
+    uname: str = ""
+    timestamp: float = 0.0
+
+
+@dataclass
+class AggregatorStats:
+    received: int = 0
+    duplicates: int = 0
+    rate_limited: int = 0
+    sampled_out: int = 0
+    digests: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class _Entry:
+    danmaku: Danmaku
+    key: str
+    count: int = 1
+
+
+@dataclass
+class _Window:
+    entries: List[_Entry] = field(default_factory=list)
+    # Messages offered to the reservoir during this window
+    seen: int = 0
+
+
+def normalize_text(text: str) -> str:
+    """
+    Reduce a message to the form used for duplicate detection.
+
+    Case, width, whitespace and punctuation are ignored, and runs of the same
+    character are shortened ("哈哈哈哈哈" and "哈哈哈" are the same message).
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = "".join(
+        ch for ch in text if unicodedata.category(ch)[0] not in ("P", "Z", "C")
+    )
+    return _REPEATED_CHARS.sub(r"\1\1", text)
+
+
+class DanmakuAggregator:
+    """Deduplicates, rate-limits and samples danmaku into digests."""
+
+    def __init__(
+        self,
+        window_seconds: float = 2.0,
+        dedup_seconds: float = 30.0,
+        similarity_threshold: float = 0.8,
+        user_messages_per_minute: int = 4,
+        digest_size: int = 5,
+        max_window_seconds: float = 30.0,
+        digest_header: str = DIGEST_HEADER,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            window_seconds: Minimum time between two digests.
+            dedup_seconds: How long a message suppresses its duplicates.
+            similarity_threshold: Similarity ratio (0-1) above which two messages
+                count as duplicates. 1 only folds identical messages.
+            user_messages_per_minute: Messages per user admitted per minute.
+                0 disables the limit.
+            digest_size: Maximum number of distinct messages in a digest.
+            max_window_seconds: Upper bound of the adaptive window. Also the time
+                after which a turn that never reported its end is given up on.
+            digest_header: First line of a digest with several messages.
+            seed: Seed for sampling, to make replays reproducible.
+        """
+        self.window_seconds = window_seconds
+        self.dedup_seconds = dedup_seconds
+        self.similarity_threshold = similarity_threshold
+        self.user_messages_per_minute = user_messages_per_minute
+        self.digest_size = max(1, digest_size)
+        self.max_window_seconds = max(window_seconds, max_window_seconds)
+        self.digest_header = digest_header
+        self.stats = AggregatorStats()
+
+        self._random = random.Random(seed)
+        self._window = _Window()
+        # Recent distinct messages, oldest first: (timestamp, entry)
+        self._recent: Deque[Tuple[float, _Entry]] = deque()
+        self._recent_by_key: Dict[str, _Entry] = {}
+        self._user_history: Dict[str, Deque[float]] = {}
+        self._last_digest_at: Optional[float] = None
+        self._turn_started_at: Optional[float] = None
+        self._turn_seconds: Optional[float] = None
+
+    # -- input ---------------------------------------------------------------
+
+    def add(self, danmaku: Danmaku, now: Optional[float] = None) -> bool:
+        """
+        Offer a message to the aggregator.
+
+        Returns:
+            bool: True if the message was taken as a new message, False if it was
+            folded into a duplicate or rejected by the rate limit.
+        """
+        now = danmaku.timestamp if now is None else now
+        self.stats.received += 1
+        self._expire(now)
+
+        key = normalize_text(danmaku.text)
+        if not key:
+            return False
+
+        duplicate = self._find_duplicate(key)
+        if duplicate is not None:
+            duplicate.count += 1
+            self.stats.duplicates += 1
+            # Also when it was already answered: repeating it does not make it new
+            return False
+
+        if not self._admit_user(danmaku.user_id, now):
+            self.stats.rate_limited += 1
+            return False
+
+        entry = _Entry(danmaku, key)
+        self._recent.append((now, entry))
+        self._recent_by_key[key] = entry
+        self._offer(entry)
+        return True
+
+    def _find_duplicate(self, key: str) -> Optional[_Entry]:
+        entry = self._recent_by_key.get(key)
+        if entry is not None or self.similarity_threshold >= 1:
+            return entry
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(key)
+        for _, candidate in list(self._recent)[-_SIMILARITY_LOOKBACK:]:
+            matcher.set_seq1(candidate.key)
+            if (
+                matcher.real_quick_ratio() >= self.similarity_threshold
+                and matcher.quick_ratio() >= self.similarity_threshold
+                and matcher.ratio() >= self.similarity_threshold
+            ):
+                return candidate
+        return None
+
+    def _admit_user(self, user_id: str, now: float) -> bool:
+        if not user_id or self.user_messages_per_minute <= 0:
+            return True
+        history = self._user_history.setdefault(user_id, deque())
+        while history and now - history[0] >= 60:
+            history.popleft()
+        if len(history) >= self.user_messages_per_minute:
+            return False
+        history.append(now)
+        return True
+
+    def _offer(self, entry: _Entry) -> None:
+        """Reservoir sampling: every message of the window is equally likely kept."""
+        window = self._window
+        window.seen += 1
+        capacity = self.digest_size * 4
+        if len(window.entries) < capacity:
+            window.entries.append(entry)
+            return
+        slot = self._random.randrange(window.seen)
+        if slot < capacity:
+            window.entries[slot] = entry
+        self.stats.sampled_out += 1
+
+    def _expire(self, now: float) -> None:
+        while self._recent and now - self._recent[0][0] >= self.dedup_seconds:
+            _, entry = self._recent.popleft()
+            if self._recent_by_key.get(entry.key) is entry:
+                del self._recent_by_key[entry.key]
+
+    # -- pipeline feedback ---------------------------------------------------
+
+    def turn_started(self, now: float) -> None:
+        """The VTuber started answering."""
+        self._turn_started_at = now
+
+    def turn_finished(self, now: float) -> None:
+        """The VTuber finished answering; its duration adapts the window."""
+        if self._turn_started_at is None:
+            return
+        duration = max(0.0, now - self._turn_started_at)
+        self._turn_started_at = None
+        if self._turn_seconds is None:
+            self._turn_seconds = duration
+        else:
+            self._turn_seconds += _TURN_EMA_ALPHA * (duration - self._turn_seconds)
+
+    @property
+    def current_window(self) -> float:
+        """Current time between digests: the configured window or the turn time."""
+        return min(
+            max(self.window_seconds, self._turn_seconds or 0.0),
+            self.max_window_seconds,
+        )
+
+    def busy(self, now: float) -> bool:
+        if self._turn_started_at is None:
+            return False
+        if now - self._turn_started_at >= self.max_window_seconds:
+            # The end of the turn was missed, do not stall forever
+            self._turn_started_at = None
+            return False
+        return True
+
+    # -- output --------------------------------------------------------------
+
+    def seconds_until_due(self, now: float) -> Optional[float]:
+        """
+        Time until the next digest can be released.
+
+        Returns:
+            Optional[float]: 0 if a digest is due now, None if there is nothing to
+            release or the VTuber is busy (wait for `turn_finished` instead).
+        """
+        if not self._window.entries or self.busy(now):
+            return None
+        if self._last_digest_at is None:
+            return 0.0
+        return max(0.0, self._last_digest_at + self.current_window - now)
+
+    def flush(self, now: float, force: bool = False) -> Optional[str]:
+        """
+        Release the digest of the current window if it is due.
+
+        Args:
+            now: Current time.
+            force: Release the digest even if it is not due yet.
+
+        Returns:
+            Optional[str]: The text to send to the VTuber, or None.
+        """
+        if not self._window.entries:
+            return None
+        if not force and self.seconds_until_due(now) != 0:
+            return None
+
+        window, self._window = self._window, _Window()
+        self._last_digest_at = now
+        self.stats.digests += 1
+        # Forget users who have been quiet for a minute
+        for user_id in [
+            user_id
+            for user_id, history in self._user_history.items()
+            if not history or now - history[-1] >= 60
+        ]:
+            del self._user_history[user_id]
+
+        # Popular messages first, then in the order they were sent
+        by_popularity = sorted(
+            window.entries, key=lambda e: (-e.count, e.danmaku.timestamp)
+        )
+        entries = by_popularity[: self.digest_size]
+        entries.sort(key=lambda e: e.danmaku.timestamp)
+        skipped = window.seen - len(entries)
+
+        if len(entries) == 1 and skipped == 0:
+            return entries[0].danmaku.text
+
+        lines = [self.digest_header]
+        for entry in entries:
+            line = entry.danmaku.text
+            if entry.danmaku.uname:
+                line = f"{entry.danmaku.uname}: {line}"
+            if entry.count > 1:
+                line += f" (x{entry.count})"
+            lines.append(f"- {line}")
+        if skipped > 0:
+            lines.append(f"(+{skipped} more)")
+        return "\n".join(lines)
+
+
+def load_danmaku_log(lines: Iterable[str]) -> Iterator[Danmaku]:
+    """
+    Read a danmaku log: one JSON object per line with "time" (seconds), "text"
+    and optionally "uid" and "uname".
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        yield Danmaku(
+            text=str(record["text"]),
+            user_id=str(record.get("uid", "")),
+            uname=str(record.get("uname", "")),
+            timestamp=float(record["time"]),
+        )
+
+
+def replay(
+    aggregator: DanmakuAggregator,
+    messages: Iterable[Danmaku],
+    turn_seconds: float,
+) -> List[Tuple[float, str]]:
+    """
+    Run a recorded danmaku stream through the aggregator on a simulated clock.
+
+    Every digest is answered by a simulated VTuber taking `turn_seconds`.
+
+    Returns:
+        List[Tuple[float, str]]: The digests with the time they were released.
+    """
+    digests: List[Tuple[float, str]] = []
+    clock = 0.0
+    turn_ends_at: Optional[float] = None
+
+    def advance(until: float) -> None:
+        nonlocal clock, turn_ends_at
+        while True:
+            if turn_ends_at is not None and turn_ends_at <= until:
+                # Nothing is released while the VTuber is answering
+                clock, turn_ends_at = max(clock, turn_ends_at), None
+                aggregator.turn_finished(clock)
+                continue
+            wait = aggregator.seconds_until_due(clock)
+            if wait is None or clock + wait > until:
+                break
+            clock += wait
+            text = aggregator.flush(clock)
+            if text is None:
+                break
+            digests.append((clock, text))
+            aggregator.turn_started(clock)
+            turn_ends_at = clock + turn_seconds
+        clock = max(clock, until)
+
+    last = 0.0
+    for danmaku in messages:
+        advance(danmaku.timestamp)
+        aggregator.add(danmaku, danmaku.timestamp)
+        last = danmaku.timestamp
+    # Drain what is left at the end of the log
+    advance(last + aggregator.max_window_seconds + turn_seconds)
+    return digests
@@ -1,7 +1,211 @@
 import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
 import chardet
 from loguru import logger
 
+# Seconds during which the model folder listing is served without checking the disk
+FOLDER_INFO_RECHECK_SECONDS = 2.0
+AVATAR_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def _load_file_content(file_path: str) -> str:
+    """Load the content of a file with robust encoding handling."""
+    # Try common encodings first
+    encodings = ["utf-8", "utf-8-sig", "gbk", "gb2312", "ascii"]
+
+    for encoding in encodings:
+        try:
+            with open(file_path, "r", encoding=encoding) as file:
+                return file.read()
+        except UnicodeDecodeError:
+            continue
+
+    # If all common encodings fail, try to detect encoding
+    try:
+        with open(file_path, "rb") as file:
+            raw_data = file.read()
+        detected = chardet.detect(raw_data)
+        detected_encoding = detected["encoding"]
+
+        if detected_encoding:
+            try:
+                return raw_data.decode(detected_encoding)
+            except UnicodeDecodeError:
+                pass
+    except Exception as e:
+        logger.error(f"Error detecting encoding for {file_path}: {e}")
+
+    raise UnicodeError(f"Failed to decode {file_path} with any encoding")
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    """A model of the model dictionary with its precomputed emotion data."""
+
+    model_info: dict
+    emo_map: dict
+    emo_str: str
+
+    @classmethod
+    def from_model_info(cls, model_info: dict) -> "ModelEntry":
+        emo_map = {k.lower(): v for k, v in model_info["emotionMap"].items()}
+        emo_str = " ".join([f"[{key}]," for key in emo_map.keys()])
+        return cls(model_info, emo_map, emo_str)
+
+
+class Live2dModelRegistry:
+    """
+    Shared cache of the model dictionary and of the model folders.
+
+    `model_dict.json` is parsed once per modification and its models are indexed
+    by name, so creating a `Live2dModel` (on every `init_live2d` and config switch)
+    no longer reads the file. The listing of the model folders served by
+    `/live2d-models/info` is rebuilt only when a folder changed.
+    """
+
+    def __init__(self):
+        # model_dict_path -> ((mtime_ns, size), {name: ModelEntry})
+        self._dicts: Dict[str, Tuple[Tuple[int, int], Dict[str, ModelEntry]]] = {}
+        # live2d_dir -> (signature, checked_at, characters)
+        self._folders: Dict[str, Tuple[tuple, float, List[dict]]] = {}
+
+    def get(self, model_name: str, model_dict_path: str) -> ModelEntry:
+        """
+        The entry of a model in a model dictionary.
+
+        Raises:
+            FileNotFoundError: If the model dictionary file is not found.
+            json.JSONDecodeError: If it is not a valid JSON file.
+            KeyError: If the model name is not found in the model dictionary.
+        """
+        models = self._models(model_dict_path)
+        entry = models.get(model_name)
+        if entry is None:
+            logger.critical(f"Unable to find {model_name} in {model_dict_path}.")
+            raise KeyError(
+                f"{model_name} not found in model dictionary {model_dict_path}."
+            )
+        return entry
+
+    def _models(self, model_dict_path: str) -> Dict[str, ModelEntry]:
+        try:
+            stat = os.stat(model_dict_path)
+        except FileNotFoundError as file_e:
+            logger.critical(f"Model dictionary file not found at {model_dict_path}.")
+            self._dicts.pop(model_dict_path, None)
+            raise file_e
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._dicts.get(model_dict_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        try:
+            model_dict = json.loads(_load_file_content(model_dict_path))
+        except FileNotFoundError as file_e:
+            logger.critical(f"Model dictionary file not found at {model_dict_path}.")
+            raise file_e
+        except json.JSONDecodeError as json_e:
+            logger.critical(
+                f"Error decoding JSON from model dictionary file at {model_dict_path}."
+            )
+            raise json_e
+        except UnicodeError as uni_e:
+            logger.critical(
+                f"Error reading model dictionary file at {model_dict_path}."
+            )
+            raise uni_e
+        except Exception as e:
+            logger.critical(
+                f"Error occurred while reading model dictionary file at {model_dict_path}."
+            )
+            raise e
+
+        models: Dict[str, ModelEntry] = {}
+        for model in model_dict:
+            # Like the former linear search, the first model of a name wins
+            if model["name"] not in models:
+                models[model["name"]] = ModelEntry.from_model_info(model)
+        self._dicts[model_dict_path] = (version, models)
+        logger.debug(f"Loaded {len(models)} models from {model_dict_path}.")
+        return models
+
+    def folder_info(self, live2d_dir: str = "live2d-models") -> Optional[List[dict]]:
+        """
+        The model folders with a `<name>.model3.json` file and their avatar.
+
+        Returns:
+            Optional[List[dict]]: Dicts with name, avatar and model_path, or None
+            if the directory does not exist.
+        """
+        now = time.monotonic()
+        cached = self._folders.get(live2d_dir)
+        if cached is not None and now - cached[1] < FOLDER_INFO_RECHECK_SECONDS:
+            return cached[2]
+        signature = self._folder_signature(live2d_dir)
+        if signature is None:
+            self._folders.pop(live2d_dir, None)
+            return None
+        if cached is not None and cached[0] == signature:
+            self._folders[live2d_dir] = (signature, now, cached[2])
+            return cached[2]
+        characters = self._scan_folders(live2d_dir)
+        self._folders[live2d_dir] = (signature, now, characters)
+        return characters
+
+    @staticmethod
+    def _folder_signature(live2d_dir: str) -> Optional[tuple]:
+        """Modification times of the directory and of its folders."""
+        try:
+            top = os.stat(live2d_dir).st_mtime_ns
+            with os.scandir(live2d_dir) as entries:
+                folders = sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in entries
+                    if entry.is_dir()
+                )
+        except OSError:
+            return None
+        return (top, tuple(folders))
+
+    @staticmethod
+    def _scan_folders(live2d_dir: str) -> List[dict]:
+        valid_characters = []
+        for entry in os.scandir(live2d_dir):
+            if entry.is_dir():
+                folder_name = entry.name.replace("\\", "/")
+                model3_file = os.path.join(
+                    live2d_dir, folder_name, f"{folder_name}.model3.json"
+                ).replace("\\", "/")
+
+                if os.path.isfile(model3_file):
+                    # Find avatar file if it exists
+                    avatar_file = None
+                    for ext in AVATAR_EXTENSIONS:
+                        avatar_path = os.path.join(
+                            live2d_dir, folder_name, f"{folder_name}{ext}"
+                        )
+                        if os.path.isfile(avatar_path):
+                            avatar_file = avatar_path.replace("\\", "/")
+                            break
+
+                    valid_characters.append(
+                        {
+                            "name": folder_name,
+                            "avatar": avatar_file,
+                            "model_path": model3_file,
+                        }
+                    )
+        return valid_characters
+
+
+# Shared by all sessions and the routes
+live2d_model_registry = Live2dModelRegistry()
+
+
 # This class will only prepare the payload for the live2d model
 # the process of sending the payload should be done by the caller
 # This class is **Not responsible** for sending the payload to the server
@@ -44,52 +248,28 @@ class Live2dModel:
             None
         """
 
-        self.model_info: dict = self._lookup_model_info(model_name)
-        self.emo_map: dict = {
-            k.lower(): v for k, v in self.model_info["emotionMap"].items()
-        }
-        self.emo_str: str = " ".join([f"[{key}]," for key in self.emo_map.keys()])
+        entry = self._lookup_model_info(model_name)
+        self.model_info: dict = entry.model_info
+        self.emo_map: dict = entry.emo_map
+        self.emo_str: str = entry.emo_str
         # emo_str is a string of the keys in the emoMap dictionary. The keys are enclosed in square brackets.
         # example: `"[fear], [anger], [disgust], [sadness], [joy], [neutral], [surprise]"`
 
     def _load_file_content(self, file_path: str) -> str:
         """Load the content of a file with robust encoding handling."""
-        # Try common encodings first
-        encodings = ["utf-8", "utf-8-sig", "gbk", "gb2312", "ascii"]
+        return _load_file_content(file_path)
 
-        for encoding in encodings:
-            try:
-                with open(file_path, "r", encoding=encoding) as file:
-                    return file.read()
-            except UnicodeDecodeError:
-                continue
-
-        # If all common encodings fail, try to detect encoding
-        try:
-            with open(file_path, "rb") as file:
-                raw_data = file.read()
-            detected = chardet.detect(raw_data)
-            detected_encoding = detected["encoding"]
-
-            if detected_encoding:
-                try:
-                    return raw_data.decode(detected_encoding)
-                except UnicodeDecodeError:
-                    pass
-        except Exception as e:
-            logger.error(f"Error detecting encoding for {file_path}: {e}")
-
-        raise UnicodeError(f"Failed to decode {file_path} with any encoding")
-
-    def _lookup_model_info(self, model_name: str) -> dict:
+    def _lookup_model_info(self, model_name: str) -> "ModelEntry":
         """
         Find the model information from the model dictionary and return the information about the matched model.
 
+        The dictionary is parsed once and shared through `live2d_model_registry`.
+
         Parameters:
             model_name (str): The name of the live2d model.
 
         Returns:
-            dict: The dictionary with the information of the matched model.
+            ModelEntry: The information of the matched model with its emotion map.
 
         Raises:
             FileNotFoundError if the model dictionary file is not found.
@@ -101,47 +281,9 @@ class Live2dModel:
         """
 
         self.live2d_model_name = model_name
-
-        try:
-            file_content = self._load_file_content(self.model_dict_path)
-            model_dict = json.loads(file_content)
-        except FileNotFoundError as file_e:
-            logger.critical(
-                f"Model dictionary file not found at {self.model_dict_path}."
-            )
-            raise file_e
-        except json.JSONDecodeError as json_e:
-            logger.critical(
-                f"Error decoding JSON from model dictionary file at {self.model_dict_path}."
-            )
-            raise json_e
-        except UnicodeError as uni_e:
-            logger.critical(
-                f"Error reading model dictionary file at {self.model_dict_path}."
-            )
-            raise uni_e
-        except Exception as e:
-            logger.critical(
-                f"Error occurred while reading model dictionary file at {self.model_dict_path}."
-            )
-            raise e
-
-        # Find the model in the model_dict
-        matched_model = next(
-            (model for model in model_dict if model["name"] == model_name), None
-        )
-
-        if matched_model is None:
-            logger.critical(f"Unable to find {model_name} in {self.model_dict_path}.")
-            raise KeyError(
-                f"{model_name} not found in model dictionary {self.model_dict_path}."
-            )
-
-        # The feature: "translate model url to full url if it starts with '/' " is no longer implemented here
-
+        entry = live2d_model_registry.get(model_name, self.model_dict_path)
         logger.info("Model Information Loaded.")
-
-        return matched_model
+        return entry
 
     def extract_emotion(self, str_to_check: str) -> list:
         """
@@ -1,7 +1,8 @@
 """MCP Client for Open-LLM-Vtuber."""
 
+import asyncio
 from contextlib import AsyncExitStack
-from typing import Dict, Any, List, Callable
+from typing import Dict, Any, List, Callable, Optional
 from loguru import logger
 from datetime import timedelta
 
@@ -10,6 +11,8 @@ from mcp.types import Tool
 from mcp.client.stdio import stdio_client
 
 from .server_registry import ServerRegistry
+from .server_pool import MCPServerPool, mcp_server_pool
+from .types import MCPServer
 
 DEFAULT_TIMEOUT = timedelta(seconds=30)
 
@@ -17,6 +20,9 @@ DEFAULT_TIMEOUT = timedelta(seconds=30)
 class MCPClient:
     """MCP Client for Open-LLM-Vtuber.
     Manages persistent connections to multiple MCP servers.
+
+    By default the servers come from the process-wide server pool, so sessions
+    share one process per server; the client only holds leases on them.
     """
 
     def __init__(
@@ -24,11 +30,21 @@ class MCPClient:
         server_registery: ServerRegistry,
         send_text: Callable = None,
         client_uid: str = None,
+        server_pool: Optional[MCPServerPool] = mcp_server_pool,
     ) -> None:
-        """Initialize the MCP Client."""
+        """Initialize the MCP Client.
+
+        Args:
+            server_pool: Pool to borrow servers from. None starts private server
+                processes that live as long as this client.
+        """
         self.exit_stack: AsyncExitStack = AsyncExitStack()
         self.active_sessions: Dict[str, ClientSession] = {}
         self._list_tools_cache: Dict[str, List[Tool]] = {}  # Cache for list_tools
+        # One lock per server, so concurrent tool calls start it only once
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._server_pool = server_pool
+        self._leased_servers: Dict[str, MCPServer] = {}
         self._send_text: Callable = send_text
         self._client_uid: str = client_uid
 
@@ -44,9 +60,34 @@ class MCPClient:
         self, server_name: str
     ) -> ClientSession:
         """Gets the existing session or creates a new one."""
+        if self._server_pool is not None:
+            return await self._get_pooled_session(server_name)
+
         if server_name in self.active_sessions:
             return self.active_sessions[server_name]
 
+        lock = self._session_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            if server_name in self.active_sessions:
+                return self.active_sessions[server_name]
+            return await self._start_session(server_name)
+
+    async def _get_pooled_session(self, server_name: str) -> ClientSession:
+        """Gets the shared session of a server from the pool."""
+        server = self._leased_servers.get(server_name)
+        if server is None:
+            server = self.server_registery.get_server(server_name)
+            if not server:
+                raise ValueError(
+                    f"MCPC: Server '{server_name}' not found in available servers."
+                )
+            self._server_pool.lease(server)
+            self._leased_servers[server_name] = server
+        # Not kept in active_sessions: the pool may have restarted the server
+        return await self._server_pool.get_session(server)
+
+    async def _start_session(self, server_name: str) -> ClientSession:
+        """Starts a server and connects a session to it."""
         logger.info(f"MCPC: Starting and connecting to server '{server_name}'...")
         server = self.server_registery.get_server(server_name)
         if not server:
@@ -157,9 +198,12 @@ class MCPClient:
     async def aclose(self) -> None:
         """Closes all active server connections."""
         logger.info(
-            f"MCPC: Closing client instance and {len(self.active_sessions)} active connections..."
+            f"MCPC: Closing client instance and {len(self.active_sessions) + len(self._leased_servers)} active connections..."
         )
         await self.exit_stack.aclose()
+        for server in self._leased_servers.values():
+            self._server_pool.release(server)
+        self._leased_servers.clear()
         self.active_sessions.clear()
         self._list_tools_cache.clear()  # Clear cache on close
         self.exit_stack = AsyncExitStack()
@@ -0,0 +1,112 @@
+"""Process-wide TTL cache for the results of idempotent MCP tools.
+
+Caching is opt-in per tool: a server in mcp_servers.json lists the tools whose
+results may be reused and for how many seconds, e.g.
+
+    "ddg-search": {
+        "command": "uvx",
+        "args": ["duckduckgo-mcp-server"],
+        "cache_ttl": {"search": 600}
+    }
+
+Results are keyed by server, tool and canonical JSON arguments, so calls whose
+arguments only differ in key order share an entry. The cache is shared by all
+sessions and bounded both in entries and in bytes; the least recently used
+entries are dropped first. Error results are never cached.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+@dataclass
+class _CacheEntry:
+    result: Dict[str, Any]
+    expires_at: float
+    size_bytes: int
+
+
+class ToolResultCache:
+    """LRU cache of tool results with a per-entry time to live."""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of cached results.
+            max_bytes: Maximum estimated size of all cached results.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(server_name: str, tool_name: str, tool_args: Any) -> str:
+        """Build a canonical key from the server, the tool and its arguments."""
+        return json.dumps(
+            [server_name, tool_name, tool_args],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for `key`, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result
+
+    def put(self, key: str, result: Dict[str, Any], ttl_seconds: float) -> None:
+        """Cache `result` for `ttl_seconds`."""
+        if ttl_seconds <= 0:
+            return
+        size_bytes = len(json.dumps(result, ensure_ascii=False, default=str))
+        if size_bytes > self.max_bytes:
+            logger.debug(f"MCPRC: Result too large to cache ({size_bytes} bytes).")
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(
+            result, time.monotonic() + ttl_seconds, size_bytes
+        )
+        self._total_bytes += size_bytes
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size_bytes
+
+
+# Shared by the tool executors of all sessions
+tool_result_cache = ToolResultCache()
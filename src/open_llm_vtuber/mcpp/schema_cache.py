@@ -0,0 +1,208 @@
+"""Persistent cache of the tool schemas of MCP servers.
+
+Discovering tools means starting every enabled server (often an npx/uvx cold
+start) and calling `list_tools`. The result is stored on disk per server, keyed
+by a hash of the server's command, args, env and cwd plus the versions of this
+package and of the MCP SDK, so a changed server definition or an upgrade misses
+the cache. The env is only hashed, never written to the file.
+
+Cached schemas are used at once and revalidated in the background, once per
+process and server (see `ToolAdapter`). Revalidation runs on the server's event
+loop: tools are first loaded inside the `asyncio.run` of initialization, whose
+loop ends right after, so revalidations requested before `start` wait for it.
+The formatted OpenAI/Claude tool lists and the MCP prompt string built from a
+set of servers are stored as well.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .types import MCPServer
+
+# Not under cache/: that directory only holds temporary files, may be on tmpfs
+# and is served to clients
+DEFAULT_SCHEMA_CACHE_PATH = "mcp_cache/tool_schemas.json"
+# Formatted tool sets kept for different combinations of enabled servers
+MAX_FORMATTED_ENTRIES = 16
+_CACHE_FORMAT_VERSION = 1
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _hash(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ToolSchemaCache:
+    """Tool schemas per MCP server, persisted to a JSON file."""
+
+    def __init__(self, path: str | Path = DEFAULT_SCHEMA_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self._data: Optional[Dict[str, Any]] = None
+        self._versions = {
+            "open-llm-vtuber": _package_version("open-llm-vtuber"),
+            "mcp": _package_version("mcp"),
+        }
+        self._revalidated: set[str] = set()
+        # Keys with a revalidation scheduled or running
+        self._pending: set[str] = set()
+        self._deferred: List[Callable[[], Awaitable[None]]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def server_key(self, server: MCPServer) -> str:
+        """Hash identifying the definition of a server."""
+        return _hash(
+            {
+                "command": server.command,
+                "args": server.args,
+                "env": server.env,
+                "cwd": server.cwd,
+                "versions": self._versions,
+            }
+        )
+
+    def get_tools(self, server: MCPServer) -> Optional[List[Dict[str, Any]]]:
+        """Cached tools of a server ({name, description, inputSchema}), or None."""
+        entry = self._load()["servers"].get(server.name)
+        if entry and entry.get("key") == self.server_key(server):
+            return entry["tools"]
+        return None
+
+    def put_tools(self, server: MCPServer, tools: List[Dict[str, Any]]) -> bool:
+        """
+        Store the tools of a server.
+
+        Returns:
+            bool: True if they differ from what was cached.
+        """
+        key = self.server_key(server)
+        servers = self._load()["servers"]
+        entry = servers.get(server.name)
+        if entry and entry.get("key") == key and entry.get("tools") == tools:
+            return False
+        servers[server.name] = {"key": key, "revision": _hash(tools), "tools": tools}
+        self._save()
+        return True
+
+    def formatted_key(self, servers: List[MCPServer]) -> Optional[str]:
+        """Key of the formatted tools of these servers, None unless all are cached."""
+        cached = self._load()["servers"]
+        revisions = []
+        for server in servers:
+            entry = cached.get(server.name)
+            if not entry or entry.get("key") != self.server_key(server):
+                return None
+            revisions.append([server.name, entry["revision"]])
+        return _hash(revisions)
+
+    def get_formatted(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._load()["formatted"].get(key)
+
+    def put_formatted(self, key: str, value: Dict[str, Any]) -> None:
+        formatted = self._load()["formatted"]
+        formatted.pop(key, None)
+        formatted[key] = value
+        while len(formatted) > MAX_FORMATTED_ENTRIES:
+            formatted.pop(next(iter(formatted)))
+        self._save()
+
+    def needs_revalidation(self, server: MCPServer) -> bool:
+        """True until a server definition was revalidated in this process."""
+        key = self.server_key(server)
+        return key not in self._revalidated and key not in self._pending
+
+    def mark_revalidated(self, server: MCPServer) -> None:
+        """Record that the cached tools of a server were checked against it."""
+        self._revalidated.add(self.server_key(server))
+
+    def schedule_revalidation(
+        self, servers: List[MCPServer], revalidate: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        Run `revalidate()` in the background on the server loop.
+
+        Before `start`, or from another event loop, it waits for `start`. The
+        servers are not offered for revalidation again meanwhile; `revalidate`
+        calls `mark_revalidated` for those that succeed.
+        """
+        keys = {self.server_key(server) for server in servers}
+        self._pending |= keys
+
+        async def run() -> None:
+            try:
+                await revalidate()
+            finally:
+                self._pending -= keys
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._loop is not None and loop is self._loop:
+            self._spawn(run)
+        else:
+            self._deferred.append(run)
+
+    async def start(self) -> None:
+        """Run the revalidations requested so far; later ones run at once."""
+        self._loop = asyncio.get_running_loop()
+        deferred, self._deferred = self._deferred, []
+        for run in deferred:
+            self._spawn(run)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self._loop = None
+
+    def _spawn(self, run: Callable[[], Awaitable[None]]) -> None:
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is not None:
+            return self._data
+        data = None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(
+                f"MCPSC: Ignoring unreadable schema cache '{self.path}': {e}"
+            )
+        if not isinstance(data, dict) or data.get("version") != _CACHE_FORMAT_VERSION:
+            data = {"version": _CACHE_FORMAT_VERSION, "servers": {}, "formatted": {}}
+        self._data = data
+        return data
+
+    def _save(self) -> None:
+        """Write the cache atomically, so a crash never leaves half a file."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps(self._data, ensure_ascii=False), encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"MCPSC: Could not write schema cache '{self.path}': {e}")
+
+
+# Shared by all tool adapters of the process
+tool_schema_cache = ToolSchemaCache()
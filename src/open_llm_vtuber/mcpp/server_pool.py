@@ -0,0 +1,275 @@
+"""Process-wide pool of running MCP servers shared by all client sessions.
+
+Without the pool every session's `MCPClient` started its own stdio subprocess
+for each server, so 30 clients meant 30 copies of every MCP server. The pool
+runs one process per server definition and lets every session use its
+`ClientSession`: MCP requests carry their own IDs, so calls from different
+sessions are multiplexed over the same connection.
+
+- Sessions lease a server while they use it and release it when they close.
+- Running servers are pinged every `HEALTH_CHECK_INTERVAL` seconds. A server
+  that does not answer (or whose process died) is stopped, and restarted right
+  away if some session holds a lease on it.
+- A server nobody has leased or called for `idle_timeout` seconds is shut down;
+  the next call starts it again.
+
+Each server runs in its own supervisor task, because the stdio transport and
+the session must be entered and exited in the same task. Those tasks belong to
+the event loop that started them: the tools are first listed inside the
+`asyncio.run` of initialization, and the servers started there end with that
+loop. Entries of another loop are replaced instead of restarted.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from loguru import logger
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from .types import MCPServer
+
+DEFAULT_TIMEOUT = timedelta(seconds=30)
+DEFAULT_IDLE_TIMEOUT = 300.0
+# Seconds between two health checks of the running servers
+HEALTH_CHECK_INTERVAL = 30.0
+# Seconds a server may take to answer a health check or to shut down
+PING_TIMEOUT = 10.0
+SHUTDOWN_TIMEOUT = 5.0
+
+
+def server_definition_key(server: MCPServer) -> str:
+    """Servers with the same definition share one process."""
+    canonical = json.dumps(
+        [server.name, server.command, server.args, server.env, server.cwd],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _PooledServer:
+    """One running MCP server and its session."""
+
+    def __init__(self, server: MCPServer):
+        self.server = server
+        self.leases = 0
+        self.last_used = time.monotonic()
+        self.restarts = 0
+        # The supervisor task and the locks only work in this loop
+        self.loop = asyncio.get_running_loop()
+        self.session: Optional[ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def crashed(self) -> bool:
+        """The server process ended without being stopped."""
+        return self._task is not None and self._task.done()
+
+    async def get_session(self) -> ClientSession:
+        """The session of the server, starting the server if needed."""
+        self.last_used = time.monotonic()
+        if self.session is not None and self.running:
+            return self.session
+        async with self._start_lock:
+            if self.session is not None and self.running:
+                return self.session
+            if self._task is not None:
+                # The process died or is still shutting down after a failure
+                self.restarts += 1
+                logger.info(f"MCPSP: Restarting server '{self.server.name}'.")
+                await self.stop()
+            loop = asyncio.get_running_loop()
+            self._ready = loop.create_future()
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self._run(self._ready, self._stop))
+            return await asyncio.shield(self._ready)
+
+    async def _run(self, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        server = self.server
+        logger.info(f"MCPSP: Starting server '{server.name}'...")
+        timeout = server.timeout if server.timeout else DEFAULT_TIMEOUT
+        if not isinstance(timeout, timedelta):
+            timeout = timedelta(seconds=timeout)
+        params = StdioServerParameters(
+            command=server.command, args=server.args, env=server.env, cwd=server.cwd
+        )
+        try:
+            async with stdio_client(params) as (read, write):
+                async with ClientSession(
+                    read, write, read_timeout_seconds=timeout
+                ) as session:
+                    await session.initialize()
+                    self.session = session
+                    ready.set_result(session)
+                    logger.info(f"MCPSP: Server '{server.name}' is ready.")
+                    await stop.wait()
+        except Exception as e:
+            logger.error(f"MCPSP: Server '{server.name}' failed: {e}")
+            if not ready.done():
+                ready.set_exception(
+                    RuntimeError(f"MCPSP: Failed to start server '{server.name}'.")
+                )
+        finally:
+            self.session = None
+            if not ready.done():
+                ready.cancel()
+            logger.info(f"MCPSP: Server '{server.name}' stopped.")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stop.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), SHUTDOWN_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            task.cancel()
+        except Exception as e:
+            logger.warning(f"MCPSP: Error stopping server '{self.server.name}': {e}")
+        self.session = None
+
+    async def check_health(self) -> bool:
+        session = self.session
+        if session is None or not self.running:
+            return False
+        try:
+            await asyncio.wait_for(session.send_ping(), PING_TIMEOUT)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"MCPSP: Server '{self.server.name}' failed health check: {e}"
+            )
+            return False
+
+
+class MCPServerPool:
+    """Shared, health-checked MCP server processes."""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Args:
+            idle_timeout: Seconds an unleased, unused server keeps running.
+        """
+        self.idle_timeout = idle_timeout
+        self._servers: Dict[str, _PooledServer] = {}
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    def configure(self, idle_timeout: float) -> None:
+        self.idle_timeout = idle_timeout
+
+    def _entry(self, server: MCPServer) -> _PooledServer:
+        loop = asyncio.get_running_loop()
+        key = server_definition_key(server)
+        entry = self._servers.get(key)
+        if entry is not None and entry.loop is not loop:
+            # Started in another event loop, which stopped the server when it
+            # ended; not a crash, so it does not count as a restart
+            logger.debug(
+                f"MCPSP: Server '{server.name}' was started in another event loop."
+            )
+            entry = None
+        if entry is None:
+            entry = self._servers[key] = _PooledServer(server)
+        if (
+            self._maintenance_task is None
+            or self._maintenance_task.done()
+            or self._maintenance_task.get_loop() is not loop
+        ):
+            self._maintenance_task = asyncio.create_task(self._maintain())
+        return entry
+
+    def lease(self, server: MCPServer) -> None:
+        """Keep the server running for a session until `release`."""
+        self._entry(server).leases += 1
+
+    def release(self, server: MCPServer) -> None:
+        entry = self._servers.get(server_definition_key(server))
+        if entry is not None and entry.leases > 0:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+
+    async def get_session(self, server: MCPServer) -> ClientSession:
+        """The shared session of a server, started on demand.
+
+        Raises:
+            RuntimeError: If the server cannot be started.
+        """
+        return await self._entry(server).get_session()
+
+    def stats(self) -> Dict[str, Dict[str, int | bool]]:
+        return {
+            entry.server.name: {
+                "running": entry.running,
+                "leases": entry.leases,
+                "restarts": entry.restarts,
+            }
+            for entry in self._servers.values()
+        }
+
+    async def close(self) -> None:
+        """Stop every server."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                entry.stop()
+                for entry in self._servers.values()
+                # The servers of an ended loop were stopped with it
+                if entry.loop is loop
+            ),
+            return_exceptions=True,
+        )
+        self._servers.clear()
+
+    async def _maintain(self) -> None:
+        """Health checks, restarts and idle shutdown."""
+        loop = asyncio.get_running_loop()
+        while self._servers:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            now = time.monotonic()
+            for key, entry in list(self._servers.items()):
+                if entry.loop is not loop:
+                    # Stopped with the loop it was started in
+                    del self._servers[key]
+                    continue
+                if entry.leases == 0 and now - entry.last_used >= self.idle_timeout:
+                    if entry.running:
+                        logger.info(
+                            f"MCPSP: Stopping idle server '{entry.server.name}'."
+                        )
+                    await entry.stop()
+                    del self._servers[key]
+                    continue
+                if entry.running:
+                    if entry.session is None or await entry.check_health():
+                        # Still starting, or healthy
+                        continue
+                elif not entry.crashed:
+                    continue
+                await entry.stop()
+                if entry.leases > 0:
+                    entry.restarts += 1
+                    logger.info(f"MCPSP: Restarting server '{entry.server.name}'.")
+                    try:
+                        await entry.get_session()
+                    except RuntimeError as e:
+                        # Retried on the next call or health check
+                        logger.error(str(e))
+
+
+# Shared by the MCP clients of all sessions
+mcp_server_pool = MCPServerPool()
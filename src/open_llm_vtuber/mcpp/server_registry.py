@@ -87,6 +87,9 @@ class ServerRegistry:
                 env=server_details.get("env", None),
                 cwd=server_details.get("cwd", None),
                 timeout=server_details.get("timeout", None),
+                max_concurrency=server_details.get("max_concurrency", 4),
+                tool_timeouts=server_details.get("tool_timeouts", {}),
+                cache_ttl=server_details.get("cache_ttl", {}),
             )
             logger.debug(f"MCPSR: Loaded server: '{server_name}'.")
 
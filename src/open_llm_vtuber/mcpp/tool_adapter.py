@@ -6,14 +6,25 @@ from loguru import logger
 from .types import FormattedTool
 from .mcp_client import MCPClient
 from .server_registry import ServerRegistry
+from .schema_cache import ToolSchemaCache, tool_schema_cache
 
 
 class ToolAdapter:
-    """Dynamically fetches tool information from enabled MCP servers and formats it."""
+    """Dynamically fetches tool information from enabled MCP servers and formats it.
 
-    def __init__(self, server_registery: Optional[ServerRegistry] = None) -> None:
-        """Initialize with an ServerRegistry."""
+    Tool schemas come from the persistent schema cache when it has them; those
+    servers are only started in the background, on the server loop, to
+    revalidate the cache.
+    """
+
+    def __init__(
+        self,
+        server_registery: Optional[ServerRegistry] = None,
+        schema_cache: Optional[ToolSchemaCache] = tool_schema_cache,
+    ) -> None:
+        """Initialize with an ServerRegistry and the schema cache (None disables it)."""
         self.server_registery = server_registery or ServerRegistry()
+        self.schema_cache = schema_cache
 
     async def get_server_and_tool_info(
         self, enabled_servers: List[str]
@@ -30,57 +41,121 @@ class ToolAdapter:
 
         logger.debug(f"MC: Fetching tool info for enabled servers: {enabled_servers}")
 
+        tools_by_server: Dict[str, List[Dict[str, Any]]] = {}
+        to_fetch: List[str] = []
+        to_revalidate: List[str] = []
+        for server_name in enabled_servers:
+            server = self.server_registery.get_server(server_name)
+            if not server:
+                logger.warning(
+                    f"MC: Enabled server '{server_name}' not found in Server Manager. Skipping."
+                )
+                continue
+            cached = self.schema_cache.get_tools(server) if self.schema_cache else None
+            if cached is None:
+                to_fetch.append(server_name)
+                continue
+            logger.debug(f"MC: Using cached tool schemas for server '{server_name}'")
+            tools_by_server[server_name] = cached
+            if self.schema_cache.needs_revalidation(server):
+                to_revalidate.append(server_name)
+
+        if to_fetch:
+            fetched = await self._fetch_tools(to_fetch)
+            for server_name, tools in fetched.items():
+                server = self.server_registery.get_server(server_name)
+                if tools is not None and self.schema_cache:
+                    self.schema_cache.put_tools(server, tools)
+                    # Just fetched: it needs no revalidation
+                    self.schema_cache.mark_revalidated(server)
+                tools_by_server[server_name] = tools or []
+
+        if to_revalidate:
+            self.schema_cache.schedule_revalidation(
+                [self.server_registery.get_server(name) for name in to_revalidate],
+                lambda: self._revalidate(to_revalidate),
+            )
+
+        # Keep the order of enabled_servers
+        for server_name in enabled_servers:
+            if server_name not in tools_by_server:
+                continue
+            servers_info[server_name] = {}
+            for tool in tools_by_server[server_name]:
+                input_schema = tool["inputSchema"]
+                servers_info[server_name][tool["name"]] = {
+                    "description": tool["description"],
+                    "parameters": input_schema.get("properties", {}),
+                    "required": input_schema.get("required", []),
+                }
+
+                # Store the tool info in FormattedTool format
+                formatted_tools[tool["name"]] = FormattedTool(
+                    input_schema=input_schema,
+                    related_server=server_name,
+                    description=tool["description"],
+                    # Generic schema will be generated later if needed
+                    generic_schema=None,
+                )
+
+        logger.debug(
+            f"MC: Finished fetching tool info. Found {len(formatted_tools)} tools across enabled servers."
+        )
+        return servers_info, formatted_tools
+
+    async def _fetch_tools(
+        self, server_names: List[str]
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """Start the servers and list their tools; None for servers that failed."""
+        results: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+
         # Use a single client instance for efficiency
         async with MCPClient(self.server_registery) as client:
-            for server_name in enabled_servers:
-                if server_name not in self.server_registery.servers:
-                    logger.warning(
-                        f"MC: Enabled server '{server_name}' not found in Server Manager. Skipping."
-                    )
-                    continue
-
+            for server_name in server_names:
                 try:
-                    servers_info[server_name] = {}
                     tools = await client.list_tools(server_name)
                     logger.debug(
                         f"MC: Found {len(tools)} tools on server '{server_name}'"
                     )
-                    for tool in tools:
-                        servers_info[server_name][tool.name] = {}
-                        tool_info = servers_info[server_name][tool.name]
-                        tool_info["description"] = tool.description
-                        tool_info["parameters"] = tool.inputSchema.get("properties", {})
-                        tool_info["required"] = tool.inputSchema.get("required", [])
-
-                        # Store the tool info in FormattedTool format
-                        formatted_tools[tool.name] = FormattedTool(
-                            input_schema=tool.inputSchema,
-                            related_server=server_name,
-                            description=tool.description,
-                            # Generic schema will be generated later if needed
-                            generic_schema=None,
-                        )
+                    results[server_name] = [
+                        {
+                            "name": tool.name,
+                            "description": tool.description,
+                            "inputSchema": tool.inputSchema,
+                        }
+                        for tool in tools
+                    ]
                 except (ValueError, RuntimeError, ConnectionError) as e:
                     logger.error(
                         f"MC: Failed to get info for server '{server_name}': {e}"
                     )
-                    if (
-                        server_name not in servers_info
-                    ):  # Ensure entry exists even on error
-                        servers_info[server_name] = {}
+                    results[server_name] = None
                     continue  # Continue to next server
                 except Exception as e:
                     logger.error(
                         f"MC: Unexpected error for server '{server_name}': {e}"
                     )
-                    if server_name not in servers_info:
-                        servers_info[server_name] = {}
+                    results[server_name] = None
                     continue  # Continue to next server
+        return results
 
-        logger.debug(
-            f"MC: Finished fetching tool info. Found {len(formatted_tools)} tools across enabled servers."
-        )
-        return servers_info, formatted_tools
+    async def _revalidate(self, server_names: List[str]) -> None:
+        """Refresh cached schemas from the running servers."""
+        try:
+            fetched = await self._fetch_tools(server_names)
+        except Exception as e:
+            logger.warning(f"MC: Background revalidation of tool schemas failed: {e}")
+            return
+        for server_name, tools in fetched.items():
+            server = self.server_registery.get_server(server_name)
+            if tools is None or server is None:
+                continue
+            self.schema_cache.mark_revalidated(server)
+            if self.schema_cache.put_tools(server, tools):
+                logger.info(
+                    f"MC: Tools of server '{server_name}' changed; "
+                    "the new schemas apply from the next session or config load."
+                )
 
     def construct_mcp_prompt_string(
         self, servers_info: Dict[str, Dict[str, str]]
@@ -226,7 +301,32 @@ class ToolAdapter:
         servers_info, formatted_tools_dict = await self.get_server_and_tool_info(
             enabled_servers
         )
+
+        formatted_key = None
+        if self.schema_cache:
+            formatted_key = self.schema_cache.formatted_key(
+                [
+                    self.server_registery.get_server(name)
+                    for name in enabled_servers
+                    if name in servers_info
+                ]
+            )
+        if formatted_key:
+            cached = self.schema_cache.get_formatted(formatted_key)
+            if cached:
+                logger.info("MC: Dynamic tool construction served from cache.")
+                return cached["prompt"], cached["openai"], cached["claude"]
+
         mcp_prompt_string = self.construct_mcp_prompt_string(servers_info)
         openai_tools, claude_tools = self.format_tools_for_api(formatted_tools_dict)
+        if formatted_key:
+            self.schema_cache.put_formatted(
+                formatted_key,
+                {
+                    "prompt": mcp_prompt_string,
+                    "openai": openai_tools,
+                    "claude": claude_tools,
+                },
+            )
         logger.info("MC: Dynamic tool construction complete.")
         return mcp_prompt_string, openai_tools, claude_tools
@@ -1,4 +1,5 @@
 import json
+import asyncio
 import datetime
 from loguru import logger
 from typing import (
@@ -6,6 +7,7 @@ from typing import (
     Any,
     List,
     Literal,
+    Optional,
     Union,
     AsyncIterator,
 )
@@ -13,6 +15,10 @@ from typing import (
 from .types import ToolCallObject
 from .mcp_client import MCPClient
 from .tool_manager import ToolManager
+from .result_cache import ToolResultCache, tool_result_cache
+
+# Seconds a tool call may take when its server sets no timeout for it
+DEFAULT_TOOL_TIMEOUT = 60
 
 
 class ToolExecutor:
@@ -20,9 +26,16 @@ class ToolExecutor:
         self,
         mcp_client: MCPClient,
         tool_manager: ToolManager,
+        default_tool_timeout: float = DEFAULT_TOOL_TIMEOUT,
+        result_cache: Optional[ToolResultCache] = tool_result_cache,
     ):
         self._mcp_client = mcp_client
         self._tool_manager = tool_manager
+        self._default_tool_timeout = default_tool_timeout
+        # Limits concurrent calls per server (see MCPServer.max_concurrency)
+        self._server_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Shared cache for tools declared cacheable (None disables caching)
+        self._result_cache = result_cache
 
     def parse_tool_call(self, call: Union[Dict[str, Any], ToolCallObject]) -> tuple:
         """Parse tool call from different formats.
@@ -157,148 +170,260 @@ class ToolExecutor:
         tool_calls: Union[List[Dict[str, Any]], List[ToolCallObject]],
         caller_mode: Literal["Claude", "OpenAI", "Prompt"],
     ) -> AsyncIterator[Dict[str, Any]]:
-        """Execute tools and yield status updates."""
-        tool_results_for_llm = []
+        """Execute tools and yield status updates.
+
+        The calls run concurrently, at most `max_concurrency` at a time on each
+        MCP server and each within its timeout. A 'running' status is yielded as
+        each call starts and a 'completed'/'error' status as each one finishes,
+        so a turn takes as long as its slowest tool. The final results keep the
+        order of `tool_calls`.
+        """
+        results_by_index: List[Dict[str, Any] | None] = [None] * len(tool_calls)
+        tasks: Dict[asyncio.Task, tuple[int, str, str]] = {}
 
         logger.info(f"Executing {len(tool_calls)} tool(s) for {caller_mode} caller.")
-        for call in tool_calls:
-            (
-                tool_name,
-                tool_id,
-                tool_input,
-                is_error,
-                result_content,
-                parse_error,
-            ) = self.parse_tool_call(call)
-
-            logger.info(f"Executing tool: {call}")
-
-            if parse_error:
-                logger.warning(
-                    f"Skipping tool call due to parsing error: {result_content}"
+        try:
+            for index, call in enumerate(tool_calls):
+                (
+                    tool_name,
+                    tool_id,
+                    tool_input,
+                    is_error,
+                    result_content,
+                    parse_error,
+                ) = self.parse_tool_call(call)
+
+                logger.info(f"Executing tool: {call}")
+
+                if parse_error:
+                    logger.warning(
+                        f"Skipping tool call due to parsing error: {result_content}"
+                    )
+                    status_update = {
+                        "type": "tool_call_status",
+                        "tool_id": tool_id
+                        or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
+                        "tool_name": tool_name or "Unknown Tool",
+                        "status": "error",
+                        "content": result_content,
+                        "timestamp": datetime.datetime.now(
+                            datetime.timezone.utc
+                        ).isoformat()
+                        + "Z",
+                    }
+                    yield status_update
+                    # Even on parse error, we might need to format a result for the LLM
+                    # Use dummy values or the error message
+                    results_by_index[index] = self.format_tool_result(
+                        caller_mode,
+                        tool_id
+                        or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
+                        result_content,
+                        True,  # is_error
+                    )
+                    continue  # Skip execution logic for this call
+
+                task = asyncio.create_task(
+                    self._run_tool_limited(tool_name, tool_id, tool_input)
                 )
-                status_update = {
+                tasks[task] = (index, tool_name, tool_id)
+
+                # Yield 'running' status; the tool is already executing
+                yield {
                     "type": "tool_call_status",
-                    "tool_id": tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                    "tool_name": tool_name or "Unknown Tool",
-                    "status": "error",
-                    "content": result_content,
+                    "tool_id": tool_id,
+                    "tool_name": tool_name,
+                    "status": "running",
+                    "content": f"Input: {json.dumps(tool_input)}",
                     "timestamp": datetime.datetime.now(
                         datetime.timezone.utc
                     ).isoformat()
                     + "Z",
                 }
-                yield status_update
-                # Even on parse error, we might need to format a result for the LLM
-                # Use dummy values or the error message
-                formatted_result = self.format_tool_result(
-                    caller_mode,
-                    tool_id
-                    or f"parse_error_{datetime.datetime.now(datetime.timezone.utc).isoformat()}",
-                    result_content,
-                    True,  # is_error
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-                if formatted_result:
-                    tool_results_for_llm.append(formatted_result)
-                continue  # Skip execution logic for this call
+                for task in sorted(done, key=lambda t: tasks[t][0]):
+                    index, tool_name, tool_id = tasks[task]
+                    outcome, cached = task.result()
+                    status_update, formatted_result = self._build_tool_outcome(
+                        caller_mode, tool_name, tool_id, *outcome
+                    )
+                    if cached:
+                        status_update["cached"] = True
+                    yield status_update
+                    results_by_index[index] = formatted_result
+        finally:
+            # The caller stopped listening: do not leave tools running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        tool_results_for_llm = [r for r in results_by_index if r]
+        logger.info(
+            f"Finished executing tools with {len(tool_results_for_llm)} results."
+        )
+        yield {"type": "final_tool_results", "results": tool_results_for_llm}
 
-            # Yield 'running' status before execution
-            yield {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "running",
-                "content": f"Input: {json.dumps(tool_input)}",
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-                + "Z",
-            }
+    def _build_tool_outcome(
+        self,
+        caller_mode: Literal["Claude", "OpenAI", "Prompt"],
+        tool_name: str,
+        tool_id: str,
+        is_error: bool,
+        text_content: str,
+        metadata: Dict[str, Any],
+        content_items: List[Dict[str, Any]],
+    ) -> tuple[Dict[str, Any], Dict[str, Any] | None]:
+        """Build the status update and the LLM result of a finished tool call.
 
-            # Execute the tool
-            (
-                is_error,
-                text_content,
-                metadata,
-                content_items,
-            ) = await self.run_single_tool(tool_name, tool_id, tool_input)
-
-            # Determine content for status update and LLM result format
-            status_content = text_content  # Default to text content
-            llm_formatted_content = text_content  # Default to text content for LLM
-
-            if content_items:
-                image_items = [
-                    item for item in content_items if item.get("type") == "image"
-                ]
-                if image_items:
-                    num_images = len(image_items)
-                    status_content = (
-                        f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
-                    )
+        Returns:
+            tuple: (status_update, formatted_result)
+        """
+        # Determine content for status update and LLM result format
+        status_content = text_content  # Default to text content
+        llm_formatted_content = text_content  # Default to text content for LLM
+
+        if content_items:
+            image_items = [
+                item for item in content_items if item.get("type") == "image"
+            ]
+            if image_items:
+                num_images = len(image_items)
+                status_content = (
+                    f"{text_content}\n[Tool returned {num_images} image(s)]".strip()
+                )
 
-                    if caller_mode == "Claude":
-                        # Format for Claude: list of blocks
-                        claude_blocks = []
-                        if text_content:
-                            claude_blocks.append({"type": "text", "text": text_content})
-                        for item in content_items:
-                            if (
-                                item.get("type") == "image"
-                                and "data" in item
-                                and "mimeType" in item
-                            ):
-                                claude_blocks.append(
-                                    {
-                                        "type": "image",
-                                        "source": {
-                                            "type": "base64",
-                                            "media_type": item["mimeType"],
-                                            "data": item["data"],
-                                        },
-                                    }
-                                )
-                            # Add other non-text types here
-                        llm_formatted_content = (
-                            claude_blocks if claude_blocks else ""
-                        )  # Use blocks or empty string
-                    elif caller_mode in ["OpenAI", "Prompt"]:
-                        llm_formatted_content = status_content
-
-            # Prepare and yield tool call status update
-            status_update = {
-                "type": "tool_call_status",
-                "tool_id": tool_id,
-                "tool_name": tool_name,
-                "status": "error" if is_error else "completed",
-                "content": status_content
-                if not is_error
-                else f"Error: {text_content}",  # Use descriptive content or error message
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat()
-                + "Z",
-            }
+                if caller_mode == "Claude":
+                    # Format for Claude: list of blocks
+                    claude_blocks = []
+                    if text_content:
+                        claude_blocks.append({"type": "text", "text": text_content})
+                    for item in content_items:
+                        if (
+                            item.get("type") == "image"
+                            and "data" in item
+                            and "mimeType" in item
+                        ):
+                            claude_blocks.append(
+                                {
+                                    "type": "image",
+                                    "source": {
+                                        "type": "base64",
+                                        "media_type": item["mimeType"],
+                                        "data": item["data"],
+                                    },
+                                }
+                            )
+                        # Add other non-text types here
+                    llm_formatted_content = (
+                        claude_blocks if claude_blocks else ""
+                    )  # Use blocks or empty string
+                elif caller_mode in ["OpenAI", "Prompt"]:
+                    llm_formatted_content = status_content
+
+        # Prepare tool call status update
+        status_update = {
+            "type": "tool_call_status",
+            "tool_id": tool_id,
+            "tool_name": tool_name,
+            "status": "error" if is_error else "completed",
+            "content": status_content
+            if not is_error
+            else f"Error: {text_content}",  # Use descriptive content or error message
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat() + "Z",
+        }
+
+        # For stagehand_navigate tool, include browser view links if available
+        if tool_name == "stagehand_navigate" and not is_error:
+            live_view_data = metadata.get("liveViewData", {})
+            if live_view_data:
+                logger.info(
+                    f"Found live view data for stagehand_navigate: {live_view_data}"
+                )
+                status_update["browser_view"] = live_view_data
 
-            # For stagehand_navigate tool, include browser view links if available
-            if tool_name == "stagehand_navigate" and not is_error:
-                live_view_data = metadata.get("liveViewData", {})
-                if live_view_data:
-                    logger.info(
-                        f"Found live view data for stagehand_navigate: {live_view_data}"
-                    )
-                    status_update["browser_view"] = live_view_data
+        # Format result for LLM
+        formatted_result = self.format_tool_result(
+            caller_mode, tool_id, llm_formatted_content, is_error
+        )
+        return status_update, formatted_result
 
-            yield status_update
+    async def _run_tool_limited(
+        self, tool_name: str, tool_id: str, tool_input: Any
+    ) -> tuple[tuple[bool, str, Dict[str, Any], List[Dict[str, Any]]], bool]:
+        """Run a tool within its server's concurrency limit and its timeout.
 
-            # Format result for LLM and add to list
-            formatted_result = self.format_tool_result(
-                caller_mode, tool_id, llm_formatted_content, is_error
-            )
-            if formatted_result:
-                tool_results_for_llm.append(formatted_result)
+        Results of tools the server declares cacheable are taken from and
+        stored in the result cache.
 
-        logger.info(
-            f"Finished executing tools with {len(tool_results_for_llm)} results."
+        Returns:
+            tuple: (run_single_tool result, whether it came from the cache)
+        """
+        tool_info = self._tool_manager.get_tool(tool_name)
+        server_name = tool_info.related_server if tool_info else None
+        server = (
+            self._mcp_client.server_registery.get_server(server_name)
+            if server_name
+            else None
         )
-        yield {"type": "final_tool_results", "results": tool_results_for_llm}
+        if server is None:
+            # Unknown tool or server: run_single_tool reports the error
+            return await self.run_single_tool(tool_name, tool_id, tool_input), False
+
+        cache_ttl = server.cache_ttl.get(tool_name)
+        cache_key = None
+        if cache_ttl and self._result_cache is not None:
+            cache_key = self._result_cache.make_key(server_name, tool_name, tool_input)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Tool '{tool_name}' result served from cache.")
+                return (
+                    False,
+                    cached["text_content"],
+                    cached["metadata"],
+                    cached["content_items"],
+                ), True
+
+        semaphore = self._server_semaphores.get(server_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, server.max_concurrency))
+            self._server_semaphores[server_name] = semaphore
+        timeout = server.tool_timeouts.get(tool_name, self._default_tool_timeout)
+
+        async with semaphore:
+            try:
+                outcome = await asyncio.wait_for(
+                    self.run_single_tool(tool_name, tool_id, tool_input),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Tool '{tool_name}' timed out after {timeout} seconds.")
+                text_content = (
+                    f"Error: Tool '{tool_name}' timed out after {timeout} seconds."
+                )
+                outcome = (
+                    True,
+                    text_content,
+                    {},
+                    [{"type": "error", "text": text_content}],
+                )
+
+        is_error, text_content, metadata, content_items = outcome
+        if cache_key is not None and not is_error:
+            self._result_cache.put(
+                cache_key,
+                {
+                    "text_content": text_content,
+                    "metadata": metadata,
+                    "content_items": content_items,
+                },
+                cache_ttl,
+            )
+        return outcome, False
 
     async def run_single_tool(
         self, tool_name: str, tool_id: str, tool_input: Any
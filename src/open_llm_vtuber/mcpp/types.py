@@ -14,6 +14,9 @@ class MCPServer:
         env (Optional[dict[str, str]], optional): Environment variables for the command. Defaults to None.
         cwd (Optional[str], optional): Working directory for the command. Defaults to None.
         timeout (Optional[timedelta], optional): Timeout for the command. Defaults to 10 seconds.
+        max_concurrency (int, optional): Maximum number of tool calls running at once on the server. Defaults to 4.
+        tool_timeouts (dict[str, float], optional): Timeout in seconds for individual tools. Defaults to an empty dict.
+        cache_ttl (dict[str, float], optional): Tools whose results may be cached, with the time to live in seconds. Defaults to an empty dict.
     """
 
     name: str
@@ -23,6 +26,9 @@ class MCPServer:
     cwd: str | None = None
     timeout: Optional[timedelta] = timedelta(seconds=30)
     description: str = "No description available."
+    max_concurrency: int = 4
+    tool_timeouts: dict[str, float] = field(default_factory=dict)
+    cache_ttl: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
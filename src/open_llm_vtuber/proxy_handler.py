@@ -16,12 +16,17 @@ class ProxyHandler:
     This enables scenarios like having a web client and a live platform both connected to the same VTuber server.
     """
 
-    def __init__(self, server_url: str = "ws://localhost:12393/client-ws"):
+    def __init__(
+        self,
+        server_url: str = "ws://localhost:12393/client-ws",
+        message_queue: Optional[ProxyMessageQueue] = None,
+    ):
         """
         Initialize the proxy handler.
 
         Args:
             server_url: The WebSocket URL of the actual server
+            message_queue: Queue for text inputs. A default queue if omitted.
         """
         self.server_url = server_url
         self.server_ws: Optional[aiohttp.ClientWebSocketResponse] = None
@@ -31,7 +36,7 @@ class ProxyHandler:
         self.lock = asyncio.Lock()
 
         # Initialize message queue manager
-        self.message_queue = ProxyMessageQueue()
+        self.message_queue = message_queue or ProxyMessageQueue()
         self._heartbeat_task: Optional[asyncio.Task] = None
         self._running = True
         self._session: Optional[aiohttp.ClientSession] = None
@@ -1,20 +1,82 @@
 import asyncio
-from typing import Dict, Optional, Deque, Any, Callable
+import itertools
+from typing import Dict, List, Literal, Optional, Deque, Any, Callable
 from collections import deque
+from dataclasses import dataclass
 from loguru import logger
 
+# Message priorities; a higher priority is forwarded first
+PRIORITY_NORMAL = 0
+PRIORITY_SUPER_CHAT = 10
+
+# Values of the optional "source" field of a text-input message
+SOURCE_DANMAKU = "danmaku"
+SOURCE_SUPER_CHAT = "super_chat"
+# Clients do not choose a priority, they say where the message comes from
+PRIORITY_BY_SOURCE = {
+    SOURCE_DANMAKU: PRIORITY_NORMAL,
+    SOURCE_SUPER_CHAT: PRIORITY_SUPER_CHAT,
+}
+
+EvictionPolicy = Literal["drop_lowest", "drop_oldest", "reject_new"]
+
+
+def message_priority(message: Dict) -> int:
+    """Priority of a message, from its source. Unknown sources are normal."""
+    source = message.get("source")
+    if not isinstance(source, str):
+        return PRIORITY_NORMAL
+    return PRIORITY_BY_SOURCE.get(source, PRIORITY_NORMAL)
+
+
+@dataclass
+class _QueueItem:
+    message: Dict
+    sender_id: Optional[str]
+    priority: int
+    sequence: int
+
 
 class ProxyMessageQueue:
     """
     Manages message queuing and consumption for the proxy handler.
     Implements a producer-consumer pattern with conversation state awareness.
+
+    The consumer waits on an event instead of polling: it wakes up when a message
+    is queued or the current conversation ends. Messages get a priority from
+    their optional "source" field (see `PRIORITY_BY_SOURCE`) and higher
+    priorities are forwarded first. The queue holds at most `max_length` messages; when it is
+    full, the eviction policy decides which message is dropped. With coalescing
+    enabled, the messages waiting when the AI becomes free are merged into one
+    text-input so a busy chat does not turn every message into its own turn.
     """
 
-    def __init__(self):
-        """Initialize the message queue manager"""
-        self.message_queue: Deque[Dict] = deque()
+    def __init__(
+        self,
+        max_length: int = 100,
+        eviction_policy: EvictionPolicy = "drop_lowest",
+        coalesce_max: int = 1,
+    ):
+        """
+        Initialize the message queue manager
+
+        Args:
+            max_length: Maximum number of queued messages
+            eviction_policy: What to drop when the queue is full. "drop_lowest"
+                drops the oldest message of the lowest priority (possibly the new
+                one), "drop_oldest" the oldest message, "reject_new" the new one
+            coalesce_max: Maximum number of queued messages merged into one
+                conversation turn. 1 forwards messages one by one
+        """
+        self.max_length = max(1, max_length)
+        self.eviction_policy = eviction_policy
+        self.coalesce_max = max(1, coalesce_max)
+        # priority -> messages of that priority, oldest first
+        self.message_queue: Dict[int, Deque[_QueueItem]] = {}
+        self.dropped_count = 0
+        self._sequence = itertools.count()
         self._conversation_active = False
-        self.lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
         self._consumer_task = None
         self._forward_func = None
         self._running = False
@@ -37,16 +99,27 @@ class ProxyMessageQueue:
             message: The message to queue
             sender_id: Optional ID of the client that sent the message
         """
-        # Store the message along with its sender ID
-        queue_item = {"message": message, "sender_id": sender_id}
+        priority = message_priority(message)
+        item = _QueueItem(message, sender_id, priority, next(self._sequence))
         logger.info(
-            f"Queuing message: {message.get('text', '')} (active conversation: {self._conversation_active})"
+            f"Queuing message: {message.get('text', '')} (priority: {priority}, "
+            f"active conversation: {self._conversation_active})"
         )
-        self.message_queue.append(queue_item)
+
+        if len(self) >= self.max_length and not self._evict_for(item):
+            self.dropped_count += 1
+            logger.info(f"Queue full, dropped new message: {message.get('text', '')}")
+            return
+
+        self.message_queue.setdefault(priority, deque()).append(item)
+        self._wakeup.set()
 
         # Start consumer if needed
         self._ensure_consumer_running()
 
+    def __len__(self) -> int:
+        return sum(len(items) for items in self.message_queue.values())
+
     @property
     def conversation_active(self) -> bool:
         """Get the conversation active state"""
@@ -64,8 +137,9 @@ class ProxyMessageQueue:
             logger.debug(f"Setting conversation active state to: {active}")
             self._conversation_active = active
 
-            # If conversation becomes inactive, make sure consumer is running to process any queued messages
+            # If conversation becomes inactive, wake the consumer up for queued messages
             if not active and self.has_pending_messages():
+                self._wakeup.set()
                 self._ensure_consumer_running()
 
     def has_pending_messages(self) -> bool:
@@ -75,7 +149,49 @@ class ProxyMessageQueue:
         Returns:
             bool: True if there are messages to process, False otherwise
         """
-        return len(self.message_queue) > 0
+        return any(self.message_queue.values())
+
+    def _evict_for(self, new_item: _QueueItem) -> bool:
+        """
+        Make room for a new message according to the eviction policy.
+
+        Returns:
+            bool: True if room was made, False if the new message must be dropped
+        """
+        if self.eviction_policy == "reject_new":
+            return False
+
+        if self.eviction_policy == "drop_oldest":
+            victim_priority = min(
+                (p for p, items in self.message_queue.items() if items),
+                key=lambda p: self.message_queue[p][0].sequence,
+            )
+        else:
+            victim_priority = min(p for p, items in self.message_queue.items() if items)
+            if new_item.priority < victim_priority:
+                # The new message is the least important one
+                return False
+
+        victim = self.message_queue[victim_priority].popleft()
+        self.dropped_count += 1
+        logger.info(
+            f"Queue full, dropped message: {victim.message.get('text', '')} "
+            f"(priority: {victim.priority})"
+        )
+        return True
+
+    def _take_next(self) -> List[_QueueItem]:
+        """Remove the messages for the next turn: highest priority first, FIFO within."""
+        items: List[_QueueItem] = []
+        for priority in sorted(self.message_queue, reverse=True):
+            queue = self.message_queue[priority]
+            while queue and len(items) < self.coalesce_max:
+                items.append(queue.popleft())
+            if not queue:
+                del self.message_queue[priority]
+            if len(items) >= self.coalesce_max:
+                break
+        return items
 
     def _ensure_consumer_running(self):
         """Ensure the consumer task is running if needed"""
@@ -89,48 +205,48 @@ class ProxyMessageQueue:
             logger.debug("Started message consumer task")
 
     async def _consume_loop(self):
-        """Background task that consumes messages based on conversation state"""
+        """Background task that forwards messages whenever no conversation is active"""
         try:
             while self._running:
-                # Wait a short time to prevent CPU hogging
-                await asyncio.sleep(0.1)
-
-                # Try to consume a message if appropriate
-                async with self.lock:
-                    if not self._conversation_active and self.has_pending_messages():
-                        # Get next message
-                        queue_item = self.message_queue.popleft()
-                        message = queue_item["message"]
-                        sender_id = queue_item["sender_id"]
-
-                        logger.info(
-                            f"Consumer processing message: {message.get('text', '')}"
-                        )
-
-                        # Set active before forwarding to prevent race conditions
-                        self._conversation_active = True
-
-                        # Forward the message outside the lock to prevent deadlocks
-                        asyncio.create_task(self._forward_message(message, sender_id))
-
-                # If queue is empty and we've been idle for a while, we can pause the consumer
-                if not self.has_pending_messages() and not self._conversation_active:
-                    await asyncio.sleep(1)  # Wait a bit longer before deciding to stop
-                    if (
-                        not self.has_pending_messages()
-                        and not self._conversation_active
-                    ):
-                        logger.debug(
-                            "No more pending messages and no active conversation, pausing consumer"
-                        )
-                        break
+                if self._conversation_active or not self.has_pending_messages():
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                items = self._take_next()
+                message, sender_id = self._merge(items)
+                logger.info(
+                    f"Consumer processing message: {message.get('text', '')}"
+                    + (f" ({len(items)} messages coalesced)" if len(items) > 1 else "")
+                )
+
+                # Set active before forwarding to prevent race conditions
+                self._conversation_active = True
 
+                asyncio.create_task(self._forward_message(message, sender_id))
+
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error(f"Error in message consumer loop: {e}")
         finally:
             self._running = False
             logger.debug("Message consumer task ended")
 
+    @staticmethod
+    def _merge(items: List[_QueueItem]) -> tuple[Dict, Optional[str]]:
+        """Merge the messages of one turn into a single text-input message."""
+        if len(items) == 1:
+            return items[0].message, items[0].sender_id
+
+        merged = dict(items[0].message)
+        merged["text"] = "\n".join(str(item.message.get("text", "")) for item in items)
+        merged["coalesced_count"] = len(items)
+        senders = {item.sender_id for item in items}
+        # Only exclude the sender from the transcription broadcast if there is one
+        sender_id = items[0].sender_id if len(senders) == 1 else None
+        return merged, sender_id
+
     async def _forward_message(self, message: Dict, sender_id: Optional[str] = None):
         """Forward a message using the provided forward function"""
         try:
@@ -150,7 +266,7 @@ class ProxyMessageQueue:
         except Exception as e:
             logger.error(f"Error forwarding message: {e}")
             # If forwarding fails, mark conversation as inactive to allow next message
-            self._conversation_active = False
+            self.conversation_active = False
 
     def stop(self):
         """Stop the consumer task"""
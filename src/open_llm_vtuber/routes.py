@@ -1,15 +1,49 @@
-import os
 import json
+import time
+import asyncio
+from pathlib import Path
+from typing import List, Optional
 from uuid import uuid4
 import numpy as np
-from datetime import datetime
 from fastapi import APIRouter, WebSocket, UploadFile, File, Response
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 from starlette.websockets import WebSocketDisconnect
 from loguru import logger
 from .service_context import ServiceContext
+from .asr.asr_interface import ASRInterface
+from .asr.asr_pool import asr_request_source
+from .utils.audio_ingest import WavStreamParser
+from .utils.sentence_divider import split_sentences
+from .conversations.tts_manager import synthesize_in_order
 from .websocket_handler import WebSocketHandler
 from .proxy_handler import ProxyHandler
+from .proxy_message_queue import ProxyMessageQueue
+from .live2d_model import live2d_model_registry
+from .utils.cache_manager import cache_manager
+
+
+# Size of the pieces an upload is read and decoded in
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+TTS_WS_DELIVERY_MODES = ("path", "binary", "chunked")
+TTS_WS_DEFAULT_CHUNK_SIZE = 32 * 1024
+TTS_WS_DEFAULT_CONCURRENCY = 4
+# Clients share the default TTS engine, so they may not ask for more than this
+TTS_WS_MAX_CONCURRENCY = 8
+
+
+async def _read_wav_upload(file: UploadFile) -> np.ndarray:
+    """
+    Decode an uploaded WAV file into ASR input, reading it piece by piece.
+
+    Raises:
+        ValueError: If the file is not a supported WAV file.
+    """
+    parser = WavStreamParser(target_rate=ASRInterface.SAMPLE_RATE)
+    while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+        parser.feed(chunk)
+    # Resampling a long recording takes a while, keep it off the event loop
+    return await asyncio.to_thread(parser.finish)
 
 
 def init_client_ws_route(default_context_cache: ServiceContext) -> APIRouter:
@@ -45,18 +79,21 @@ def init_client_ws_route(default_context_cache: ServiceContext) -> APIRouter:
     return router
 
 
-def init_proxy_route(server_url: str) -> APIRouter:
+def init_proxy_route(
+    server_url: str, message_queue: Optional[ProxyMessageQueue] = None
+) -> APIRouter:
     """
     Create and return API routes for handling proxy connections.
 
     Args:
         server_url: The WebSocket URL of the actual server
+        message_queue: Queue for text inputs coming through the proxy
 
     Returns:
         APIRouter: Configured router with proxy WebSocket endpoint
     """
     router = APIRouter()
-    proxy_handler = ProxyHandler(server_url)
+    proxy_handler = ProxyHandler(server_url, message_queue)
 
     @router.websocket("/proxy-ws")
     async def proxy_endpoint(websocket: WebSocket):
@@ -93,43 +130,42 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
         """Redirect /web_tool to /web_tool/index.html"""
         return Response(status_code=302, headers={"Location": "/web-tool/index.html"})
 
+    @router.get("/ready")
+    async def readiness():
+        """
+        Report the load state and load time of each engine.
+
+        run_server.py loads the engines before the server starts listening, so
+        there this shows the final states, failures and deferred engines being
+        loaded on first use. The "loading" states of the startup are only
+        observable when `initialize()` runs after the server has started.
+        """
+        engines = {
+            name: status.to_dict()
+            for name, status in default_context_cache.engine_status.items()
+        }
+        # Deferred engines are loaded on first use and do not block readiness
+        ready = bool(engines) and all(
+            engine["state"] in ("ready", "deferred") for engine in engines.values()
+        )
+        return JSONResponse(
+            {"ready": ready, "engines": engines},
+            status_code=200 if ready else 503,
+        )
+
+    @router.get("/cache-stats")
+    async def cache_stats():
+        """Report the size of the cache directory and the bytes written and reclaimed"""
+        return JSONResponse(await asyncio.to_thread(cache_manager.stats))
+
     @router.get("/live2d-models/info")
     async def get_live2d_folder_info():
         """Get information about available Live2D models"""
-        live2d_dir = "live2d-models"
-        if not os.path.exists(live2d_dir):
+        valid_characters = live2d_model_registry.folder_info("live2d-models")
+        if valid_characters is None:
             return JSONResponse(
                 {"error": "Live2D models directory not found"}, status_code=404
             )
-
-        valid_characters = []
-        supported_extensions = [".png", ".jpg", ".jpeg"]
-
-        for entry in os.scandir(live2d_dir):
-            if entry.is_dir():
-                folder_name = entry.name.replace("\\", "/")
-                model3_file = os.path.join(
-                    live2d_dir, folder_name, f"{folder_name}.model3.json"
-                ).replace("\\", "/")
-
-                if os.path.isfile(model3_file):
-                    # Find avatar file if it exists
-                    avatar_file = None
-                    for ext in supported_extensions:
-                        avatar_path = os.path.join(
-                            live2d_dir, folder_name, f"{folder_name}{ext}"
-                        )
-                        if os.path.isfile(avatar_path):
-                            avatar_file = avatar_path.replace("\\", "/")
-                            break
-
-                    valid_characters.append(
-                        {
-                            "name": folder_name,
-                            "avatar": avatar_file,
-                            "model_path": model3_file,
-                        }
-                    )
         return JSONResponse(
             {
                 "type": "live2d-models/info",
@@ -146,35 +182,10 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
         logger.info(f"Received audio file for transcription: {file.filename}")
 
         try:
-            contents = await file.read()
-
-            # Validate minimum file size
-            if len(contents) < 44:  # Minimum WAV header size
-                raise ValueError("Invalid WAV file: File too small")
-
-            # Decode the WAV header and get actual audio data
-            wav_header_size = 44  # Standard WAV header size
-            audio_data = contents[wav_header_size:]
-
-            # Validate audio data size
-            if len(audio_data) % 2 != 0:
-                raise ValueError("Invalid audio data: Buffer size must be even")
-
-            # Convert to 16-bit PCM samples to float32
-            try:
-                audio_array = (
-                    np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-                    / 32768.0
-                )
-            except ValueError as e:
-                raise ValueError(
-                    f"Audio format error: {str(e)}. Please ensure the file is 16-bit PCM WAV format."
-                )
-
-            # Validate audio data
-            if len(audio_array) == 0:
-                raise ValueError("Empty audio data")
+            audio_array = await _read_wav_upload(file)
 
+            # Queue uploads separately so they take turns with live sessions
+            asr_request_source.set("http")
             text = await default_context_cache.asr_engine.async_transcribe_np(
                 audio_array
             )
@@ -198,9 +209,73 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
                 media_type="application/json",
             )
 
+    @router.post("/asr/bulk")
+    async def transcribe_audio_bulk(files: List[UploadFile] = File(...)):
+        """
+        Transcribe many WAV files at once.
+
+        All files are queued together, so the ASR engine can decode them in
+        batches. Results are streamed back as newline-delimited JSON, one line per
+        file in the order they finish, with the index of the file in the upload.
+        """
+        logger.info(f"Received {len(files)} audio files for bulk transcription")
+        received = time.perf_counter()
+
+        async def transcribe_one(index: int, file: UploadFile) -> dict:
+            result = {"index": index, "filename": file.filename}
+            try:
+                audio_array = await _read_wav_upload(file)
+                asr_request_source.set("http-bulk")
+                started = time.perf_counter()
+                text = await default_context_cache.asr_engine.async_transcribe_np(
+                    audio_array
+                )
+                result["text"] = text
+                result["duration"] = round(
+                    len(audio_array) / ASRInterface.SAMPLE_RATE, 3
+                )
+                result["transcribe_ms"] = round(
+                    (time.perf_counter() - started) * 1000, 1
+                )
+            except ValueError as e:
+                result["error"] = str(e)
+            except Exception as e:
+                logger.error(f"Error transcribing {file.filename}: {e}")
+                result["error"] = "Internal server error during transcription"
+            result["elapsed_ms"] = round((time.perf_counter() - received) * 1000, 1)
+            return result
+
+        async def stream_results():
+            tasks = [
+                asyncio.create_task(transcribe_one(i, f)) for i, f in enumerate(files)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield json.dumps(await next_done, ensure_ascii=False) + "\n"
+            finally:
+                # The client went away: drop the requests still queued
+                for task in tasks:
+                    task.cancel()
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
     @router.websocket("/tts-ws")
     async def tts_endpoint(websocket: WebSocket):
-        """WebSocket endpoint for TTS generation"""
+        """
+        WebSocket endpoint for TTS generation
+
+        Each request is a JSON message with the text to speak and optionally:
+        - "delivery": how audio is returned for each sentence. "path" (default)
+          sends the path of the generated file under cache/. "binary" sends the
+          audio itself as one binary frame after the sentence message, "chunked"
+          as `chunks` binary frames of at most `chunk_size` bytes.
+        - "chunk_size": frame size in bytes for "chunked" delivery.
+        - "max_concurrency": number of sentences synthesized at once, at most
+          `TTS_WS_MAX_CONCURRENCY`.
+
+        Sentences are synthesized in parallel and delivered in order, then a
+        {"status": "complete"} message ends the request.
+        """
         await websocket.accept()
         logger.info("TTS WebSocket connection established")
 
@@ -212,35 +287,79 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
                     continue
 
                 logger.info(f"Received text for TTS: {text}")
+                delivery = data.get("delivery", "path")
+                if delivery not in TTS_WS_DELIVERY_MODES:
+                    await websocket.send_json(
+                        {
+                            "status": "error",
+                            "message": f"Unknown delivery mode: {delivery}",
+                        }
+                    )
+                    continue
+                try:
+                    chunk_size = max(
+                        1024, int(data.get("chunk_size", TTS_WS_DEFAULT_CHUNK_SIZE))
+                    )
+                    max_concurrency = min(
+                        TTS_WS_MAX_CONCURRENCY,
+                        int(data.get("max_concurrency", TTS_WS_DEFAULT_CONCURRENCY)),
+                    )
+                except (TypeError, ValueError):
+                    await websocket.send_json(
+                        {
+                            "status": "error",
+                            "message": "chunk_size and max_concurrency must be integers",
+                        }
+                    )
+                    continue
 
-                # Split text into sentences
-                sentences = [s.strip() for s in text.split(".") if s.strip()]
+                sentences = split_sentences(text)
+                tts_engine = default_context_cache.tts_engine
 
                 try:
-                    # Generate and send audio for each sentence
-                    for sentence in sentences:
-                        sentence = sentence + "."  # Add back the period
-                        file_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid4())[:8]}"
-                        audio_path = (
-                            await default_context_cache.tts_engine.async_generate_audio(
-                                text=sentence, file_name_no_ext=file_name
-                            )
-                        )
+                    async for result in synthesize_in_order(
+                        tts_engine, sentences, max_concurrency
+                    ):
+                        message = {
+                            "status": "partial",
+                            "index": result.index,
+                            "text": result.text,
+                        }
+                        if result.error is not None:
+                            message["error"] = str(result.error)
+                            await websocket.send_json(message)
+                            continue
                         logger.info(
-                            f"Generated audio for sentence: {sentence} at: {audio_path}"
+                            f"Generated audio for sentence: {result.text} at: {result.audio_path}"
                         )
-
-                        await websocket.send_json(
-                            {
-                                "status": "partial",
-                                "audioPath": audio_path,
-                                "text": sentence,
-                            }
+                        if delivery == "path":
+                            message["audioPath"] = result.audio_path
+                            await websocket.send_json(message)
+                            continue
+
+                        try:
+                            audio = await asyncio.to_thread(
+                                Path(result.audio_path).read_bytes
+                            )
+                        finally:
+                            tts_engine.remove_file(result.audio_path, verbose=False)
+                        frame_size = (
+                            chunk_size if delivery == "chunked" else max(len(audio), 1)
                         )
+                        message["format"] = Path(result.audio_path).suffix.lstrip(".")
+                        message["size"] = len(audio)
+                        message["chunks"] = -(-len(audio) // frame_size)
+                        await websocket.send_json(message)
+                        for offset in range(0, len(audio), frame_size):
+                            await websocket.send_bytes(
+                                audio[offset : offset + frame_size]
+                            )
 
                     # Send completion signal
                     await websocket.send_json({"status": "complete"})
 
+                except WebSocketDisconnect:
+                    raise
                 except Exception as e:
                     logger.error(f"Error generating TTS: {e}")
                     await websocket.send_json({"status": "error", "message": str(e)})
@@ -7,16 +7,36 @@ It uses FastAPI for the server and Starlette for static file serving.
 """
 
 import os
-import shutil
+import re
+from mimetypes import guess_type
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import FastAPI
+from starlette.datastructures import Headers
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import Response
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
 from starlette.staticfiles import StaticFiles as StarletteStaticFiles
 
 from .routes import init_client_ws_route, init_webtool_routes, init_proxy_route
 from .service_context import ServiceContext
+from .engine_pool import engine_pool
+from .mcpp.server_pool import mcp_server_pool
+from .mcpp.schema_cache import tool_schema_cache
+from .proxy_message_queue import ProxyMessageQueue
 from .config_manager.utils import Config
+from .config_manager.file_index import config_file_index
+from .utils.async_utils import LoopLagMonitor
+from .utils.cache_manager import cache_manager
+
+
+# Files whose name contains a content hash (e.g. `index-4f3a9c1e.js`) never change
+HASHED_ASSET_PATTERN = re.compile(
+    r"[.-](?=[0-9A-Za-z_-]{0,7}\d)[0-9A-Za-z_-]{8}\.(?:js|mjs|css|wasm|woff2?)$"
+)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Precompressed variants written by scripts/precompress_static.py, by preference
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
 
 
 # Create a custom StaticFiles class that adds CORS headers
@@ -24,8 +44,25 @@ class CORSStaticFiles(StarletteStaticFiles):
     """
     Static files handler that adds CORS headers to all responses.
     Needed because Starlette StaticFiles might bypass standard middleware.
+
+    Responses also carry caching headers: hashed assets are immutable, other
+    files may be reused for `max_age` seconds and are then revalidated with
+    their ETag. A precompressed `.br`/`.gz` variant next to a file is served
+    instead of it to clients that accept the encoding. Range requests are
+    answered by Starlette's FileResponse.
     """
 
+    def __init__(self, *args, max_age: Optional[int] = None, **kwargs):
+        """
+        Args:
+            max_age: Seconds browsers may reuse a file without revalidating.
+                None sends no Cache-Control header (except for hashed assets).
+        """
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+        # (path, mtime_ns, size) -> precompressed variants of that file
+        self._variants: Dict[tuple, List[Tuple[str, str, os.stat_result]]] = {}
+
     async def get_response(self, path: str, scope):
         response = await super().get_response(path, scope)
 
@@ -39,6 +76,71 @@ class CORSStaticFiles(StarletteStaticFiles):
 
         return response
 
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope,
+        status_code: int = 200,
+    ) -> Response:
+        if status_code != 200:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        variants = self._precompressed_variants(str(full_path), stat_result)
+        variant = None
+        # A range refers to the bytes of the uncompressed file
+        if variants and "range" not in request_headers:
+            accepted = {
+                part.split(";")[0].strip()
+                for part in request_headers.get("accept-encoding", "").split(",")
+            }
+            variant = next((v for v in variants if v[0] in accepted), None)
+
+        if variant is not None:
+            encoding, variant_path, variant_stat = variant
+            response = FileResponse(
+                variant_path,
+                stat_result=variant_stat,
+                media_type=guess_type(str(full_path))[0] or "application/octet-stream",
+            )
+            response.headers["Content-Encoding"] = encoding
+        else:
+            response = FileResponse(full_path, stat_result=stat_result)
+        if variants:
+            response.headers["Vary"] = "Accept-Encoding"
+
+        if HASHED_ASSET_PATTERN.search(str(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        elif self.max_age is not None:
+            response.headers["Cache-Control"] = f"public, max-age={self.max_age}"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _precompressed_variants(
+        self, full_path: str, stat_result: os.stat_result
+    ) -> List[Tuple[str, str, os.stat_result]]:
+        """Up-to-date `.br`/`.gz` files next to `full_path`, looked up once."""
+        key = (full_path, stat_result.st_mtime_ns, stat_result.st_size)
+        variants = self._variants.get(key)
+        if variants is not None:
+            return variants
+        variants = []
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            try:
+                variant_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            # A variant older than its file is stale
+            if variant_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+                variants.append((encoding, full_path + suffix, variant_stat))
+        if len(self._variants) >= 4096:
+            self._variants.clear()
+        self._variants[key] = variants
+        return variants
+
 
 class AvatarStaticFiles(CORSStaticFiles):
     """
@@ -68,7 +170,7 @@ class WebSocketServer:
 
     Notes:
         - If default_context_cache is omitted, call `await initialize()` to load service context cache.
-        - Use `clean_cache()` to clear and recreate the local cache directory.
+        - Use `clean_cache()` to remove the temporary files of the local cache directory.
     """
 
     def __init__(self, config: Config, default_context_cache: ServiceContext = None):
@@ -104,47 +206,82 @@ class WebSocketServer:
             host = system_config.host
             port = system_config.port
             server_url = f"ws://{host}:{port}/client-ws"
+            message_queue = ProxyMessageQueue(
+                max_length=system_config.proxy_queue_max_length,
+                eviction_policy=system_config.proxy_queue_eviction,
+                coalesce_max=system_config.proxy_coalesce_max,
+            )
             self.app.include_router(
-                init_proxy_route(server_url=server_url),
+                init_proxy_route(server_url=server_url, message_queue=message_queue),
             )
 
+        engine_pool.configure(memory_budget_mb=system_config.engine_pool_memory_mb)
+        mcp_server_pool.configure(idle_timeout=system_config.mcp_server_idle_seconds)
+        self.app.add_event_handler("shutdown", mcp_server_pool.close)
+        # Cached MCP tool schemas loaded by initialize() are revalidated from here
+        self.app.add_event_handler("startup", tool_schema_cache.start)
+        self.app.add_event_handler("shutdown", tool_schema_cache.stop)
+        config_file_index.configure(config_alts_dir=system_config.config_alts_dir)
+        self.app.add_event_handler("startup", config_file_index.start)
+        self.app.add_event_handler("shutdown", config_file_index.stop)
+
+        # Optional debugging aid that reports coroutines blocking the event loop
+        if system_config.loop_lag_threshold_ms > 0:
+            self.loop_lag_monitor = LoopLagMonitor(system_config.loop_lag_threshold_ms)
+            self.app.add_event_handler("startup", self.loop_lag_monitor.start)
+            self.app.add_event_handler("shutdown", self.loop_lag_monitor.stop)
+
+        # Quotas and the sweeper of the cache directory; in_memory places it on tmpfs
+        cache_manager.configure(
+            max_size_mb=system_config.cache_max_size_mb,
+            max_age_seconds=system_config.cache_max_age_seconds,
+            sweep_interval=system_config.cache_sweep_interval_seconds,
+            in_memory=system_config.cache_in_memory,
+        )
+        self.app.add_event_handler("startup", cache_manager.start)
+        self.app.add_event_handler("shutdown", cache_manager.stop)
+
         # Mount cache directory first (to ensure audio file access)
-        if not os.path.exists("cache"):
-            os.makedirs("cache")
         self.app.mount(
             "/cache",
-            CORSStaticFiles(directory="cache"),
+            CORSStaticFiles(directory=cache_manager.directory),
             name="cache",
         )
 
         # Mount static files with CORS-enabled handlers
         self.app.mount(
             "/live2d-models",
-            CORSStaticFiles(directory="live2d-models"),
+            CORSStaticFiles(
+                directory="live2d-models", max_age=system_config.static_max_age_seconds
+            ),
             name="live2d-models",
         )
         self.app.mount(
             "/bg",
-            CORSStaticFiles(directory="backgrounds"),
+            CORSStaticFiles(
+                directory="backgrounds", max_age=system_config.static_max_age_seconds
+            ),
             name="backgrounds",
         )
         self.app.mount(
             "/avatars",
-            AvatarStaticFiles(directory="avatars"),
+            AvatarStaticFiles(
+                directory="avatars", max_age=system_config.static_max_age_seconds
+            ),
             name="avatars",
         )
 
         # Mount web tool directory separately from frontend
         self.app.mount(
             "/web-tool",
-            CORSStaticFiles(directory="web_tool", html=True),
+            CORSStaticFiles(directory="web_tool", html=True, max_age=0),
             name="web_tool",
         )
 
         # Mount main frontend last (as catch-all)
         self.app.mount(
             "/",
-            CORSStaticFiles(directory="frontend", html=True),
+            CORSStaticFiles(directory="frontend", html=True, max_age=0),
             name="frontend",
         )
 
@@ -155,8 +292,5 @@ class WebSocketServer:
 
     @staticmethod
     def clean_cache():
-        """Clean the cache directory by removing and recreating it."""
-        cache_dir = "cache"
-        if os.path.exists(cache_dir):
-            shutil.rmtree(cache_dir)
-            os.makedirs(cache_dir)
+        """Remove the temporary files of the cache directory (see `CacheManager`)."""
+        cache_manager.clear()
@@ -1,5 +1,6 @@
 import os
 import json
+import threading
 from typing import Callable
 from loguru import logger
 from fastapi import WebSocket
@@ -11,6 +12,13 @@ from .tts.tts_interface import TTSInterface
 from .vad.vad_interface import VADInterface
 from .agent.agents.agent_interface import AgentInterface
 from .translate.translate_interface import TranslateInterface
+from .engine_pool import engine_pool
+from .init_planner import (
+    InitPlanner,
+    EngineStatus,
+    DeferredASR,
+    DeferredTranslator,
+)
 
 from .mcpp.server_registry import ServerRegistry
 from .mcpp.tool_manager import ToolManager
@@ -18,8 +26,9 @@ from .mcpp.mcp_client import MCPClient
 from .mcpp.tool_executor import ToolExecutor
 from .mcpp.tool_adapter import ToolAdapter
 
-from .asr.asr_factory import ASRFactory
+from .asr.asr_pool import ASRWorkerPool
 from .tts.tts_factory import TTSFactory
+from .tts.tts_pool import TTSWorkerPool
 from .vad.vad_factory import VADFactory
 from .agent.agent_factory import AgentFactory
 from .translate.translate_factory import TranslateFactory
@@ -46,6 +55,11 @@ class ServiceContext:
         self.config: Config = None
         self.system_config: SystemConfig = None
         self.character_config: CharacterConfig = None
+        # True while the configs are borrowed from another context (load_cache);
+        # the character config is copied before this context changes it
+        self._config_shared: bool = False
+        # Engines are initialized on worker threads at the same time (InitPlanner)
+        self._config_lock = threading.Lock()
 
         self.live2d_model: Live2dModel = None
         self.asr_engine: ASRInterface = None
@@ -69,6 +83,9 @@ class ServiceContext:
 
         self.history_uid: str = ""  # Add history_uid field
 
+        # Load state and timing of each engine, reported by the readiness endpoint
+        self.engine_status: dict[str, EngineStatus] = {}
+
         self.send_text: Callable = None
         self.client_uid: str = None
 
@@ -98,7 +115,9 @@ class ServiceContext:
             f"Initializing MCP components: use_mcpp={use_mcpp}, enabled_servers={enabled_servers}"
         )
 
-        # Reset MCP components first
+        # Reset MCP components first, giving back the servers the old client leased
+        if self.mcp_client:
+            await self.mcp_client.aclose()
         self.mcp_server_registery = None
         self.tool_manager = None
         self.mcp_client = None
@@ -196,6 +215,10 @@ class ServiceContext:
             self.mcp_client = None
         if self.agent_engine and hasattr(self.agent_engine, "close"):
             await self.agent_engine.close()  # Ensure agent resources are also closed
+        # Give back the pooled engines so idle ones can be evicted
+        for engine in (self.asr_engine, self.tts_engine, self.vad_engine):
+            engine_pool.release(engine)
+        self.asr_engine = self.tts_engine = self.vad_engine = None
         logger.info("ServiceContext closed.")
 
     async def load_cache(
@@ -217,6 +240,9 @@ class ServiceContext:
         """
         Load the ServiceContext with the reference of the provided instances.
         Pass by reference so no reinitialization will be done.
+
+        The configs are shared with the context they come from, not copied:
+        this context copies a config only when it changes it (copy-on-write).
         """
         if not character_config:
             raise ValueError("character_config cannot be None")
@@ -226,10 +252,14 @@ class ServiceContext:
         self.config = config
         self.system_config = system_config
         self.character_config = character_config
+        self._config_shared = True
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
         self.vad_engine = vad_engine
+        # This session now holds a reference to the shared engines
+        for engine in (asr_engine, tts_engine, vad_engine):
+            engine_pool.retain(engine)
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
         # Load potentially shared components by reference
@@ -265,18 +295,6 @@ class ServiceContext:
 
         # update all sub-configs
 
-        # init live2d from character config
-        self.init_live2d(config.character_config.live2d_model_name)
-
-        # init asr from character config
-        self.init_asr(config.character_config.asr_config)
-
-        # init tts from character config
-        self.init_tts(config.character_config.tts_config)
-
-        # init vad from character config
-        self.init_vad(config.character_config.vad_config)
-
         # Initialize shared ToolAdapter if it doesn't exist yet
         if (
             not self.tool_adapter
@@ -290,32 +308,46 @@ class ServiceContext:
             logger.info("Initializing shared ToolAdapter within load_from_config.")
             self.tool_adapter = ToolAdapter(server_registery=self.mcp_server_registery)
 
-        # Initialize MCP Components before initializing Agent
-        await self._init_mcp_components(
+        # Independent engines load concurrently; only the agent has to wait for
+        # Live2D (expression prompt) and MCP (tools) to be ready.
+        planner = InitPlanner(self.engine_status)
+        planner.add(
+            "live2d", self.init_live2d, config.character_config.live2d_model_name
+        )
+        planner.add("asr", self.init_asr, config.character_config.asr_config)
+        planner.add("tts", self.init_tts, config.character_config.tts_config)
+        planner.add("vad", self.init_vad, config.character_config.vad_config)
+        planner.add(
+            "mcp",
+            self._init_mcp_components,
             config.character_config.agent_config.agent_settings.basic_memory_agent.use_mcpp,
             config.character_config.agent_config.agent_settings.basic_memory_agent.mcp_enabled_servers,
         )
-
-        # init agent from character config
-        await self.init_agent(
+        planner.add(
+            "agent",
+            self.init_agent,
             config.character_config.agent_config,
             config.character_config.persona_prompt,
+            depends_on=("live2d", "mcp"),
         )
-
-        self.init_translate(
-            config.character_config.tts_preprocessor_config.translator_config
+        planner.add(
+            "translate",
+            self.init_translate,
+            config.character_config.tts_preprocessor_config.translator_config,
         )
+        await planner.run()
 
         # store typed config references
         self.config = config
         self.system_config = config.system_config or self.system_config
         self.character_config = config.character_config
+        self._config_shared = False
 
     def init_live2d(self, live2d_model_name: str) -> None:
         logger.info(f"Initializing Live2D: {live2d_model_name}")
         try:
             self.live2d_model = Live2dModel(live2d_model_name)
-            self.character_config.live2d_model_name = live2d_model_name
+            self._writable_character_config().live2d_model_name = live2d_model_name
         except Exception as e:
             logger.critical(f"Error initializing Live2D: {e}")
             logger.critical("Try to proceed without Live2D...")
@@ -323,41 +355,99 @@ class ServiceContext:
     def init_asr(self, asr_config: ASRConfig) -> None:
         if not self.asr_engine or (self.character_config.asr_config != asr_config):
             logger.info(f"Initializing ASR: {asr_config.asr_model}")
-            self.asr_engine = ASRFactory.get_asr_system(
-                asr_config.asr_model,
-                **getattr(asr_config, asr_config.asr_model).model_dump(),
+
+            asr_settings = getattr(asr_config, asr_config.asr_model).model_dump()
+
+            def create_asr() -> ASRInterface:
+                return ASRWorkerPool(
+                    asr_config.asr_model,
+                    asr_settings,
+                    replicas=asr_config.asr_replicas,
+                    mode=asr_config.asr_worker_mode,
+                    request_timeout=asr_config.asr_request_timeout,
+                    batch_window_ms=asr_config.asr_batch_window_ms,
+                    max_batch_size=asr_config.asr_max_batch_size,
+                )
+
+            def create_pooled_asr() -> ASRInterface:
+                if "asr" in self.system_config.deferred_engines:
+                    return DeferredASR(self._engine_status("asr"), create_asr)
+                return create_asr()
+
+            new_engine = engine_pool.acquire(
+                "asr",
+                {
+                    "model": asr_config.asr_model,
+                    "settings": asr_settings,
+                    "replicas": asr_config.asr_replicas,
+                    "worker_mode": asr_config.asr_worker_mode,
+                    "request_timeout": asr_config.asr_request_timeout,
+                    "batch_window_ms": asr_config.asr_batch_window_ms,
+                    "max_batch_size": asr_config.asr_max_batch_size,
+                },
+                create_pooled_asr,
             )
+            engine_pool.release(self.asr_engine)
+            self.asr_engine = new_engine
             # saving config should be done after successful initialization
-            self.character_config.asr_config = asr_config
+            self._writable_character_config().asr_config = asr_config
         else:
             logger.info("ASR already initialized with the same config.")
 
     def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
-            self.tts_engine = TTSFactory.get_tts_engine(
-                tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
+            tts_settings = getattr(
+                tts_config, tts_config.tts_model.lower()
+            ).model_dump()
+
+            def create_tts() -> TTSInterface:
+                if tts_config.tts_worker_mode == "process":
+                    return TTSWorkerPool(
+                        tts_config.tts_model,
+                        tts_settings,
+                        workers=tts_config.tts_workers,
+                    )
+                return TTSFactory.get_tts_engine(tts_config.tts_model, **tts_settings)
+
+            new_engine = engine_pool.acquire(
+                "tts",
+                {
+                    "model": tts_config.tts_model,
+                    "settings": tts_settings,
+                    "worker_mode": tts_config.tts_worker_mode,
+                    "workers": tts_config.tts_workers,
+                },
+                create_tts,
             )
+            engine_pool.release(self.tts_engine)
+            self.tts_engine = new_engine
             # saving config should be done after successful initialization
-            self.character_config.tts_config = tts_config
+            self._writable_character_config().tts_config = tts_config
         else:
             logger.info("TTS already initialized with the same config.")
 
     def init_vad(self, vad_config: VADConfig) -> None:
         if vad_config.vad_model is None:
             logger.info("VAD is disabled.")
+            engine_pool.release(self.vad_engine)
             self.vad_engine = None
             return
 
         if not self.vad_engine or (self.character_config.vad_config != vad_config):
             logger.info(f"Initializing VAD: {vad_config.vad_model}")
-            self.vad_engine = VADFactory.get_vad_engine(
-                vad_config.vad_model,
-                **getattr(vad_config, vad_config.vad_model.lower()).model_dump(),
+            vad_settings = getattr(
+                vad_config, vad_config.vad_model.lower()
+            ).model_dump()
+            new_engine = engine_pool.acquire(
+                "vad",
+                {"model": vad_config.vad_model, "settings": vad_settings},
+                lambda: VADFactory.get_vad_engine(vad_config.vad_model, **vad_settings),
             )
+            engine_pool.release(self.vad_engine)
+            self.vad_engine = new_engine
             # saving config should be done after successful initialization
-            self.character_config.vad_config = vad_config
+            self._writable_character_config().vad_config = vad_config
         else:
             logger.info("VAD already initialized with the same config.")
 
@@ -397,7 +487,7 @@ class ServiceContext:
             logger.debug(f"System prompt: {system_prompt}")
 
             # Save the current configuration
-            self.character_config.agent_config = agent_config
+            self._writable_character_config().agent_config = agent_config
             self.system_prompt = system_prompt
 
         except Exception as e:
@@ -419,20 +509,52 @@ class ServiceContext:
             logger.info(
                 f"Initializing Translator: {translator_config.translate_provider}"
             )
-            self.translate_engine = TranslateFactory.get_translator(
-                translator_config.translate_provider,
-                getattr(
-                    translator_config, translator_config.translate_provider
-                ).model_dump(),
-            )
-            self.character_config.tts_preprocessor_config.translator_config = (
-                translator_config
+
+            def create_translator() -> TranslateInterface:
+                return TranslateFactory.get_translator(
+                    translator_config.translate_provider,
+                    getattr(
+                        translator_config, translator_config.translate_provider
+                    ).model_dump(),
+                )
+
+            if "translate" in self.system_config.deferred_engines:
+                self.translate_engine = DeferredTranslator(
+                    self._engine_status("translate"), create_translator
+                )
+            else:
+                self.translate_engine = create_translator()
+            character_config = self._writable_character_config()
+            # The section itself may still be shared: replace it, don't modify it
+            character_config.tts_preprocessor_config = (
+                character_config.tts_preprocessor_config.model_copy(
+                    update={"translator_config": translator_config}
+                )
             )
         else:
             logger.info("Translation already initialized with the same config.")
 
     # ==== utils
 
+    def _writable_character_config(self) -> CharacterConfig:
+        """
+        The character config, made safe to change.
+
+        A borrowed config is replaced by a shallow copy first: its sections stay
+        shared until they are replaced, so only what this context changes is
+        copied. Thread-safe: the copy is made once even when several engines
+        are initialized at the same time.
+        """
+        with self._config_lock:
+            if self._config_shared:
+                self.character_config = self.character_config.model_copy()
+                self._config_shared = False
+            return self.character_config
+
+    def _engine_status(self, name: str) -> EngineStatus:
+        """Get (or create) the status entry of an engine."""
+        return self.engine_status.setdefault(name, EngineStatus(name))
+
     async def construct_system_prompt(self, persona_prompt: str) -> str:
         """
         Append tool prompts to persona prompt.
@@ -1,9 +1,13 @@
+import asyncio
 import sys
 import os
+from typing import AsyncIterator, Tuple
 
 import edge_tts
+import numpy as np
 from loguru import logger
 from .tts_interface import TTSInterface
+from ..utils.stream_audio import MP3StreamDecoder, incremental_mp3_available
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -14,8 +18,22 @@ sys.path.append(current_dir)
 
 
 class TTSEngine(TTSInterface):
-    def __init__(self, voice="en-US-AvaMultilingualNeural"):
+    def __init__(self, voice="en-US-AvaMultilingualNeural", streaming: bool = False):
+        """
+        Args:
+            voice: Edge TTS voice name.
+            streaming: Decode the MP3 frames as they arrive and deliver the audio
+                chunk by chunk, instead of saving a file per sentence.
+        """
         self.voice = voice
+        self.streaming = streaming
+        if streaming and not incremental_mp3_available():
+            logger.warning(
+                "edge-tts streaming is enabled but PyAV is not installed: each "
+                "sentence is decoded only once all of it is received. "
+                "Install the `streaming` extra (pip install av) to decode it "
+                "as it arrives."
+            )
 
         self.temp_audio_file = "temp"
         self.file_extension = "mp3"
@@ -24,6 +42,49 @@ class TTSEngine(TTSInterface):
         if not os.path.exists(self.new_audio_dir):
             os.makedirs(self.new_audio_dir)
 
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        """
+        Generate speech audio file on the event loop.
+
+        edge-tts is asynchronous, so no worker thread is needed. Cancelling the
+        calling task closes the connection and removes the partial file.
+        """
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+
+        try:
+            communicate = edge_tts.Communicate(text, self.voice)
+            await communicate.save(file_name)
+        except Exception as e:
+            logger.critical(f"\nError: edge-tts unable to generate audio: {e}")
+            logger.critical("It's possible that edge-tts is blocked in your region.")
+            self._remove_orphaned_file(file_name)
+            return None
+        except asyncio.CancelledError:
+            self._remove_orphaned_file(file_name)
+            raise
+
+        return file_name
+
+    async def async_stream_audio(
+        self, text: str
+    ) -> AsyncIterator[Tuple[np.ndarray, int]]:
+        """
+        Yield the PCM of the MP3 frames of `Communicate.stream()` as they arrive.
+
+        Decoding is incremental when PyAV is installed (see `MP3StreamDecoder`),
+        in chunks of at least a quarter second. Otherwise the sentence is decoded
+        in memory, on a worker thread, when the stream ends.
+        """
+        decoder = MP3StreamDecoder()
+        communicate = edge_tts.Communicate(text, self.voice)
+        async for message in communicate.stream():
+            if message["type"] != "audio":
+                continue
+            for samples in decoder.feed(message["data"]):
+                yield samples, decoder.sample_rate
+        for samples in await asyncio.to_thread(decoder.flush):
+            yield samples, decoder.sample_rate
+
     def generate_audio(self, text, file_name_no_ext=None):
         """
         Generate speech audio file using TTS.
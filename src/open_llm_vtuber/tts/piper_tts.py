@@ -2,7 +2,8 @@ import os
 import wave
 
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, PCMChunkCallback
+from ..utils.async_utils import is_cancelled
 
 try:
     from piper import PiperVoice
@@ -35,6 +36,7 @@ class TTSEngine(TTSInterface):
         volume: float = 1.0,
         normalize_audio: bool = True,
         use_cuda: bool = False,
+        streaming: bool = False,
     ):
         """Initializes the Piper TTS engine using the Python API.
 
@@ -47,6 +49,7 @@ class TTSEngine(TTSInterface):
             volume: Volume level (0.0-1.0).
             normalize_audio: Whether to normalize audio.
             use_cuda: Whether to use GPU acceleration.
+            streaming: Deliver audio sentence by sentence as it is synthesized.
         """
         if not PIPER_AVAILABLE:
             raise ImportError(
@@ -61,6 +64,7 @@ class TTSEngine(TTSInterface):
         self.volume = volume
         self.normalize_audio = normalize_audio
         self.use_cuda = use_cuda
+        self.streaming = streaming
 
         # Check if model file exists
         if not os.path.exists(self.model_path):
@@ -115,3 +119,15 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.critical(f"Error: Piper TTS unable to generate audio: {e}")
             return None
+
+    def stream_audio(self, text: str, on_chunk: PCMChunkCallback) -> None:
+        """Synthesizes speech, passing the audio of each sentence to `on_chunk`.
+
+        Args:
+            text: The text to convert to speech.
+            on_chunk: Receives float32 samples and their sample rate.
+        """
+        for chunk in self.voice.synthesize(text, syn_config=self.syn_config):
+            if is_cancelled():
+                break
+            on_chunk(chunk.audio_float_array, chunk.sample_rate)
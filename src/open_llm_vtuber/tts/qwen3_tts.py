@@ -5,6 +5,7 @@ import requests
 from loguru import logger  # type: ignore[reportMissingImports]
 
 from .tts_interface import TTSInterface
+from ..utils.async_utils import is_cancelled
 
 
 class _Qwen3TTSError(RuntimeError):
@@ -264,7 +265,26 @@ class TTSEngine(TTSInterface):
     def _request_audio(self, text: str, model_name: str) -> bytes:
         payload = self._build_payload(text, model_name)
         try:
-            response = requests.post(self.api_url, json=payload, timeout=self.timeout)
+            # Stream the body so an interrupted request can be dropped between
+            # chunks instead of downloading audio nobody will play
+            with requests.post(
+                self.api_url, json=payload, timeout=self.timeout, stream=True
+            ) as response:
+                if response.status_code >= 500:
+                    raise _Qwen3TTSError(
+                        "HTTP_5XX",
+                        f"Server error {response.status_code}: {response.text[:200]}",
+                    )
+                if response.status_code >= 400:
+                    raise _Qwen3TTSError(
+                        "HTTP_4XX",
+                        f"Client error {response.status_code}: {response.text[:200]}",
+                    )
+                content = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    if is_cancelled():
+                        raise _Qwen3TTSError("CANCELLED", "Request was cancelled")
+                    content.extend(chunk)
         except requests.Timeout as exc:
             raise _Qwen3TTSError(
                 "TIMEOUT", f"Request timed out after {self.timeout}s"
@@ -272,19 +292,9 @@ class TTSEngine(TTSInterface):
         except requests.RequestException as exc:
             raise _Qwen3TTSError("NETWORK", f"Network failure: {exc}") from exc
 
-        if response.status_code >= 500:
-            raise _Qwen3TTSError(
-                "HTTP_5XX",
-                f"Server error {response.status_code}: {response.text[:200]}",
-            )
-        if response.status_code >= 400:
-            raise _Qwen3TTSError(
-                "HTTP_4XX",
-                f"Client error {response.status_code}: {response.text[:200]}",
-            )
-        if not response.content:
+        if not content:
             raise _Qwen3TTSError("EMPTY_AUDIO", "Backend returned empty audio payload")
-        return response.content
+        return bytes(content)
 
     def generate_audio(  # pyright: ignore[reportIncompatibleMethodOverride]
         self, text: str, file_name_no_ext: str | None = None
@@ -300,8 +310,15 @@ class TTSEngine(TTSInterface):
 
         for model_name, attempts in models_to_try:
             for attempt in range(1, attempts + 1):
+                if is_cancelled():
+                    logger.debug(
+                        "Qwen3 TTS request cancelled; skipping remaining attempts"
+                    )
+                    return None
                 try:
                     audio_content = self._request_audio(text, model_name)
+                    if is_cancelled():
+                        return None
                     with open(cache_file, "wb") as audio_file:
                         _ = audio_file.write(audio_content)
                     return cache_file
@@ -315,6 +332,9 @@ class TTSEngine(TTSInterface):
                     )
                     return None
                 except _Qwen3TTSError as exc:
+                    if exc.code == "CANCELLED":
+                        logger.debug("Qwen3 TTS request cancelled mid-download")
+                        return None
                     last_error = exc
                     logger.warning(
                         f"Qwen3 TTS failure ({exc.code}) model={model_name} attempt={attempt}/{attempts}: {exc.detail}"
@@ -1,10 +1,12 @@
 import sys
 import os
 
+import numpy as np
 import sherpa_onnx
 import soundfile as sf
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, PCMChunkCallback
+from ..utils.async_utils import is_cancelled
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -25,6 +27,7 @@ class TTSEngine(TTSInterface):
         num_threads=1,
         speed=1.0,
         debug=False,
+        streaming=False,
     ):
         self.vits_model = vits_model
         self.vits_lexicon = vits_lexicon
@@ -38,6 +41,8 @@ class TTSEngine(TTSInterface):
         self.num_threads = num_threads
         self.speed = speed  # Speech speed
         self.debug = debug  # Debug mode flag
+        # Deliver audio in chunks of `max_num_sentences` sentences as they are ready
+        self.streaming = streaming
 
         self.file_extension = "wav"
         self.new_audio_dir = "cache"
@@ -110,3 +115,24 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
             return None
+
+    def stream_audio(self, text: str, on_chunk: PCMChunkCallback) -> None:
+        """
+        Synthesize speech with sherpa-onnx, passing the samples of every batch of
+        `max_num_sentences` sentences to `on_chunk` as soon as it is generated.
+
+        Parameters:
+            text (str): The text to speak.
+            on_chunk (PCMChunkCallback): Receives float32 samples and sample rate.
+        """
+        sample_rate = self.tts.sample_rate
+
+        def callback(samples, progress) -> int:
+            if is_cancelled():
+                # Returning 0 tells sherpa-onnx to stop generating
+                return 0
+            # The buffer is only valid during the callback
+            on_chunk(np.array(samples, dtype=np.float32), sample_rate)
+            return 1
+
+        self.tts.generate(text, sid=self.sid, speed=self.speed, callback=callback)
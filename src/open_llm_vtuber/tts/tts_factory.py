@@ -22,7 +22,9 @@ class TTSFactory:
         elif engine_type == "edge_tts":
             from .edge_tts import TTSEngine as EdgeTTSEngine
 
-            return EdgeTTSEngine(kwargs.get("voice"))
+            return EdgeTTSEngine(
+                kwargs.get("voice"), streaming=kwargs.get("streaming", False)
+            )
         elif engine_type == "pyttsx3_tts":
             from .pyttsx3_tts import TTSEngine as Pyttsx3TTSEngine
 
@@ -227,6 +229,7 @@ class TTSFactory:
                 volume=kwargs.get("volume"),
                 normalize_audio=kwargs.get("normalize_audio"),
                 use_cuda=kwargs.get("use_cuda"),
+                streaming=kwargs.get("streaming", False),
             )
         else:
             raise ValueError(f"Unknown TTS engine type: {engine_type}")
@@ -1,18 +1,34 @@
 import abc
-import os
 import asyncio
+import os
+from typing import AsyncIterator, Callable, Tuple
 
+import numpy as np
 from loguru import logger
 
+from ..utils.async_utils import to_thread_cancellable
+from ..utils.cache_manager import cache_manager
+
+# Receives the PCM chunks of `stream_audio`: float32 mono samples and sample rate
+PCMChunkCallback = Callable[[np.ndarray, int], None]
+
 
 class TTSInterface(metaclass=abc.ABCMeta):
+    # Engines that implement `stream_audio` set this when streaming is enabled,
+    # so the conversation delivers their audio chunk by chunk
+    streaming: bool = False
+
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
         Asynchronously generate speech audio file using TTS.
 
-        By default, this runs the synchronous generate_audio in a coroutine.
+        By default, this runs the synchronous generate_audio in a worker thread.
         Subclasses can override this method to provide true async implementation.
 
+        If the calling task is cancelled (e.g. the user interrupts), the engine
+        can notice through `utils.async_utils.is_cancelled()` and give up early.
+        A file that is still written after cancellation is removed once ready.
+
         text: str
             the text to speak
         file_name_no_ext (optional and deprecated): str
@@ -22,7 +38,63 @@ class TTSInterface(metaclass=abc.ABCMeta):
         str: the path to the generated audio file
 
         """
-        return await asyncio.to_thread(self.generate_audio, text, file_name_no_ext)
+        return await to_thread_cancellable(
+            self.generate_audio,
+            text,
+            file_name_no_ext,
+            on_abandoned=self._remove_orphaned_file,
+        )
+
+    def stream_audio(self, text: str, on_chunk: PCMChunkCallback) -> None:
+        """
+        Synthesize speech and pass the audio to `on_chunk` as it is produced.
+
+        Blocking, like `generate_audio`. Engines check
+        `utils.async_utils.is_cancelled()` between chunks and stop early.
+
+        text: str
+            the text to speak
+        on_chunk: PCMChunkCallback
+            called with float32 mono samples and their sample rate, in order
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot stream audio")
+
+    async def async_stream_audio(
+        self, text: str
+    ) -> AsyncIterator[Tuple[np.ndarray, int]]:
+        """
+        Asynchronously iterate over the PCM chunks of `stream_audio`.
+
+        Synthesis runs in a worker thread. Leaving the iteration early (e.g. the
+        user interrupts) asks the engine to stop at its next chunk.
+
+        Yields:
+        Tuple[np.ndarray, int]: float32 mono samples and their sample rate
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def produce() -> None:
+            try:
+                self.stream_audio(
+                    text,
+                    lambda samples, rate: loop.call_soon_threadsafe(
+                        chunks.put_nowait, (samples, rate)
+                    ),
+                )
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, done)
+
+        producer = asyncio.ensure_future(to_thread_cancellable(produce))
+        try:
+            while (chunk := await chunks.get()) is not done:
+                yield chunk
+            # Raise what went wrong in the engine
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
 
     @abc.abstractmethod
     def generate_audio(self, text: str, file_name_no_ext=None) -> str:
@@ -49,15 +121,20 @@ class TTSInterface(metaclass=abc.ABCMeta):
             filepath (str): The path to the file to remove.
             verbose (bool): If True, print messages to the console.
         """
-        if not os.path.exists(filepath):
-            logger.warning(f"File {filepath} does not exist")
-            return
         try:
-            logger.debug(f"Removing file {filepath}") if verbose else None
-            os.remove(filepath)
+            if not cache_manager.remove(filepath):
+                logger.warning(f"File {filepath} does not exist")
+                return
+            logger.debug(f"Removed file {filepath}") if verbose else None
         except Exception as e:
             logger.error(f"Failed to remove file {filepath}: {e}")
 
+    def _remove_orphaned_file(self, filepath: str | None) -> None:
+        """Remove an audio file that finished after its request was cancelled."""
+        if filepath and os.path.exists(filepath):
+            logger.debug(f"Removing audio generated after cancellation: {filepath}")
+            self.remove_file(filepath, verbose=False)
+
     def generate_cache_file_name(self, file_name_no_ext=None, file_extension="wav"):
         """
         Generate a cross-platform cache file name.
@@ -70,12 +147,9 @@ class TTSInterface(metaclass=abc.ABCMeta):
         Returns:
         str: the path to the generated cache file
         """
-        cache_dir = "cache"
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
-
         if file_name_no_ext is None:
             file_name_no_ext = "temp"
 
         file_name = f"{file_name_no_ext}.{file_extension}"
-        return os.path.join(cache_dir, file_name)
+        # Owned by the engine until removed, swept if it never is
+        return cache_manager.file_path(file_name, owner=type(self).__name__)
@@ -0,0 +1,246 @@
+"""
+Out-of-process execution for local TTS engines.
+
+Local engines (sherpa-onnx, Piper, Coqui, MeloTTS, Bark) synthesize inside the
+server process on worker threads, and their Python-side pre/post-processing
+holds the GIL against the event loop and against the other sentences rendered
+at the same time. `TTSWorkerPool` runs the engine in worker processes instead:
+
+- Each of the `workers` processes loads the engine once and renders one
+  sentence at a time. Sentences are handed to the first idle worker.
+- A worker writes the audio file into the shared cache directory, as the engine
+  does in-process, and only the path travels back over the pipe.
+- A worker that crashes is restarted. The sentence it was rendering fails, the
+  following ones are served by the new process.
+- A cancelled request cannot stop a worker mid-sentence. The worker stays busy
+  until it is done, and the orphaned file is removed.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from ..utils.cache_manager import cache_manager
+from .tts_interface import TTSInterface
+
+# Engines whose synthesis runs in this process and benefits from worker processes
+LOCAL_TTS_ENGINES = {
+    "sherpa_onnx_tts",
+    "piper_tts",
+    "coqui_tts",
+    "melo_tts",
+    "bark_tts",
+    "pyttsx3_tts",
+}
+
+
+def _process_worker_main(
+    conn: Connection, tts_model: str, settings: Dict[str, Any]
+) -> None:
+    """Entry point of a TTS worker process: load the engine once, serve jobs."""
+    from .tts_factory import TTSFactory
+
+    try:
+        engine = TTSFactory.get_tts_engine(tts_model, **settings)
+    except Exception as e:
+        conn.send(("error", f"Failed to load TTS engine: {e}"))
+        return
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        text, file_name_no_ext = job
+        try:
+            conn.send(("ok", engine.generate_audio(text, file_name_no_ext)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _ProcessWorker:
+    """One engine in its own process, restarted if it crashes."""
+
+    def __init__(self, tts_model: str, settings: Dict[str, Any]):
+        self.tts_model = tts_model
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.restarts = 0
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process is not None else None
+
+    def spawn(self) -> None:
+        # spawn works the same on every platform and is safe with CUDA
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_process_worker_main,
+            args=(child_conn, self.tts_model, self.settings),
+            name="tts-worker",
+            daemon=True,
+        )
+        self._process.start()
+        self._conn = parent_conn
+
+    def wait_ready(self) -> None:
+        try:
+            status, detail = self._conn.recv()
+        except (EOFError, OSError) as e:
+            status, detail = "error", f"TTS worker process exited while loading: {e}"
+        if status != "ready":
+            self._process.join(timeout=1)
+            raise RuntimeError(detail)
+        logger.info(f"TTS worker process {self._process.pid} ready")
+
+    def generate(self, text: str, file_name_no_ext: Optional[str]) -> str:
+        with self.lock:
+            if not self._process or not self._process.is_alive():
+                logger.warning("TTS worker process is not running, restarting it")
+                self._restart()
+            self._conn.send((text, file_name_no_ext))
+            try:
+                status, result = self._conn.recv()
+            except (EOFError, OSError) as e:
+                self._process.join(timeout=1)
+                error = (
+                    f"TTS worker process crashed (exit code {self._process.exitcode})"
+                )
+                logger.error(f"{error}, restarting it")
+                try:
+                    self._restart()
+                except Exception as restart_error:
+                    # Retried before the next job
+                    logger.error(str(restart_error))
+                raise RuntimeError(error) from e
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def _restart(self) -> None:
+        self.restarts += 1
+        self.spawn()
+        self.wait_ready()
+
+    def close(self) -> None:
+        if self._process and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+
+
+class TTSWorkerPool(TTSInterface):
+    """Renders sentences with a fixed number of engine worker processes."""
+
+    def __init__(self, tts_model: str, settings: Dict[str, Any], workers: int = 1):
+        """
+        Args:
+            tts_model: Name of the TTS model, as accepted by TTSFactory.
+            settings: Keyword arguments for the selected TTS model.
+            workers: Number of worker processes, each with its own engine.
+
+        Raises:
+            RuntimeError: If a worker cannot load the engine.
+        """
+        if tts_model not in LOCAL_TTS_ENGINES:
+            logger.warning(
+                f"{tts_model} does not synthesize locally, worker processes "
+                "will not make it faster."
+            )
+        self.tts_model = tts_model
+        self._workers: List[_ProcessWorker] = [
+            _ProcessWorker(tts_model, settings) for _ in range(max(1, workers))
+        ]
+        # Load the engines in parallel
+        for worker in self._workers:
+            worker.spawn()
+        try:
+            for worker in self._workers:
+                worker.wait_ready()
+        except Exception:
+            self.close()
+            raise
+        self._idle: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        logger.info(
+            f"TTS worker pool ready: {len(self._workers)} x {tts_model} (process)"
+        )
+
+    def _ensure_idle_queue(self) -> asyncio.Queue:
+        """The queue of idle workers of the running loop (created once per loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = asyncio.Queue()
+            for worker in self._workers:
+                self._idle.put_nowait(worker)
+        return self._idle
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        """Render a sentence on the first idle worker process."""
+        idle = self._ensure_idle_queue()
+        worker = await idle.get()
+        future = self._loop.run_in_executor(
+            None, worker.generate, text, file_name_no_ext
+        )
+
+        def on_done(done: asyncio.Future) -> None:
+            # The worker is only free once its sentence is finished
+            idle.put_nowait(worker)
+            if done.cancelled() or done.exception() is not None:
+                return
+            if abandoned:
+                self._remove_orphaned_file(done.result())
+
+        abandoned = False
+        future.add_done_callback(on_done)
+        try:
+            path = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            abandoned = True
+            raise
+        # Claimed in the worker process, claim it here too
+        cache_manager.claim(path, owner=self.tts_model)
+        return path
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        """Render synchronously on the first worker, bypassing the idle queue."""
+        path = self._workers[0].generate(text, file_name_no_ext)
+        cache_manager.claim(path, owner=self.tts_model)
+        return path
+
+    def memory_bytes(self) -> int:
+        """Resident memory of the worker processes, for the engine pool."""
+        from ..engine_pool import rss_bytes
+
+        return sum(
+            rss_bytes(worker.pid) or 0
+            for worker in self._workers
+            if worker.pid is not None
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "idle": self._idle.qsize() if self._idle is not None else None,
+            "restarts": sum(worker.restarts for worker in self._workers),
+        }
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for worker in self._workers:
+            worker.close()
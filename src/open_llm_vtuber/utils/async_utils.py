@@ -0,0 +1,286 @@
+"""
+Helpers that keep blocking work off the asyncio event loop.
+
+- `iterate_in_thread` bridges a blocking (sync) iterator into an async iterator.
+  The producer runs on a dedicated thread and hands items over through a
+  bounded buffer, so a slow consumer applies back-pressure to the producer.
+- `to_thread_cancellable` runs a blocking call on a worker thread and, when the
+  awaiting task is cancelled, signals the call to stop and hands any result it
+  still produces to a cleanup callback instead of dropping it on the floor.
+- `LoopLagMonitor` is a debugging aid that reports which coroutine is holding
+  the event loop when it stalls for longer than a threshold.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Any, AsyncIterator, Callable, Iterable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+_END_OF_STREAM = object()
+
+_COROUTINE_FLAGS = (
+    inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_ITERABLE_COROUTINE
+)
+
+# Set inside worker threads started by `to_thread_cancellable`
+_cancel_event: contextvars.ContextVar[threading.Event | None] = contextvars.ContextVar(
+    "cancel_event", default=None
+)
+
+
+def is_cancelled() -> bool:
+    """
+    Check from a worker thread whether the task awaiting this work was cancelled.
+
+    Blocking engine code calls this between expensive steps (retries, chunk reads)
+    so an interrupted request stops early and frees its worker thread. Always
+    False when called outside of `to_thread_cancellable`.
+    """
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+async def to_thread_cancellable(
+    func: Callable[..., T],
+    *args: Any,
+    on_abandoned: Callable[[T], None] | None = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Run `func` on a worker thread, like `asyncio.to_thread`, with cancellation support.
+
+    Threads cannot be killed, so cancelling the awaiting task sets a flag that
+    `func` can poll with `is_cancelled()`. If `func` still completes and returns a
+    result after the caller has gone away, the result is passed to `on_abandoned`
+    (for example to delete a file nobody will read).
+
+    Args:
+        func: The blocking callable.
+        *args: Positional arguments for `func`.
+        on_abandoned: Cleanup callback for results produced after cancellation.
+        **kwargs: Keyword arguments for `func`.
+
+    Returns:
+        The return value of `func`.
+    """
+    loop = asyncio.get_running_loop()
+    cancel_event = threading.Event()
+    context = contextvars.copy_context()
+    context.run(_cancel_event.set, cancel_event)
+    future = loop.run_in_executor(
+        None, functools.partial(context.run, func, *args, **kwargs)
+    )
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        if on_abandoned is not None:
+
+            def handle_late_result(done: asyncio.Future) -> None:
+                if done.cancelled() or done.exception() is not None:
+                    return
+                try:
+                    on_abandoned(done.result())
+                except Exception as e:
+                    logger.warning(f"Error cleaning up abandoned result: {e}")
+
+            future.add_done_callback(handle_late_result)
+        raise
+
+
+async def iterate_in_thread(
+    source: Iterable[T] | Callable[[], Iterable[T]],
+    max_buffer_size: int = 64,
+    on_cancel: Callable[[], None] | None = None,
+    thread_name: str = "sync-iterator-bridge",
+) -> AsyncIterator[T]:
+    """
+    Iterate a blocking iterable on a dedicated thread and yield its items asynchronously.
+
+    If `source` is callable it is called on the producer thread, so blocking setup
+    work (opening an HTTP stream, creating a llama.cpp completion) also stays off the
+    event loop.
+
+    When the consumer stops early (break, `aclose()` or task cancellation), the
+    producer is told to stop, the underlying generator is closed on its own thread,
+    and `on_cancel` is invoked so callers can unblock a pending read (for example by
+    closing an HTTP response).
+
+    Args:
+        source: An iterable, or a zero-argument callable returning one.
+        max_buffer_size: Maximum number of items buffered between the threads.
+        on_cancel: Optional callback run on the loop when iteration is abandoned.
+        thread_name: Name of the producer thread, useful in stack dumps.
+
+    Yields:
+        Items produced by `source`, in order.
+
+    Raises:
+        Any exception raised by `source` is re-raised in the consumer.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    free_slots = threading.Semaphore(max_buffer_size)
+    stop_event = threading.Event()
+
+    def hand_over(item, error: BaseException | None = None) -> bool:
+        """Pass an item to the loop, blocking while the buffer is full."""
+        while not free_slots.acquire(timeout=0.1):
+            if stop_event.is_set():
+                return False
+        if stop_event.is_set():
+            return False
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+        except RuntimeError:
+            # The event loop has been closed underneath us
+            stop_event.set()
+            return False
+        return True
+
+    def produce() -> None:
+        iterator = None
+        try:
+            iterable = source() if callable(source) else source
+            iterator = iter(iterable)
+            for item in iterator:
+                if not hand_over(item):
+                    break
+            else:
+                hand_over(_END_OF_STREAM)
+        except BaseException as e:  # noqa: BLE001 - forwarded to the consumer
+            hand_over(_END_OF_STREAM, e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.debug(f"Error closing bridged iterator: {e}")
+
+    # Expose the stop flag to the producer through `is_cancelled()` as well
+    context = contextvars.copy_context()
+    context.run(_cancel_event.set, stop_event)
+    producer = threading.Thread(
+        target=functools.partial(context.run, produce), name=thread_name, daemon=True
+    )
+    producer.start()
+
+    finished = False
+    try:
+        while True:
+            item, error = await queue.get()
+            free_slots.release()
+            if item is _END_OF_STREAM:
+                finished = True
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop_event.set()
+        if not finished and on_cancel is not None:
+            try:
+                on_cancel()
+            except Exception as e:
+                logger.debug(f"Error in iterate_in_thread cancel callback: {e}")
+
+
+class LoopLagMonitor:
+    """
+    Report event-loop stalls longer than a threshold, along with the culprit.
+
+    A heartbeat task on the loop records when it last ran; a watchdog thread checks
+    that timestamp. When the loop has not ticked for `threshold_ms`, the watchdog
+    grabs the loop thread's current stack and logs the innermost coroutine that is
+    running, so the blocking call can be located. Meant for debugging only.
+    """
+
+    def __init__(self, threshold_ms: float, check_interval_ms: float | None = None):
+        """
+        Args:
+            threshold_ms: Minimum stall duration (in milliseconds) that is reported.
+            check_interval_ms: How often the heartbeat ticks and the watchdog checks.
+                Defaults to a quarter of the threshold.
+        """
+        self.threshold = threshold_ms / 1000
+        self.interval = (check_interval_ms or max(threshold_ms / 4, 5)) / 1000
+        self._last_tick = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop. Must be called from the loop."""
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Event loop lag monitor started (threshold: {self.threshold * 1000:.0f} ms)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stopped.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_tick = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        stall_reported = False
+        while not self._stopped.wait(self.interval):
+            # The heartbeat sleeps `interval` between ticks, so that part is expected
+            lag = time.monotonic() - self._last_tick - self.interval
+            if lag >= self.threshold and not stall_reported:
+                stall_reported = True
+                frame = sys._current_frames().get(self._loop_thread_id)
+                logger.warning(
+                    f"Event loop blocked for {lag * 1000:.0f} ms+ in "
+                    f"{self._describe_coroutine(frame)}\n"
+                    + "".join(traceback.format_stack(frame) if frame else [])
+                )
+            elif lag < self.threshold and stall_reported:
+                stall_reported = False
+                logger.info("Event loop recovered from stall.")
+
+    @staticmethod
+    def _describe_coroutine(frame: FrameType | None) -> str:
+        """Return the innermost coroutine on the given stack, or the top frame."""
+        top = frame
+        while frame is not None:
+            if frame.f_code.co_flags & _COROUTINE_FLAGS:
+                break
+            frame = frame.f_back
+        frame = frame or top
+        if frame is None:
+            return "<unknown>"
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)
+        return f"{name} ({code.co_filename}:{frame.f_lineno})"
@@ -0,0 +1,344 @@
+"""
+Audio ingestion for the ASR engines.
+
+Turns incoming audio (WAV uploads, raw PCM from the WebSocket) into what
+`ASRInterface` expects: mono float32 samples in [-1, 1] at 16 kHz.
+
+- `WavStreamParser` parses a WAV file incrementally from chunks of bytes, walking
+  the RIFF chunks instead of assuming a 44-byte header, so files with LIST/fact
+  chunks, WAVE_FORMAT_EXTENSIBLE headers or streamed (unknown) data sizes work.
+- `pcm_to_float32` converts interleaved PCM to mono float32 in a single pass,
+  writing straight into the output buffer instead of going through int->float64
+  temporaries.
+- `resample` converts the sample rate with a vectorized polyphase filter.
+- `UtteranceResampler` collects the microphone chunks of an utterance and
+  resamples them in one go, so the filter does not restart at every chunk
+  boundary.
+"""
+
+import struct
+from math import gcd
+
+import numpy as np
+from scipy.signal import resample_poly
+
+ASR_SAMPLE_RATE = 16000
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# Data sizes used by writers that do not know the length in advance
+_UNKNOWN_DATA_SIZES = (0, 0xFFFFFFFF)
+# The declared data size is only a hint for preallocation, capped to this much
+# audio: a malformed or hostile header must not allocate gigabytes up front
+_MAX_PREALLOCATED_SECONDS = 30
+# Real fmt chunks are 16 to 40 bytes
+_MAX_FMT_CHUNK_SIZE = 1024
+
+
+def pcm_to_float32(
+    data: bytes | bytearray | memoryview,
+    sample_width: int = 2,
+    channels: int = 1,
+    is_float: bool = False,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Convert interleaved little-endian PCM frames to mono float32 in [-1, 1].
+
+    Args:
+        data: Raw PCM bytes. Must contain a whole number of frames.
+        sample_width: Bytes per sample (1, 2, 3 or 4; 4 or 8 for float data).
+        channels: Number of interleaved channels; they are averaged to mono.
+        is_float: Whether samples are IEEE floats instead of integers.
+        out: Optional float32 buffer to write into. Must hold all frames.
+
+    Returns:
+        np.ndarray: Mono float32 samples (`out` itself when given).
+
+    Raises:
+        ValueError: If the format is unsupported or the data is not frame-aligned.
+    """
+    frame_size = sample_width * channels
+    if len(data) % frame_size != 0:
+        raise ValueError(
+            f"Audio data size {len(data)} is not a multiple of the frame size {frame_size}"
+        )
+    frames = len(data) // frame_size
+    if out is None:
+        out = np.empty(frames, dtype=np.float32)
+    elif len(out) != frames:
+        raise ValueError("Output buffer size does not match the number of frames")
+
+    if is_float:
+        if sample_width not in (4, 8):
+            raise ValueError(f"Unsupported float sample width: {sample_width}")
+        samples = np.frombuffer(data, dtype=f"<f{sample_width}")
+        scale, offset = 1.0, 0.0
+    elif sample_width == 1:
+        # 8-bit WAV is unsigned
+        samples = np.frombuffer(data, dtype=np.uint8)
+        scale, offset = 1 / 128, -1.0
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2")
+        scale, offset = 1 / 32768, 0.0
+    elif sample_width == 3:
+        # Place the 3 bytes in the top of an int32 so the sign is kept
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        samples = np.zeros(len(raw), dtype="<i4")
+        samples.view(np.uint8).reshape(-1, 4)[:, 1:] = raw
+        scale, offset = 1 / 2147483648, 0.0
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4")
+        scale, offset = 1 / 2147483648, 0.0
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    # Compute in float32 directly instead of promoting to float64
+    if channels == 1:
+        np.multiply(
+            samples, np.float32(scale), out=out, dtype=np.float32, casting="unsafe"
+        )
+    else:
+        np.sum(samples.reshape(frames, channels), axis=1, dtype=np.float32, out=out)
+        out *= np.float32(scale / channels)
+    if offset:
+        out += np.float32(offset)
+    return out
+
+
+def resample(
+    audio: np.ndarray, orig_rate: int, target_rate: int = ASR_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Resample float32 audio with a polyphase FIR filter.
+
+    Args:
+        audio: Mono float32 samples.
+        orig_rate: Sample rate of `audio`.
+        target_rate: Sample rate to convert to.
+
+    Returns:
+        np.ndarray: Resampled float32 samples (`audio` itself if the rates match).
+    """
+    if orig_rate == target_rate or len(audio) == 0:
+        return audio
+    divisor = gcd(orig_rate, target_rate)
+    resampled = resample_poly(audio, target_rate // divisor, orig_rate // divisor)
+    return resampled.astype(np.float32, copy=False)
+
+
+class UtteranceResampler:
+    """
+    Audio chunks of one utterance at the client's rate, resampled when complete.
+
+    Resampling each chunk on its own restarts the polyphase filter at every
+    chunk boundary, which distorts the signal there. Chunks are kept at their
+    original rate until `flush()` and resampled together.
+    """
+
+    def __init__(self, target_rate: int = ASR_SAMPLE_RATE):
+        self.target_rate = target_rate
+        self._rate: int | None = None
+        self._chunks: list[np.ndarray] = []
+        self._resampled: list[np.ndarray] = []
+
+    def feed(self, audio: np.ndarray, sample_rate: int) -> None:
+        """Add a mono float32 chunk recorded at `sample_rate`."""
+        if sample_rate != self._rate:
+            # The client changed its rate: the chunks so far are resampled alone
+            self._resample_chunks()
+            self._rate = sample_rate
+        self._chunks.append(audio)
+
+    def flush(self) -> np.ndarray:
+        """Return the utterance at `target_rate` and start a new one."""
+        self._resample_chunks()
+        if not self._resampled:
+            return np.empty(0, dtype=np.float32)
+        audio = np.concatenate(self._resampled)
+        self._resampled.clear()
+        return audio
+
+    def _resample_chunks(self) -> None:
+        if self._chunks:
+            audio = np.concatenate(self._chunks)
+            self._resampled.append(resample(audio, self._rate, self.target_rate))
+            self._chunks.clear()
+
+
+class WavStreamParser:
+    """
+    Incremental WAV decoder producing ASR-ready audio.
+
+    Feed the file in chunks of any size with `feed()`, then call `finish()` to get
+    mono float32 samples at the target rate. Samples are converted as they arrive,
+    so the whole file never has to be held in memory as bytes.
+    """
+
+    def __init__(self, target_rate: int = ASR_SAMPLE_RATE):
+        self.target_rate = target_rate
+        self.sample_rate: int | None = None
+        self.channels: int | None = None
+        self.sample_width: int | None = None
+        self.is_float = False
+        self._pending = bytearray()
+        self._header_done = False
+        self._in_data = False
+        self._skip = 0  # bytes of a non-audio chunk still to be skipped
+        self._data_remaining: int | None = None  # None: until the end of the file
+        self._samples: np.ndarray = np.empty(0, dtype=np.float32)
+        self._frames = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Consume the next bytes of the file.
+
+        Raises:
+            ValueError: If the file is not a supported WAV file.
+        """
+        self._pending += chunk
+        while self._pending:
+            if self._skip:
+                skipped = min(self._skip, len(self._pending))
+                del self._pending[:skipped]
+                self._skip -= skipped
+            elif self._in_data:
+                self._consume_data()
+                return
+            elif not self._parse_next_chunk_header():
+                return
+
+    def finish(self) -> np.ndarray:
+        """
+        Finish decoding and return the audio.
+
+        Returns:
+            np.ndarray: Mono float32 samples at `target_rate`.
+
+        Raises:
+            ValueError: If the file had no audio data.
+        """
+        if not self._in_data:
+            raise ValueError("Invalid WAV file: no audio data found")
+        if self._pending:
+            # A trailing partial frame of a truncated upload is dropped
+            self._pending.clear()
+        audio = self._samples[: self._frames]
+        if len(audio) == 0:
+            raise ValueError("Empty audio data")
+        return resample(audio, self.sample_rate, self.target_rate)
+
+    def _parse_next_chunk_header(self) -> bool:
+        """Parse the RIFF header or the next chunk header. False if more data is needed."""
+        if not self._header_done:
+            if len(self._pending) < 12:
+                return False
+            riff, _, wave = struct.unpack("<4sI4s", self._pending[:12])
+            if riff not in (b"RIFF", b"RF64") or wave != b"WAVE":
+                raise ValueError("Invalid WAV file: missing RIFF/WAVE header")
+            del self._pending[:12]
+            self._header_done = True
+            return True
+
+        if len(self._pending) < 8:
+            return False
+        chunk_id, size = struct.unpack("<4sI", self._pending[:8])
+        if chunk_id == b"fmt ":
+            if size > _MAX_FMT_CHUNK_SIZE:
+                raise ValueError(f"Invalid WAV file: fmt chunk of {size} bytes")
+            if len(self._pending) < 8 + size:
+                return False
+            self._parse_format(bytes(self._pending[8 : 8 + size]))
+            del self._pending[: 8 + size + (size & 1)]
+        elif chunk_id == b"data":
+            if self.sample_rate is None:
+                raise ValueError("Invalid WAV file: data chunk before fmt chunk")
+            del self._pending[:8]
+            self._in_data = True
+            frame_size = self.sample_width * self.channels
+            if size in _UNKNOWN_DATA_SIZES:
+                self._data_remaining = None
+            else:
+                self._data_remaining = size
+                self._reserve(
+                    min(
+                        size // frame_size,
+                        self.sample_rate * _MAX_PREALLOCATED_SECONDS,
+                    )
+                )
+        else:
+            # LIST, fact, cue, ... (chunks are padded to an even size)
+            del self._pending[:8]
+            self._skip = size + (size & 1)
+        return True
+
+    def _parse_format(self, fmt: bytes) -> None:
+        if len(fmt) < 16:
+            raise ValueError("Invalid WAV file: fmt chunk too small")
+        audio_format, channels, sample_rate, _, _, bits = struct.unpack(
+            "<HHIIHH", fmt[:16]
+        )
+        if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            # The real format is in the first two bytes of the sub-format GUID
+            (audio_format,) = struct.unpack("<H", fmt[24:26])
+        if audio_format not in (_WAVE_FORMAT_PCM, _WAVE_FORMAT_IEEE_FLOAT):
+            raise ValueError(
+                f"Unsupported WAV encoding 0x{audio_format:04x}: "
+                "only PCM and IEEE float are supported"
+            )
+        if channels < 1 or sample_rate < 1 or bits % 8 or not 8 <= bits <= 64:
+            raise ValueError("Invalid WAV file: bad fmt chunk")
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.sample_width = bits // 8
+        self.is_float = audio_format == _WAVE_FORMAT_IEEE_FLOAT
+
+    def _consume_data(self) -> None:
+        frame_size = self.sample_width * self.channels
+        available = len(self._pending)
+        if self._data_remaining is not None:
+            available = min(available, self._data_remaining)
+        usable = available - available % frame_size
+        if usable == 0:
+            if self._data_remaining == 0:
+                # Ignore anything after the data chunk
+                self._pending.clear()
+            return
+        frames = usable // frame_size
+        self._reserve(self._frames + frames)
+        pcm_to_float32(
+            memoryview(self._pending)[:usable],
+            self.sample_width,
+            self.channels,
+            self.is_float,
+            out=self._samples[self._frames : self._frames + frames],
+        )
+        del self._pending[:usable]
+        self._frames += frames
+        if self._data_remaining is not None:
+            self._data_remaining -= usable
+            if self._data_remaining < frame_size:
+                self._pending.clear()
+
+    def _reserve(self, frames: int) -> None:
+        """Make sure the sample buffer can hold `frames` frames."""
+        if frames <= len(self._samples):
+            return
+        # Grow geometrically when the size is not known up front
+        capacity = max(frames, len(self._samples) * 2)
+        grown = np.empty(capacity, dtype=np.float32)
+        grown[: self._frames] = self._samples[: self._frames]
+        self._samples = grown
+
+
+def decode_wav(data: bytes, target_rate: int = ASR_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode a complete WAV file to mono float32 samples at `target_rate`.
+
+    Raises:
+        ValueError: If the file is not a supported WAV file.
+    """
+    parser = WavStreamParser(target_rate)
+    parser.feed(data)
+    return parser.finish()
@@ -0,0 +1,300 @@
+"""
+Lifecycle of the files in the `cache/` directory.
+
+TTS engines, the Azure ASR and the Hume agent write temporary audio files into
+`cache/`. They used to be removed only when everything went well, and the
+directory was only wiped at exit, so interrupts and errors made it grow for as
+long as the server ran. `CacheManager` keeps it bounded:
+
+- Writers get their file names from `file_path`, which records who owns the
+  file. Owners remove files with `remove` when they are done.
+- A background sweeper removes owned files older than `max_age_seconds`, then
+  the oldest files until the directory is below `max_size_mb`. Files younger
+  than `MIN_SWEEP_AGE_SECONDS` are never swept, they may still be in use.
+- Files nobody owns (left by a crash or a previous run) are swept once they are
+  older than `ORPHAN_GRACE_SECONDS`.
+- With `in_memory`, `cache/` is a symlink to a directory on tmpfs (`/dev/shm`),
+  so audio files never touch the disk. Nothing that must survive a reboot is
+  kept in `cache/` (the MCP tool schemas live in `mcp_cache/`).
+
+Bytes written and reclaimed are counted for `stats` (`/cache-stats`).
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+CACHE_DIR = "cache"
+MEMORY_ROOT = "/dev/shm"
+MIN_SWEEP_AGE_SECONDS = 30.0
+ORPHAN_GRACE_SECONDS = 300.0
+
+
+@dataclass
+class _OwnedFile:
+    owner: str
+    claimed_at: float
+    # Size when last seen, counted in bytes_written once
+    size: int = 0
+
+
+class CacheManager:
+    """Owned temporary files in the cache directory, swept by age and size."""
+
+    def __init__(
+        self,
+        directory: str = CACHE_DIR,
+        max_size_mb: float = 1024,
+        max_age_seconds: float = 3600,
+        sweep_interval: float = 60,
+    ):
+        """
+        Args:
+            directory: The cache directory, served at `/cache`.
+            max_size_mb: Size the sweeper keeps the directory under, 0 for no limit.
+            max_age_seconds: Age after which owned files are swept, 0 for no limit.
+            sweep_interval: Seconds between two sweeps.
+        """
+        self.directory = directory
+        self.max_size_mb = max_size_mb
+        self.max_age_seconds = max_age_seconds
+        self.sweep_interval = sweep_interval
+        self.in_memory = False
+        self.bytes_written = 0
+        self.bytes_reclaimed = 0
+        self.files_swept = 0
+        self._owned: Dict[str, _OwnedFile] = {}
+        # Writers run on worker threads
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(
+        self,
+        max_size_mb: float,
+        max_age_seconds: float,
+        sweep_interval: float,
+        in_memory: bool = False,
+    ) -> None:
+        self.max_size_mb = max_size_mb
+        self.max_age_seconds = max_age_seconds
+        self.sweep_interval = sweep_interval
+        self.in_memory = in_memory
+        self._place()
+
+    # -- ownership -----------------------------------------------------------
+
+    def file_path(self, file_name: str, owner: str) -> str:
+        """
+        Path of a new file in the cache directory, owned by `owner` until removed.
+
+        Args:
+            file_name: Name of the file, with its extension.
+            owner: Who writes the file, e.g. the engine class name.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, file_name)
+        self.claim(path, owner)
+        return path
+
+    def claim(self, path: str, owner: str) -> None:
+        """Record the owner of a file written under another name or process."""
+        with self._lock:
+            self._owned[os.path.normpath(path)] = _OwnedFile(owner, time.time())
+
+    def remove(self, path: str) -> bool:
+        """Remove a file the owner is done with. Returns False if it was gone."""
+        key = os.path.normpath(path)
+        with self._lock:
+            entry = self._owned.pop(key, None)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        self._count_removed(entry, size)
+        return True
+
+    def _count_removed(self, entry: Optional[_OwnedFile], size: int) -> None:
+        with self._lock:
+            if entry is not None and entry.size == 0:
+                # Created and removed between two sweeps
+                self.bytes_written += size
+            self.bytes_reclaimed += size
+
+    # -- sweeping ------------------------------------------------------------
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Remove expired and orphaned files, then enforce the size quota."""
+        now = time.time() if now is None else now
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        kept = []
+        seen = set()
+        for mtime, size, path in files:
+            key = os.path.normpath(path)
+            seen.add(key)
+            with self._lock:
+                entry = self._owned.get(key)
+                if entry is not None and size > entry.size:
+                    self.bytes_written += size - entry.size
+                    entry.size = size
+            age = now - mtime
+            if entry is None:
+                expired = age >= ORPHAN_GRACE_SECONDS
+            else:
+                expired = self.max_age_seconds > 0 and age >= self.max_age_seconds
+            if expired and age >= MIN_SWEEP_AGE_SECONDS and self._sweep_file(path):
+                removed += 1
+            else:
+                kept.append((mtime, size, path))
+
+        max_bytes = self.max_size_mb * 1024 * 1024
+        total = sum(size for _, size, _ in kept)
+        if max_bytes > 0 and total > max_bytes:
+            for mtime, size, path in sorted(kept):
+                if total <= max_bytes or now - mtime < MIN_SWEEP_AGE_SECONDS:
+                    break
+                if self._sweep_file(path):
+                    removed += 1
+                    total -= size
+
+        # Forget files removed behind our back, or claimed and never written
+        with self._lock:
+            for key, entry in list(self._owned.items()):
+                if key not in seen and (
+                    entry.size or now - entry.claimed_at >= ORPHAN_GRACE_SECONDS
+                ):
+                    del self._owned[key]
+        if removed:
+            logger.debug(f"Cache sweeper removed {removed} files")
+        return removed
+
+    def _sweep_file(self, path: str) -> bool:
+        with self._lock:
+            entry = self._owned.pop(os.path.normpath(path), None)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Could not remove cache file {path}: {e}")
+            return False
+        self._count_removed(entry, size)
+        self.files_swept += 1
+        return True
+
+    async def start(self) -> None:
+        """Start the background sweeper."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Cache sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    def clear(self) -> None:
+        """Remove every file in the cache directory."""
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+            except OSError as e:
+                logger.warning(f"Could not remove cache entry {entry.path}: {e}")
+        with self._lock:
+            self._owned.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        owners: Dict[str, int] = {}
+        with self._lock:
+            for entry in self._owned.values():
+                owners[entry.owner] = owners.get(entry.owner, 0) + 1
+        files = 0
+        total = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                    files += 1
+                except OSError:
+                    continue
+        return {
+            "directory": os.path.realpath(self.directory),
+            "in_memory": self.in_memory,
+            "files": files,
+            "bytes": total,
+            "owners": owners,
+            "bytes_written": self.bytes_written,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "files_swept": self.files_swept,
+        }
+
+    # -- placement -----------------------------------------------------------
+
+    def _memory_directory(self) -> str:
+        # One directory per installation, so two servers do not share it
+        digest = hashlib.sha256(
+            os.path.abspath(self.directory).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(MEMORY_ROOT, f"open-llm-vtuber-cache-{digest[:12]}")
+
+    def _place(self) -> None:
+        """Make the cache directory a tmpfs symlink or a plain directory."""
+        directory = self.directory
+        if self.in_memory and not os.path.isdir(MEMORY_ROOT):
+            logger.warning(
+                f"{MEMORY_ROOT} is not available, keeping the cache on disk."
+            )
+            self.in_memory = False
+
+        if self.in_memory:
+            target = self._memory_directory()
+            os.makedirs(target, exist_ok=True)
+            if os.path.islink(directory):
+                if os.path.realpath(directory) == os.path.realpath(target):
+                    return
+                os.unlink(directory)
+            elif os.path.isdir(directory):
+                shutil.rmtree(directory)
+            os.symlink(target, directory, target_is_directory=True)
+            logger.info(f"Cache directory is in memory: {directory} -> {target}")
+            return
+
+        if os.path.islink(directory):
+            source = os.path.realpath(directory)
+            os.unlink(directory)
+            shutil.rmtree(source, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+# Shared by all engines and sessions
+cache_manager = CacheManager()
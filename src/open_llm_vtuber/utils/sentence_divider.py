@@ -1,3 +1,4 @@
+import contextvars
 import re
 from typing import List, Tuple, AsyncIterator, Optional, Union, Dict, Any
 import pysbd
@@ -6,6 +7,8 @@ from langdetect import detect
 from enum import Enum
 from dataclasses import dataclass
 
+from .speech_pacing import SpeechPacer, current_speech_pacer
+
 # Constants for additional checks
 COMMAS = [
     ",",
@@ -266,6 +269,25 @@ def segment_text_by_pysbd(text: str) -> Tuple[List[str], str]:
         return segment_text_by_regex(text)
 
 
+def split_sentences(text: str) -> List[str]:
+    """
+    Split a complete text into sentences, for any language.
+
+    Unlike `segment_text_by_pysbd`, which is used on streaming text, the trailing
+    part without end punctuation is kept as the last sentence.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List[str]: The sentences, in order
+    """
+    sentences, remaining = segment_text_by_pysbd(text)
+    if remaining.strip():
+        sentences.append(remaining.strip())
+    return sentences
+
+
 class TagState(Enum):
     """State of a tag in text"""
 
@@ -296,6 +318,120 @@ class SentenceWithTags:
 
     text: str
     tags: List[TagInfo]  # List of tags from outermost to innermost
+    # Position of the sentence in the response, referenced by text deltas
+    sentence_id: Optional[int] = None
+
+
+# Whether dividers yield a "text-delta" dict for every token, before the token is
+# divided into sentences. Set by conversations that forward them to the client.
+stream_text_deltas: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "stream_text_deltas", default=False
+)
+
+
+def text_delta(sentence_id: int, text: str) -> Dict[str, Any]:
+    """
+    An LLM token for the client, ahead of its sentence's audio.
+
+    `sentence_id` is the sentence being accumulated when the token arrived; the
+    audio payloads of that sentence carry the same id and its final display
+    text. A token spanning a sentence boundary is attributed to the first one.
+    Tag markers such as `<think>` are not sentences and get no id, and the
+    text of deltas is cleaned by `DeltaFilter`s along the pipeline.
+    """
+    return {"type": "text-delta", "sentence_id": sentence_id, "text": text}
+
+
+class DeltaFilter:
+    """
+    Removes markers from the text of deltas as the tokens arrive.
+
+    Markers are matched without case. The text between the two markers of a
+    hidden pair (e.g. `<think>` and `</think>`) is dropped as well. A token
+    ending with the beginning of a marker ("[jo") is held back until the next
+    tokens tell whether the marker is complete.
+    """
+
+    def __init__(self, markers: List[str], hidden: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            markers: Markers to remove, e.g. `[joy]`.
+            hidden: Opening -> closing marker of the spans to drop. Both are
+                removed as markers too.
+        """
+        hidden = {k.lower(): v.lower() for k, v in (hidden or {}).items()}
+        self._hidden_by_close = {close: opening for opening, close in hidden.items()}
+        self._markers = sorted(
+            {m.lower() for m in markers} | set(hidden) | set(hidden.values()),
+            key=len,
+            reverse=True,
+        )
+        self._first_chars = {m[0] for m in self._markers}
+        # Open hidden spans, innermost last
+        self._hidden_stack: List[str] = []
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        """Return the part of the text seen so far that can be shown now."""
+        text = self._pending + text
+        lower = text.lower()
+        shown = []
+        i = 0
+        while i < len(text):
+            if lower[i] in self._first_chars:
+                rest = lower[i:]
+                marker = next((m for m in self._markers if rest.startswith(m)), None)
+                if marker is not None:
+                    self._enter_or_leave(marker)
+                    i += len(marker)
+                    continue
+                if any(m.startswith(rest) for m in self._markers):
+                    # Maybe the beginning of a marker: wait for more text
+                    break
+            if not self._hidden_stack:
+                shown.append(text[i])
+            i += 1
+        self._pending = text[i:]
+        return "".join(shown)
+
+    def flush(self) -> str:
+        """Return the held-back text: the stream ended, it is not a marker."""
+        text, self._pending = self._pending, ""
+        return "" if self._hidden_stack else text
+
+    def _enter_or_leave(self, marker: str) -> None:
+        opening = self._hidden_by_close.get(marker)
+        if opening is not None:
+            if opening in self._hidden_stack:
+                # Close the span and anything left open inside it
+                del self._hidden_stack[self._hidden_stack.index(opening) :]
+        elif marker in self._hidden_by_close.values():
+            self._hidden_stack.append(marker)
+
+
+def _join_sentences(sentences: List[str]) -> str:
+    """Join sentences into one chunk, without spaces after full-width punctuation."""
+    joined = ""
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if joined and not joined.endswith(("。", "！", "？")):
+            joined += " "
+        joined += sentence
+    return joined
+
+
+def _pack_sentences(sentences: List[str], max_chars: int) -> List[str]:
+    """Join consecutive sentences into chunks of at most `max_chars` characters."""
+    chunks = []
+    for sentence in sentences:
+        merged = _join_sentences([chunks[-1], sentence]) if chunks else ""
+        if merged and len(merged) <= max_chars:
+            chunks[-1] = merged
+        elif sentence.strip():
+            chunks.append(sentence.strip())
+    return chunks
 
 
 class SentenceDivider:
@@ -304,6 +440,7 @@ class SentenceDivider:
         faster_first_response: bool = True,
         segment_method: str = "pysbd",
         valid_tags: List[str] = None,
+        pacer: Optional[SpeechPacer] = None,
     ):
         """
         Initialize the SentenceDivider.
@@ -312,10 +449,16 @@ class SentenceDivider:
             faster_first_response: Whether to split first sentence at commas
             segment_method: Method for segmenting sentences
             valid_tags: List of valid tag names to detect
+            pacer: Adapts the chunk size to the TTS speed. Defaults to the pacer
+                of the current conversation turn, if any.
         """
         self.faster_first_response = faster_first_response
         self.segment_method = segment_method
         self.valid_tags = valid_tags or ["think"]
+        self.pacer = pacer
+        self._active_pacer: Optional[SpeechPacer] = pacer
+        self._next_sentence_id = 0
+        self._delta_filter = self._new_delta_filter()
         self._is_first_sentence = True
         self._buffer = ""
         # Replace active_tags dict with a stack to handle nesting
@@ -402,11 +545,16 @@ class SentenceDivider:
 
         return (TagInfo(matched_tag, tag_type), text[first_tag.end() :].lstrip())
 
-    async def _process_buffer(self) -> AsyncIterator[SentenceWithTags]:
+    async def _process_buffer(
+        self, merge: bool = True
+    ) -> AsyncIterator[SentenceWithTags]:
         """
         Process the current buffer, yielding complete sentences with tags.
         This is now an async generator.
         It consumes processed parts from self._buffer.
+
+        Args:
+            merge: Whether short sentences may be held back to be merged.
         """
         processed_something = True  # Flag to loop until no more processing can be done
         while processed_something:
@@ -489,12 +637,12 @@ class SentenceDivider:
             if original_buffer_len > 0:
                 current_tags = self._get_current_tags()
 
-                # Handle first sentence with comma if enabled
-                if (
-                    self._is_first_sentence
-                    and self.faster_first_response
-                    and contains_comma(self._buffer)
-                ):
+                # Handle first sentence with comma if enabled, or any sentence
+                # when the client is about to run out of audio
+                split_at_comma = self._is_first_sentence and self.faster_first_response
+                if not split_at_comma and self._active_pacer is not None:
+                    split_at_comma = self._active_pacer.should_split_early()
+                if split_at_comma and contains_comma(self._buffer):
                     sentence, remaining = comma_splitter(self._buffer)
                     if sentence.strip():
                         yield SentenceWithTags(
@@ -506,10 +654,28 @@ class SentenceDivider:
                         processed_something = True
                         continue  # Restart processing loop
 
+                # Merge short sentences while enough audio is queued
+                merge_target = (
+                    self._active_pacer.merge_target_chars()
+                    if merge and self._active_pacer is not None
+                    else 0
+                )
+                if merge_target and len(self._buffer.strip()) < merge_target:
+                    # Cannot reach the target yet, wait for more text
+                    break
+
                 # Process normal sentences based on end punctuation
                 if contains_end_punctuation(self._buffer):
                     sentences, remaining = self._segment_text(self._buffer)
                     if sentences:  # Only process if segmentation yielded sentences
+                        if merge_target:
+                            merged = _join_sentences(sentences)
+                            if len(merged) < merge_target:
+                                break
+                            # Several sentences may have arrived at once
+                            sentences = _pack_sentences(
+                                sentences, self._active_pacer.max_chunk_chars
+                            )
                         self._buffer = remaining
                         self._is_first_sentence = False
                         processed_something = True
@@ -561,34 +727,69 @@ class SentenceDivider:
         """
         self._full_response = []
         self.reset()  # Ensure state is clean
+        self._active_pacer = self.pacer or current_speech_pacer.get()
+        with_deltas = stream_text_deltas.get()
 
         async for item in segment_stream:
             if isinstance(item, dict):
+                delta = self._held_back_delta() if with_deltas else None
+                if delta:
+                    yield delta
                 # Before yielding the dict, process and yield any complete sentences formed so far
-                async for sentence in self._process_buffer():
+                async for sentence in self._process_buffer(merge=False):
                     self._full_response.append(
                         sentence.text
                     )  # Track for complete response
-                    yield sentence
+                    yield self._numbered(sentence)
                 # Now yield the dictionary
                 yield item
             elif isinstance(item, str):
+                delta = self._delta_filter.feed(item) if with_deltas else ""
+                if delta:
+                    yield text_delta(self._next_sentence_id, delta)
                 self._buffer += item
                 # Process the buffer incrementally as string chunks arrive
                 async for sentence in self._process_buffer():
                     self._full_response.append(
                         sentence.text
                     )  # Track for complete response
-                    yield sentence
+                    yield self._numbered(sentence)
             else:
                 logger.warning(
                     f"SentenceDivider received unexpected type: {type(item)}"
                 )
 
         # After the stream finishes, flush any remaining text in the buffer
+        delta = self._held_back_delta() if with_deltas else None
+        if delta:
+            yield delta
         async for sentence in self._flush_buffer():
             self._full_response.append(sentence.text)
-            yield sentence
+            yield self._numbered(sentence)
+
+    def _numbered(self, sentence: SentenceWithTags) -> SentenceWithTags:
+        """Give the sentence the id its deltas were sent with."""
+        if any(tag.state != TagState.INSIDE for tag in sentence.tags if tag.name):
+            # A tag marker: its deltas are removed, it takes no id
+            return sentence
+        sentence.sentence_id = self._next_sentence_id
+        self._next_sentence_id += 1
+        return sentence
+
+    def _held_back_delta(self) -> Optional[Dict[str, Any]]:
+        """The text the delta filter held back, once no marker can follow."""
+        delta = self._delta_filter.flush()
+        return text_delta(self._next_sentence_id, delta) if delta else None
+
+    def _new_delta_filter(self) -> DeltaFilter:
+        """Deltas show neither tag markers nor the text inside `<think>`."""
+        markers = [
+            marker
+            for tag in self.valid_tags
+            for marker in (f"<{tag}>", f"</{tag}>", f"<{tag}/>")
+        ]
+        hidden = {"<think>": "</think>"} if "think" in self.valid_tags else {}
+        return DeltaFilter(markers, hidden)
 
     @property
     def complete_response(self) -> str:
@@ -606,3 +807,5 @@ class SentenceDivider:
         self._is_first_sentence = True
         self._buffer = ""
         self._tag_stack = []
+        self._next_sentence_id = 0
+        self._delta_filter = self._new_delta_filter()
@@ -0,0 +1,166 @@
+"""
+Pacing of the text handed to TTS, from measured synthesis speed.
+
+`SentenceDivider` cuts the LLM stream into sentences with a fixed policy. When
+`adaptive_chunking` is enabled, the conversation attaches a `SpeechPacer` to the
+turn (see `current_speech_pacer`) and the divider asks it how to cut:
+
+- The pacer estimates the audio "runway": audio sent to the client that has not
+  been played yet, plus the expected audio of sentences still being synthesized.
+- While the runway is shorter than the synthesis of a typical sentence, the
+  client is about to run dry, so sentences are also cut at commas to get audio
+  out sooner.
+- Once the runway is long, complete sentences are merged until synthesizing
+  them would take half of the runway. Fewer, larger TTS requests save the
+  per-request overhead without causing gaps.
+
+Synthesis and audio seconds per character are measured per TTS engine by
+`tts_rate_tracker`, across turns and sessions. Until an engine has been
+measured, the divider keeps its fixed policy.
+"""
+
+import contextvars
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Length of a typical sentence, used to judge whether the runway is short
+TYPICAL_SENTENCE_CHARS = 30
+# Runway below which sentences are cut at commas, at least
+MIN_RUNWAY_SECONDS = 0.5
+# Share of the runway a merged chunk may take to synthesize
+MERGE_BUDGET = 0.5
+MIN_MERGE_CHARS = 2 * TYPICAL_SENTENCE_CHARS
+MAX_CHUNK_CHARS = 200
+# Weight of the latest measurement in the moving averages
+_RATE_EMA_ALPHA = 0.3
+
+
+@dataclass
+class TTSRates:
+    """Measured speed of a TTS engine."""
+
+    synthesis_per_char: float
+    audio_per_char: float
+
+
+class TTSRateTracker:
+    """Moving averages of synthesis and audio seconds per character, per engine."""
+
+    def __init__(self):
+        self._rates: "weakref.WeakKeyDictionary[Any, TTSRates]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def record(
+        self, engine: Any, chars: int, synthesis_seconds: float, audio_seconds: float
+    ) -> None:
+        if engine is None or chars <= 0 or audio_seconds <= 0:
+            return
+        synthesis = synthesis_seconds / chars
+        audio = audio_seconds / chars
+        rates = self._rates.get(engine)
+        if rates is None:
+            self._rates[engine] = TTSRates(synthesis, audio)
+            return
+        rates.synthesis_per_char += _RATE_EMA_ALPHA * (
+            synthesis - rates.synthesis_per_char
+        )
+        rates.audio_per_char += _RATE_EMA_ALPHA * (audio - rates.audio_per_char)
+
+    def get(self, engine: Any) -> Optional[TTSRates]:
+        if engine is None:
+            return None
+        return self._rates.get(engine)
+
+
+# Shared by all sessions
+tts_rate_tracker = TTSRateTracker()
+
+
+class SpeechPacer:
+    """Tracks the audio runway of one conversation turn and advises the divider."""
+
+    def __init__(
+        self,
+        tts_engine: Any = None,
+        rate_tracker: TTSRateTracker = tts_rate_tracker,
+        max_chunk_chars: int = MAX_CHUNK_CHARS,
+    ):
+        """
+        Args:
+            tts_engine: The engine synthesizing the turn, if already known.
+            rate_tracker: Where the engine's measured speed is looked up.
+            max_chunk_chars: Upper bound of a merged chunk.
+        """
+        self.tts_engine = tts_engine
+        self.rate_tracker = rate_tracker
+        self.max_chunk_chars = max_chunk_chars
+        self._playback_ends_at = 0.0
+        self._pending_chars = 0
+
+    def use_engine(self, tts_engine: Any) -> None:
+        self.tts_engine = tts_engine
+
+    @property
+    def rates(self) -> Optional[TTSRates]:
+        return self.rate_tracker.get(self.tts_engine)
+
+    # -- events from the TTS manager -----------------------------------------
+
+    def sentence_queued(self, chars: int) -> None:
+        self._pending_chars += chars
+
+    def sentence_finished(self, chars: int) -> None:
+        self._pending_chars = max(0, self._pending_chars - chars)
+
+    def audio_sent(self, seconds: float, now: Optional[float] = None) -> None:
+        """Audio was sent to the client, which plays it after what it has queued."""
+        now = time.monotonic() if now is None else now
+        self._playback_ends_at = max(self._playback_ends_at, now) + seconds
+
+    def reset(self) -> None:
+        self._playback_ends_at = 0.0
+        self._pending_chars = 0
+
+    # -- advice for the divider ----------------------------------------------
+
+    def buffered_seconds(self, now: Optional[float] = None) -> float:
+        """Audio the client has queued but not played yet."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._playback_ends_at - now)
+
+    def runway_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """Buffered audio plus the audio of sentences being synthesized."""
+        rates = self.rates
+        if rates is None:
+            return None
+        return self.buffered_seconds(now) + self._pending_chars * rates.audio_per_char
+
+    def should_split_early(self, now: Optional[float] = None) -> bool:
+        """The client is about to run out of audio: cut at the next comma."""
+        runway = self.runway_seconds(now)
+        if runway is None:
+            return False
+        threshold = max(
+            MIN_RUNWAY_SECONDS, TYPICAL_SENTENCE_CHARS * self.rates.synthesis_per_char
+        )
+        return runway < threshold
+
+    def merge_target_chars(self, now: Optional[float] = None) -> int:
+        """Length complete sentences should be merged up to, 0 to not merge."""
+        runway = self.runway_seconds(now)
+        if runway is None:
+            return 0
+        synthesis_per_char = max(self.rates.synthesis_per_char, 1e-6)
+        target = int(runway * MERGE_BUDGET / synthesis_per_char)
+        if target < MIN_MERGE_CHARS:
+            return 0
+        return min(target, self.max_chunk_chars)
+
+
+# The pacer of the conversation turn being processed, read by `SentenceDivider`
+current_speech_pacer: contextvars.ContextVar[Optional[SpeechPacer]] = (
+    contextvars.ContextVar("current_speech_pacer", default=None)
+)
@@ -1,4 +1,10 @@
 import base64
+import importlib.util
+import io
+import wave
+
+import numpy as np
+import soundfile as sf
 from pydub import AudioSegment
 from pydub.utils import make_chunks
 from ..agent.output_types import Actions
@@ -44,7 +50,9 @@ def prepare_audio_payload(
     Returns:
         dict: The audio payload to be sent
     """
+    sentence_id = None
     if isinstance(display_text, DisplayText):
+        sentence_id = display_text.sentence_id
         display_text = display_text.to_dict()
 
     if not audio_path:
@@ -57,6 +65,7 @@ def prepare_audio_payload(
             "display_text": display_text,
             "actions": actions.to_dict() if actions else None,
             "forwarded": forwarded,
+            "sentence_id": sentence_id,
         }
 
     try:
@@ -77,10 +86,174 @@ def prepare_audio_payload(
         "display_text": display_text,
         "actions": actions.to_dict() if actions else None,
         "forwarded": forwarded,
+        "sentence_id": sentence_id,
     }
 
     return payload
 
 
+def payload_duration(payload: dict) -> float:
+    """Seconds of audio in an audio payload, from its volume slices."""
+    return len(payload.get("volumes") or []) * payload.get("slice_length", 0) / 1000
+
+
+class PCMPayloadStream:
+    """
+    Builds audio payloads from the PCM chunks of one sentence as they arrive.
+
+    Every chunk becomes a self-contained WAV payload the frontend queues after the
+    previous one. The volumes are normalized to the loudest slice heard so far in
+    the sentence, since the full envelope is not known yet. Actions are sent with
+    the first chunk only.
+    """
+
+    def __init__(
+        self,
+        display_text: DisplayText = None,
+        actions: Actions = None,
+        chunk_length_ms: int = 20,
+        forwarded: bool = False,
+    ):
+        self.sentence_id = None
+        if isinstance(display_text, DisplayText):
+            self.sentence_id = display_text.sentence_id
+            display_text = display_text.to_dict()
+        self.display_text = display_text
+        self.actions = actions
+        self.chunk_length_ms = chunk_length_ms
+        self.forwarded = forwarded
+        self.chunks_sent = 0
+        self._peak_rms = 0.0
+
+    def payload(self, samples: np.ndarray, sample_rate: int) -> dict[str, any]:
+        """
+        Parameters:
+            samples (np.ndarray): float32 mono samples in [-1, 1]
+            sample_rate (int): Sample rate of the samples
+
+        Returns:
+            dict: The audio payload of this chunk
+        """
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm.tobytes())
+
+        slice_samples = max(1, sample_rate * self.chunk_length_ms // 1000)
+        audio = pcm.astype(np.float64)
+        rms = [
+            float(np.sqrt(np.mean(np.square(audio[i : i + slice_samples]))))
+            for i in range(0, len(audio), slice_samples)
+        ]
+        self._peak_rms = max([self._peak_rms, *rms])
+        volumes = [v / self._peak_rms if self._peak_rms else 0.0 for v in rms]
+
+        actions = self.actions if self.chunks_sent == 0 else None
+        self.chunks_sent += 1
+        return {
+            "type": "audio",
+            "audio": base64.b64encode(buffer.getvalue()).decode("utf-8"),
+            "volumes": volumes,
+            "slice_length": self.chunk_length_ms,
+            "display_text": self.display_text,
+            "actions": actions.to_dict() if actions else None,
+            "forwarded": self.forwarded,
+            "sentence_id": self.sentence_id,
+        }
+
+
+def incremental_mp3_available() -> bool:
+    """Whether PyAV is installed, so `MP3StreamDecoder` decodes incrementally."""
+    return importlib.util.find_spec("av") is not None
+
+
+class MP3StreamDecoder:
+    """
+    Decodes an MP3 byte stream into PCM as the bytes arrive, in memory.
+
+    With PyAV (the `streaming` extra, also installed with faster-whisper), the
+    parser and decoder keep their state between chunks, so frames are decoded as
+    soon as they are complete, bit reservoir included. Without it, the bytes are
+    collected and decoded in one go by `flush` with soundfile (libsndfile 1.1+
+    reads MP3); still without a file or an ffmpeg subprocess, but not
+    incremental.
+
+    An MP3 frame is only ~24 ms of audio, and every chunk returned becomes its
+    own audio message, so decoded frames are held back until there is at least
+    `min_chunk_seconds` of audio.
+    """
+
+    def __init__(self, min_chunk_seconds: float = 0.25):
+        self.sample_rate: int | None = None
+        self.min_chunk_seconds = min_chunk_seconds
+        self._pending = bytearray()
+        self._decoded: list[np.ndarray] = []
+        self._decoded_samples = 0
+        try:
+            import av
+
+            self._codec = av.CodecContext.create("mp3", "r")
+            self._resampler = av.AudioResampler(format="flt", layout="mono")
+            self._invalid_data = av.error.InvalidDataError
+        except ImportError:
+            self._codec = None
+
+    @property
+    def incremental(self) -> bool:
+        return self._codec is not None
+
+    def feed(self, data: bytes) -> list[np.ndarray]:
+        """Decode the frames completed by `data`, as float32 mono chunks."""
+        if self._codec is None:
+            self._pending += data
+            return []
+        self._decode(self._codec.parse(data))
+        if self._decoded_samples < self.min_chunk_seconds * (self.sample_rate or 0):
+            return []
+        return self._take_decoded()
+
+    def flush(self) -> list[np.ndarray]:
+        """
+        Decode what is left at the end of the stream.
+
+        Without PyAV this decodes the whole stream: call it off the event loop.
+        """
+        if self._codec is None:
+            if not self._pending:
+                return []
+            samples, self.sample_rate = sf.read(
+                io.BytesIO(bytes(self._pending)), dtype="float32", always_2d=True
+            )
+            self._pending.clear()
+            return [samples.mean(axis=1)]
+        self._decode([*self._codec.parse(None), None])
+        return self._take_decoded()
+
+    def _decode(self, packets) -> None:
+        for packet in packets:
+            try:
+                frames = self._codec.decode(packet)
+            except self._invalid_data:
+                # e.g. an ID3 tag; the decoder resyncs on the next frame
+                continue
+            for frame in frames:
+                for mono in self._resampler.resample(frame):
+                    self.sample_rate = mono.sample_rate
+                    samples = mono.to_ndarray()[0]
+                    self._decoded.append(samples)
+                    self._decoded_samples += len(samples)
+
+    def _take_decoded(self) -> list[np.ndarray]:
+        if not self._decoded:
+            return []
+        chunk = np.concatenate(self._decoded)
+        self._decoded = []
+        self._decoded_samples = 0
+        return [chunk]
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
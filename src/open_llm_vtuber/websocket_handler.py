@@ -7,6 +7,7 @@ import numpy as np
 from loguru import logger
 
 from .service_context import ServiceContext
+from .client_sender import ClientSender
 from .chat_group import (
     ChatGroupManager,
     handle_group_operation,
@@ -15,13 +16,15 @@ from .chat_group import (
 )
 from .message_handler import message_handler
 from .utils.stream_audio import prepare_audio_payload
+from .utils.audio_ingest import UtteranceResampler, pcm_to_float32
+from .asr.asr_interface import ASRInterface
 from .chat_history_manager import (
     create_new_history,
     get_history,
     delete_history,
     get_history_list,
 )
-from .config_manager.utils import scan_config_alts_directory, scan_bg_directory
+from .config_manager.file_index import config_file_index
 from .conversations.conversation_handler import (
     handle_conversation_trigger,
     handle_group_interrupt,
@@ -63,12 +66,14 @@ class WebSocketHandler:
 
     def __init__(self, default_context_cache: ServiceContext):
         """Initialize the WebSocket handler with default context"""
-        self.client_connections: Dict[str, WebSocket] = {}
+        self.client_connections: Dict[str, ClientSender] = {}
         self.client_contexts: Dict[str, ServiceContext] = {}
         self.chat_group_manager = ChatGroupManager()
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
         self.received_data_buffers: Dict[str, np.ndarray] = {}
+        # mic-audio-data chunks at the client's rate, until mic-audio-end
+        self.mic_resamplers: Dict[str, UtteranceResampler] = {}
 
         # Message handlers mapping
         self._message_handlers = self._init_message_handlers()
@@ -110,17 +115,23 @@ class WebSocketHandler:
         Raises:
             Exception: If initialization fails
         """
+        # All messages to the client go through its send queue
+        system_config = self.default_context_cache.system_config
+        sender = ClientSender(
+            websocket,
+            client_uid,
+            max_buffer_bytes=int(system_config.client_send_buffer_mb * 1024 * 1024),
+            policy=system_config.slow_client_policy,
+        )
         try:
             session_service_context = await self._init_service_context(
-                websocket.send_text, client_uid
+                sender.send_text, client_uid
             )
 
-            await self._store_client_data(
-                websocket, client_uid, session_service_context
-            )
+            await self._store_client_data(sender, client_uid, session_service_context)
 
             await self._send_initial_messages(
-                websocket, client_uid, session_service_context
+                sender, client_uid, session_service_context
             )
 
             logger.info(f"Connection established for client {client_uid}")
@@ -130,6 +141,7 @@ class WebSocketHandler:
                 f"Failed to initialize connection for client {client_uid}: {e}"
             )
             await self._cleanup_failed_connection(client_uid)
+            await sender.stop()
             raise
 
     async def _store_client_data(
@@ -142,6 +154,7 @@ class WebSocketHandler:
         self.client_connections[client_uid] = websocket
         self.client_contexts[client_uid] = session_service_context
         self.received_data_buffers[client_uid] = np.array([])
+        self.mic_resamplers[client_uid] = UtteranceResampler()
 
         self.chat_group_manager.client_group_map[client_uid] = ""
         await self.send_group_update(websocket, client_uid)
@@ -178,16 +191,16 @@ class WebSocketHandler:
     async def _init_service_context(
         self, send_text: Callable, client_uid: str
     ) -> ServiceContext:
-        """Initialize service context for a new session by cloning the default context"""
+        """
+        Initialize service context for a new session from the default context.
+
+        The configs are shared, not copied; the session copies what it changes.
+        """
         session_service_context = ServiceContext()
         await session_service_context.load_cache(
-            config=self.default_context_cache.config.model_copy(deep=True),
-            system_config=self.default_context_cache.system_config.model_copy(
-                deep=True
-            ),
-            character_config=self.default_context_cache.character_config.model_copy(
-                deep=True
-            ),
+            config=self.default_context_cache.config,
+            system_config=self.default_context_cache.system_config,
+            character_config=self.default_context_cache.character_config,
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
@@ -211,12 +224,14 @@ class WebSocketHandler:
             websocket: The WebSocket connection
             client_uid: Unique identifier for the client
         """
+        # Handlers reply through the client's send queue
+        sender = self.client_connections.get(client_uid, websocket)
         try:
             while True:
                 try:
                     data = await websocket.receive_json()
                     message_handler.handle_message(client_uid, data)
-                    await self._route_message(websocket, client_uid, data)
+                    await self._route_message(sender, client_uid, data)
                 except WebSocketDisconnect:
                     raise
                 except json.JSONDecodeError:
@@ -224,7 +239,7 @@ class WebSocketHandler:
                     continue
                 except Exception as e:
                     logger.error(f"Error processing message: {e}")
-                    await websocket.send_text(
+                    await sender.send_text(
                         json.dumps({"type": "error", "message": str(e)})
                     )
                     continue
@@ -298,9 +313,12 @@ class WebSocketHandler:
         )
 
         # Clean up other client data
-        self.client_connections.pop(client_uid, None)
-        self.client_contexts.pop(client_uid, None)
+        connection = self.client_connections.pop(client_uid, None)
+        if isinstance(connection, ClientSender):
+            await connection.stop()
+        context = self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
+        self.mic_resamplers.pop(client_uid, None)
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
             if task and not task.done():
@@ -308,7 +326,6 @@ class WebSocketHandler:
             self.current_conversation_tasks.pop(client_uid, None)
 
         # Call context close to clean up resources (e.g., MCPClient)
-        context = self.client_contexts.get(client_uid)
         if context:
             await context.close()
 
@@ -317,9 +334,12 @@ class WebSocketHandler:
 
     async def _cleanup_failed_connection(self, client_uid: str) -> None:
         """Clean up failed connection data"""
-        self.client_connections.pop(client_uid, None)
+        connection = self.client_connections.pop(client_uid, None)
+        if isinstance(connection, ClientSender):
+            await connection.stop()
         self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
+        self.mic_resamplers.pop(client_uid, None)
         self.chat_group_manager.client_group_map.pop(client_uid, None)
 
         if client_uid in self.current_conversation_tasks:
@@ -481,9 +501,11 @@ class WebSocketHandler:
         """Handle incoming audio data"""
         audio_data = data.get("audio", [])
         if audio_data:
-            self.received_data_buffers[client_uid] = np.append(
-                self.received_data_buffers[client_uid],
-                np.array(audio_data, dtype=np.float32),
+            # Clients recording at another rate can say so and get resampled
+            # once the utterance is complete
+            sample_rate = data.get("sample_rate") or ASRInterface.SAMPLE_RATE
+            self.mic_resamplers[client_uid].feed(
+                np.array(audio_data, dtype=np.float32), int(sample_rate)
             )
 
     async def _handle_raw_audio_data(
@@ -504,7 +526,7 @@ class WebSocketHandler:
                     # Detected audio activity (voice)
                     self.received_data_buffers[client_uid] = np.append(
                         self.received_data_buffers[client_uid],
-                        np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32),
+                        pcm_to_float32(audio_bytes),
                     )
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "mic-audio-end"})
@@ -514,6 +536,12 @@ class WebSocketHandler:
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle triggers that start a conversation"""
+        if data.get("type") == "mic-audio-end":
+            audio = self.mic_resamplers[client_uid].flush()
+            if len(audio):
+                self.received_data_buffers[client_uid] = np.append(
+                    self.received_data_buffers[client_uid], audio
+                )
         await handle_conversation_trigger(
             msg_type=data.get("type", ""),
             data=data,
@@ -533,7 +561,9 @@ class WebSocketHandler:
     ) -> None:
         """Handle fetching available configurations"""
         context = self.client_contexts[client_uid]
-        config_files = scan_config_alts_directory(context.system_config.config_alts_dir)
+        config_files = config_file_index.config_files(
+            context.system_config.config_alts_dir
+        )
         await websocket.send_text(
             json.dumps({"type": "config-files", "configs": config_files})
         )
@@ -551,7 +581,7 @@ class WebSocketHandler:
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle fetching available background images"""
-        bg_files = scan_bg_directory()
+        bg_files = config_file_index.background_files()
         await websocket.send_text(
             json.dumps({"type": "background-files", "files": bg_files})
         )
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from open_llm_vtuber.asr.asr_pool import _FairQueue, _Job, _ThreadReplica
+
+
+def job(source, name):
+    # The queue never touches the future, so the job name stands in for it
+    return _Job(audio=np.zeros(1, dtype=np.float32), future=name, source=source)
+
+
+def names(jobs):
+    return [j.future for j in jobs]
+
+
+def test_sources_are_served_round_robin_and_in_order_within_a_source():
+    queue = _FairQueue()
+    for source, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]:
+        queue.put(job(source, name))
+    queue.put(job("c", "c1"))
+    queue.put(job("b", "b2"))
+    assert len(queue) == 6
+
+    served = []
+    while (next_job := queue.get_nowait()) is not None:
+        served.append(next_job)
+    assert names(served) == ["a1", "b1", "c1", "a2", "b2", "a3"]
+    assert len(queue) == 0
+
+
+def test_a_busy_source_does_not_hold_back_a_new_one():
+    queue = _FairQueue()
+    for i in range(10):
+        queue.put(job("http", f"h{i}"))
+    assert queue.get_nowait().future == "h0"
+    queue.put(job("client", "c0"))
+    assert names([queue.get_nowait(), queue.get_nowait()]) == ["h1", "c0"]
+
+
+def test_get_waits_for_a_job():
+    async def main():
+        queue = _FairQueue()
+        waiter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        queue.put(job("a", "a1"))
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(main()).future == "a1"
+
+
+def test_get_batch_stops_at_max_size():
+    async def main():
+        queue = _FairQueue()
+        for i in range(5):
+            queue.put(job("a", f"a{i}"))
+        batch = await queue.get_batch(max_size=3, window=10)
+        return batch, len(queue)
+
+    batch, left = asyncio.run(main())
+    assert names(batch) == ["a0", "a1", "a2"]
+    assert left == 2
+
+
+def test_get_batch_collects_jobs_arriving_within_the_window():
+    async def main():
+        queue = _FairQueue()
+        queue.put(job("a", "a1"))
+
+        async def late(delay, name):
+            await asyncio.sleep(delay)
+            queue.put(job("b", name))
+
+        on_time = asyncio.create_task(late(0.01, "b1"))
+        too_late = asyncio.create_task(late(0.5, "b2"))
+        batch = await queue.get_batch(max_size=8, window=0.1)
+        await on_time
+        too_late.cancel()
+        return batch
+
+    assert names(asyncio.run(main())) == ["a1", "b1"]
+
+
+def test_a_thread_replica_runs_one_transcription_at_a_time():
+    class Engine:
+        running = 0
+        overlapped = False
+
+        async def async_transcribe_np(self, audio):
+            Engine.running += 1
+            Engine.overlapped |= Engine.running > 1
+            await asyncio.sleep(0.01)
+            Engine.running -= 1
+            return "text"
+
+    replica = _ThreadReplica.__new__(_ThreadReplica)
+    replica.engine = Engine()
+    replica.lock = threading.Lock()
+
+    async def main():
+        audio = np.zeros(1, dtype=np.float32)
+        return await asyncio.gather(*(replica.transcribe(audio) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["text"] * 3
+    assert not Engine.overlapped
+    assert not replica.lock.locked()
@@ -0,0 +1,134 @@
+import struct
+
+import numpy as np
+import pytest
+
+from open_llm_vtuber.utils.audio_ingest import (
+    UtteranceResampler,
+    WavStreamParser,
+    decode_wav,
+    resample,
+)
+
+
+def make_wav(
+    pcm: bytes,
+    sample_rate: int = 16000,
+    channels: int = 1,
+    bits: int = 16,
+    data_size: int | None = None,
+    extra_chunks: bytes = b"",
+) -> bytes:
+    fmt = struct.pack(
+        "<HHIIHH",
+        1,
+        channels,
+        sample_rate,
+        sample_rate * channels * bits // 8,
+        channels * bits // 8,
+        bits,
+    )
+    size = len(pcm) if data_size is None else data_size
+    body = (
+        b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + extra_chunks
+        + b"data"
+        + struct.pack("<I", size)
+        + pcm
+    )
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def tone(frames: int) -> np.ndarray:
+    return (np.sin(np.arange(frames) / 10) * 16000).astype("<i2")
+
+
+def test_decodes_pcm16():
+    samples = tone(1600)
+    audio = decode_wav(make_wav(samples.tobytes()))
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, samples / 32768, atol=1e-6)
+
+
+def test_byte_by_byte_feed_matches_whole_file():
+    # An odd-sized LIST chunk, padded to an even size
+    list_chunk = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    wav = make_wav(tone(800).tobytes(), extra_chunks=list_chunk)
+    parser = WavStreamParser()
+    for i in range(len(wav)):
+        parser.feed(wav[i : i + 1])
+    np.testing.assert_array_equal(parser.finish(), decode_wav(wav))
+
+
+def test_stereo_is_averaged_to_mono():
+    left = tone(400)
+    right = np.zeros(400, dtype="<i2")
+    pcm = np.stack([left, right], axis=1).tobytes()
+    audio = decode_wav(make_wav(pcm, channels=2))
+    np.testing.assert_allclose(audio, left / 65536, atol=1e-6)
+
+
+def test_resamples_to_target_rate():
+    audio = decode_wav(make_wav(tone(4800).tobytes(), sample_rate=48000))
+    assert len(audio) == 1600
+
+
+@pytest.mark.parametrize("data_size", [0, 0xFFFFFFFF])
+def test_streamed_data_size_reads_to_the_end(data_size):
+    samples = tone(1000)
+    audio = decode_wav(make_wav(samples.tobytes(), data_size=data_size))
+    assert len(audio) == 1000
+
+
+def test_oversized_data_header_does_not_preallocate():
+    samples = tone(1000)
+    parser = WavStreamParser()
+    parser.feed(make_wav(samples.tobytes(), data_size=0xFFFFFFFE))
+    # Capped to a few seconds instead of the 4 GiB the header claims
+    assert len(parser._samples) <= 16000 * 30
+    assert len(parser.finish()) == 1000
+
+
+def test_oversized_fmt_chunk_is_rejected():
+    wav = b"RIFF" + struct.pack("<I", 0) + b"WAVEfmt " + struct.pack("<I", 0xFFFFFFFE)
+    with pytest.raises(ValueError):
+        WavStreamParser().feed(wav)
+
+
+def test_data_after_data_chunk_is_ignored():
+    samples = tone(100)
+    wav = make_wav(samples.tobytes()) + b"junk" * 10
+    assert len(decode_wav(wav)) == 100
+
+
+@pytest.mark.parametrize(
+    "wav",
+    [
+        b"not a wav file at all",
+        b"RIFF\x00\x00\x00\x00WAVEdata\x00\x00\x00\x00",
+        make_wav(b""),
+    ],
+)
+def test_malformed_files_raise_value_error(wav):
+    with pytest.raises(ValueError):
+        decode_wav(wav)
+
+
+def test_utterance_resampler_matches_resampling_the_whole_utterance():
+    audio = np.sin(np.arange(48000) / 7).astype(np.float32)
+    resampler = UtteranceResampler()
+    for start in range(0, len(audio), 4096):
+        resampler.feed(audio[start : start + 4096], 48000)
+    np.testing.assert_array_equal(resampler.flush(), resample(audio, 48000))
+    # The next utterance starts empty
+    assert len(resampler.flush()) == 0
+
+
+def test_utterance_resampler_handles_a_rate_change():
+    resampler = UtteranceResampler()
+    resampler.feed(np.zeros(4800, dtype=np.float32), 48000)
+    resampler.feed(np.zeros(1600, dtype=np.float32), 16000)
+    assert len(resampler.flush()) == 3200
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from open_llm_vtuber.mcpp.schema_cache import DEFAULT_SCHEMA_CACHE_PATH
+from open_llm_vtuber.utils import cache_manager
+from open_llm_vtuber.utils.cache_manager import CacheManager
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(str(tmp_path / "cache"), max_size_mb=0, max_age_seconds=600)
+
+
+def write(path, age, size=100):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    os.utime(path, (NOW - age, NOW - age))
+    return path
+
+
+def owned(cache, name, age, size=100):
+    return write(cache.file_path(name, "TTSEngine"), age, size)
+
+
+def test_owned_files_expire_after_max_age(cache):
+    old = owned(cache, "old.wav", age=600)
+    fresh = owned(cache, "fresh.wav", age=599)
+    assert cache.sweep(now=NOW) == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(fresh)
+
+
+def test_orphans_get_a_grace_period(cache):
+    # Left by a crash or a previous run: nobody owns them
+    cache.max_age_seconds = 60
+    recent = write(os.path.join(cache.directory, "recent.wav"), age=299)
+    stale = write(os.path.join(cache.directory, "stale.wav"), age=300)
+    assert cache.sweep(now=NOW) == 1
+    assert os.path.exists(recent)
+    assert not os.path.exists(stale)
+
+
+def test_files_in_use_are_never_swept(cache):
+    cache.max_age_seconds = 1
+    cache.max_size_mb = 100 / 1024 / 1024
+    young = owned(cache, "young.wav", age=29, size=1000)
+    assert cache.sweep(now=NOW) == 0
+    assert os.path.exists(young)
+
+
+def test_size_quota_removes_the_oldest_files_first(cache):
+    cache.max_age_seconds = 0
+    cache.max_size_mb = 250 / 1024 / 1024
+    paths = [owned(cache, f"{age}.wav", age=age) for age in (100, 400, 200, 50)]
+    assert cache.sweep(now=NOW) == 2
+    assert [os.path.exists(path) for path in paths] == [True, False, False, True]
+
+
+def test_in_memory_cache_is_a_symlink_that_can_be_undone(cache, tmp_path, monkeypatch):
+    memory_root = tmp_path / "shm"
+    memory_root.mkdir()
+    monkeypatch.setattr(cache_manager, "MEMORY_ROOT", str(memory_root))
+    write(os.path.join(cache.directory, "old.wav"), age=0)
+
+    cache.configure(0, 600, 60, in_memory=True)
+    assert os.path.islink(cache.directory)
+    assert os.path.realpath(cache.directory).startswith(str(memory_root))
+    assert os.listdir(cache.directory) == []
+
+    cache.configure(0, 600, 60, in_memory=False)
+    assert not os.path.islink(cache.directory)
+    assert os.path.isdir(cache.directory)
+    assert os.listdir(memory_root) == []
+
+
+def test_nothing_persistent_is_kept_in_the_cache_directory():
+    # The cache directory may be on tmpfs and is wiped at exit
+    cache_dir = os.path.abspath(cache_manager.CACHE_DIR)
+    schemas = os.path.abspath(DEFAULT_SCHEMA_CACHE_PATH)
+    assert os.path.commonpath([cache_dir, schemas]) != cache_dir
+
+
+def test_removed_and_swept_bytes_are_counted(cache):
+    done = owned(cache, "done.wav", age=0, size=300)
+    assert cache.remove(done)
+    assert not cache.remove(done)
+    expired = owned(cache, "expired.wav", age=1000, size=200)
+    owned(cache, "kept.wav", age=0, size=50)
+    assert cache.sweep(now=NOW) == 1
+    assert not os.path.exists(expired)
+
+    stats = cache.stats()
+    assert stats["files"] == 1
+    assert stats["bytes"] == 50
+    assert stats["owners"] == {"TTSEngine": 1}
+    assert stats["bytes_written"] == 300 + 200 + 50
+    assert stats["bytes_reclaimed"] == 300 + 200
+    assert stats["files_swept"] == 1
+
+
+def test_owners_are_forgotten_once_their_files_are_gone(cache):
+    path = owned(cache, "gone.wav", age=0)
+    cache.sweep(now=NOW)
+    os.remove(path)
+    cache.sweep(now=NOW)
+    assert cache.stats()["owners"] == {}
@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+from open_llm_vtuber.client_sender import ClientSender, OutboundPayload
+
+
+class FakeWebSocket:
+    """Records what is sent; `blocked` holds every send until it is set."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+        self.blocked = asyncio.Event()
+        self.blocked.set()
+
+    async def send_text(self, text):
+        await self.blocked.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+def audio(text="hi"):
+    return {"type": "audio", "audio": "A" * 100, "volumes": [0.5], "text": text}
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        json.dumps(audio()),
+        json.dumps(audio(), separators=(",", ":")),
+        json.dumps({"audio": "AAAA", "type": "audio"}),
+        audio(),
+    ],
+)
+def test_audio_is_recognized_whatever_the_serialization(message):
+    assert OutboundPayload(message).is_audio
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        json.dumps({"type": "audio", "audio": None, "text": "silence"}),
+        json.dumps({"type": "full-text", "text": "audio"}),
+        "not json",
+    ],
+)
+def test_other_messages_are_not_audio(message):
+    assert not OutboundPayload(message).is_audio
+
+
+def run_slow_client(policy, messages, max_buffer_bytes=150):
+    """Queue messages while the client reads nothing, then let it catch up."""
+
+    async def main():
+        websocket = FakeWebSocket()
+        websocket.blocked.clear()
+        sender = ClientSender(websocket, "client", max_buffer_bytes, policy)
+        for message in messages:
+            try:
+                await sender.send_json(message)
+            except RuntimeError:
+                # Disconnected
+                break
+            await asyncio.sleep(0)
+        websocket.blocked.set()
+        for _ in range(len(messages) + 3):
+            await asyncio.sleep(0)
+        await sender.stop()
+        return websocket, sender
+
+    return asyncio.run(main())
+
+
+def test_messages_are_sent_in_order():
+    messages = [{"type": "text", "n": i} for i in range(5)]
+    websocket, sender = run_slow_client("keep_text", messages, 10**6)
+    assert websocket.sent == messages
+    assert sender.dropped_audio == 0
+
+
+def test_keep_text_strips_audio_for_a_slow_client():
+    websocket, sender = run_slow_client("keep_text", [audio("a"), audio("b")])
+    assert [m["text"] for m in websocket.sent] == ["a", "b"]
+    assert websocket.sent[0]["audio"] == "A" * 100
+    assert websocket.sent[1]["audio"] is None
+    assert websocket.sent[1]["volumes"] == []
+    assert sender.dropped_audio == 1
+
+
+def test_drop_audio_keeps_other_messages():
+    websocket, sender = run_slow_client(
+        "drop_audio", [audio("a"), audio("b"), {"type": "control"}]
+    )
+    assert [m.get("text", m["type"]) for m in websocket.sent] == ["a", "control"]
+    assert sender.dropped_audio == 1
+    assert websocket.closed_with is None
+
+
+def test_disconnect_closes_the_connection():
+    websocket, sender = run_slow_client("disconnect", [audio("a"), audio("b")])
+    assert websocket.closed_with == 1013
+    with pytest.raises(RuntimeError):
+        sender.enqueue(OutboundPayload({"type": "control"}))
+
+
+def test_text_beyond_the_hard_limit_disconnects_any_policy():
+    messages = [{"type": "text", "text": "x" * 100} for _ in range(8)]
+    websocket, _ = run_slow_client("keep_text", messages)
+    assert websocket.closed_with == 1013
+
+
+def test_stop_leaves_the_websocket_open():
+    async def main():
+        websocket = FakeWebSocket()
+        sender = ClientSender(websocket, "client")
+        await sender.stop()
+        assert websocket.closed_with is None
+        # close() is the WebSocket's
+        await sender.close(code=1000)
+        return websocket
+
+    assert asyncio.run(main()).closed_with == 1000
@@ -0,0 +1,109 @@
+import json
+
+from open_llm_vtuber.live.danmaku_aggregator import (
+    Danmaku,
+    DanmakuAggregator,
+    load_danmaku_log,
+    normalize_text,
+    replay,
+)
+
+
+def test_normalize_text_ignores_case_width_punctuation_and_repeats():
+    assert normalize_text("Ｈｅｌｌｏ, World!") == normalize_text("hello world")
+    assert normalize_text("哈哈哈哈哈") == normalize_text("哈哈哈")
+
+
+def test_duplicates_are_folded_and_counted():
+    aggregator = DanmakuAggregator(window_seconds=2, seed=0)
+    assert aggregator.add(Danmaku("666", "1", "a", 0.0))
+    assert not aggregator.add(Danmaku("666!", "2", "b", 0.1))
+    assert not aggregator.add(Danmaku("６６６", "3", "c", 0.2))
+    assert aggregator.add(Danmaku("hello", "4", "d", 0.3))
+    assert aggregator.stats.duplicates == 2
+    assert aggregator.flush(0.5) == "Chat says:\n- a: 666 (x3)\n- d: hello"
+
+
+def test_near_duplicates_are_folded_above_the_threshold():
+    aggregator = DanmakuAggregator(similarity_threshold=0.8)
+    aggregator.add(Danmaku("what game is this", "1", "", 0.0))
+    assert not aggregator.add(Danmaku("what game is this??", "2", "", 0.1))
+    assert aggregator.add(Danmaku("good evening", "3", "", 0.2))
+
+
+def test_duplicates_expire_after_the_dedup_window():
+    aggregator = DanmakuAggregator(dedup_seconds=10)
+    aggregator.add(Danmaku("hi", "1", "", 0.0))
+    assert aggregator.add(Danmaku("hi", "2", "", 10.0))
+
+
+def test_users_are_rate_limited():
+    aggregator = DanmakuAggregator(user_messages_per_minute=2)
+    results = [
+        aggregator.add(Danmaku(text, "1", "", float(i)))
+        for i, text in enumerate(["hello", "nice play", "what game"])
+    ]
+    assert results == [True, True, False]
+    assert aggregator.stats.rate_limited == 1
+    # A minute later the user may talk again
+    assert aggregator.add(Danmaku("good night", "1", "", 60.0))
+
+
+def test_a_single_message_is_forwarded_as_is():
+    aggregator = DanmakuAggregator()
+    aggregator.add(Danmaku("hello there", "1", "alice", 0.0))
+    assert aggregator.flush(0.0) == "hello there"
+
+
+def test_digests_wait_for_the_window_and_the_turn():
+    aggregator = DanmakuAggregator(window_seconds=2)
+    aggregator.add(Danmaku("first", "1", "", 0.0))
+    assert aggregator.flush(0.0) == "first"
+    aggregator.turn_started(0.0)
+    aggregator.add(Danmaku("second", "2", "", 0.5))
+    # The VTuber is answering
+    assert aggregator.seconds_until_due(1.0) is None
+    assert aggregator.flush(3.0) is None
+    aggregator.turn_finished(5.0)
+    # The window grew to the duration of the turn
+    assert aggregator.current_window == 5.0
+    assert aggregator.seconds_until_due(5.0) == 0.0
+    assert aggregator.flush(5.0) == "second"
+
+
+def test_a_missed_turn_end_does_not_stall_forever():
+    aggregator = DanmakuAggregator(window_seconds=2, max_window_seconds=10)
+    aggregator.turn_started(0.0)
+    aggregator.add(Danmaku("hello", "1", "", 1.0))
+    assert aggregator.seconds_until_due(5.0) is None
+    assert aggregator.seconds_until_due(10.0) == 0.0
+
+
+def test_large_windows_are_sampled_into_one_digest():
+    aggregator = DanmakuAggregator(
+        digest_size=3, user_messages_per_minute=0, seed=1, similarity_threshold=1
+    )
+    for i in range(50):
+        aggregator.add(Danmaku(f"message {i}", str(i), "", i * 0.01))
+    digest = aggregator.flush(1.0)
+    lines = digest.splitlines()
+    assert lines[0] == "Chat says:"
+    assert len(lines) == 1 + 3 + 1
+    assert lines[-1] == "(+47 more)"
+    assert aggregator.stats.sampled_out == 50 - 12
+
+
+def test_replay_of_a_recorded_log():
+    records = [
+        {"time": i * 0.2, "uid": str(i % 7), "uname": f"u{i % 7}", "text": f"m{i}"}
+        for i in range(40)
+    ]
+    messages = list(load_danmaku_log(json.dumps(r) for r in records))
+    assert messages[3] == Danmaku("m3", "3", "u3", records[3]["time"])
+
+    digests = replay(DanmakuAggregator(seed=0), messages, turn_seconds=3.0)
+    times = [t for t, _ in digests]
+    assert times == sorted(times)
+    # Never more often than the turn takes, once the first turn is measured
+    assert all(b - a >= 3.0 for a, b in zip(times[1:], times[2:]))
+    assert len(digests) < len(messages)
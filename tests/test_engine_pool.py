@@ -0,0 +1,56 @@
+from open_llm_vtuber.engine_pool import EnginePool
+from open_llm_vtuber.init_planner import DeferredASR, DeferredTranslator, EngineStatus
+
+
+class FakeASR:
+    def __init__(self):
+        self.closed = False
+
+    def transcribe_np(self, audio):
+        return "hello"
+
+    def memory_bytes(self):
+        return 1024
+
+    def close(self):
+        self.closed = True
+
+
+def deferred_asr(built):
+    def create():
+        engine = FakeASR()
+        built.append(engine)
+        return engine
+
+    return DeferredASR(EngineStatus("asr"), create)
+
+
+def test_acquiring_and_evicting_a_deferred_engine_does_not_load_it():
+    built = []
+    pool = EnginePool(memory_budget_mb=0)
+    engine = pool.acquire("asr", {"model": "a"}, lambda: deferred_asr(built))
+    assert engine._loader.status.state == "deferred"
+    # Idle with a budget of 0: evicted and closed right away
+    pool.release(engine)
+    assert pool.stats()["engines"] == []
+    assert built == []
+    assert engine._loader.status.state == "deferred"
+
+
+def test_a_loaded_deferred_engine_reports_memory_and_closes():
+    built = []
+    engine = deferred_asr(built)
+    assert engine.memory_bytes() == 0
+    assert engine.transcribe_np(None) == "hello"
+    assert engine._loader.status.state == "ready"
+    assert engine.memory_bytes() == 1024
+    engine.close()
+    assert built[0].closed
+
+
+def test_a_deferred_translator_is_not_loaded_by_probing():
+    built = []
+    translator = DeferredTranslator(EngineStatus("translate"), built.append)
+    translator.close()
+    assert translator.memory_bytes() == 0
+    assert built == []
@@ -0,0 +1,124 @@
+import asyncio
+
+from open_llm_vtuber.proxy_message_queue import (
+    PRIORITY_NORMAL,
+    PRIORITY_SUPER_CHAT,
+    ProxyMessageQueue,
+    message_priority,
+)
+
+
+def text(value, source=None):
+    message = {"type": "text-input", "text": value}
+    if source is not None:
+        message["source"] = source
+    return message
+
+
+def queued_texts(queue):
+    return [
+        item.message["text"]
+        for priority in sorted(queue.message_queue, reverse=True)
+        for item in queue.message_queue[priority]
+    ]
+
+
+def test_priority_comes_from_the_source():
+    assert message_priority(text("a")) == PRIORITY_NORMAL
+    assert message_priority(text("a", "super_chat")) == PRIORITY_SUPER_CHAT
+    assert message_priority(text("a", "unknown")) == PRIORITY_NORMAL
+    assert message_priority(text("a", ["super_chat"])) == PRIORITY_NORMAL
+    # Clients cannot pick a priority, nor break the queue with a bad one
+    assert message_priority({"text": "a", "priority": "high"}) == PRIORITY_NORMAL
+    assert message_priority({"text": "a", "priority": 1000}) == PRIORITY_NORMAL
+
+
+def test_drop_lowest_evicts_the_oldest_normal_message():
+    queue = ProxyMessageQueue(max_length=2, eviction_policy="drop_lowest")
+    queue.queue_message(text("a"))
+    queue.queue_message(text("sc", "super_chat"))
+    queue.queue_message(text("b"))
+    assert queued_texts(queue) == ["sc", "b"]
+    assert queue.dropped_count == 1
+
+
+def test_drop_lowest_drops_a_new_message_below_everything_queued():
+    queue = ProxyMessageQueue(max_length=1, eviction_policy="drop_lowest")
+    queue.queue_message(text("sc", "super_chat"))
+    queue.queue_message(text("a"))
+    assert queued_texts(queue) == ["sc"]
+    assert queue.dropped_count == 1
+
+
+def test_drop_oldest_ignores_priority():
+    queue = ProxyMessageQueue(max_length=2, eviction_policy="drop_oldest")
+    queue.queue_message(text("sc", "super_chat"))
+    queue.queue_message(text("a"))
+    queue.queue_message(text("b"))
+    assert queued_texts(queue) == ["a", "b"]
+
+
+def test_reject_new_keeps_the_queue():
+    queue = ProxyMessageQueue(max_length=2, eviction_policy="reject_new")
+    for value in "abc":
+        queue.queue_message(text(value))
+    assert queued_texts(queue) == ["a", "b"]
+    assert queue.dropped_count == 1
+
+
+def run_consumer(queue, messages):
+    """Queue messages while a conversation is active, then let them through."""
+
+    async def run():
+        forwarded = []
+
+        async def forward(message, sender_id):
+            if message["type"] == "text-input":
+                forwarded.append((message, sender_id))
+
+        queue.initialize(forward)
+        queue.conversation_active = True
+        for message, sender_id in messages:
+            queue.queue_message(message, sender_id)
+        queue.conversation_active = False
+        while queue.has_pending_messages() or queue.conversation_active:
+            await asyncio.sleep(0.01)
+            # Every forwarded turn ends at once
+            queue.conversation_active = False
+        await asyncio.sleep(0.01)
+        queue.stop()
+        return forwarded
+
+    return asyncio.run(run())
+
+
+def test_consumer_forwards_by_priority_then_in_order():
+    forwarded = run_consumer(
+        ProxyMessageQueue(),
+        [(text("a"), None), (text("b"), None), (text("sc", "super_chat"), None)],
+    )
+    assert [message["text"] for message, _ in forwarded] == ["sc", "a", "b"]
+
+
+def test_coalescing_merges_waiting_messages():
+    forwarded = run_consumer(
+        ProxyMessageQueue(coalesce_max=2),
+        [(text("a"), "u1"), (text("b"), "u1"), (text("c"), "u2")],
+    )
+    assert [message["text"] for message, _ in forwarded] == ["a\nb", "c"]
+    assert forwarded[0][0]["coalesced_count"] == 2
+    # One sender: the transcription is not echoed back to them
+    assert forwarded[0][1] == "u1"
+
+
+def test_coalescing_different_senders_has_no_single_sender():
+    forwarded = run_consumer(
+        ProxyMessageQueue(coalesce_max=5),
+        [(text("a"), "u1"), (text("b"), "u2")],
+    )
+    assert forwarded == [
+        (
+            {"type": "text-input", "text": "a\nb", "coalesced_count": 2},
+            None,
+        )
+    ]
@@ -0,0 +1,80 @@
+import pytest
+
+from open_llm_vtuber.mcpp import result_cache
+from open_llm_vtuber.mcpp.result_cache import ToolResultCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def result(text):
+    return {"text_content": text, "metadata": {}, "content_items": []}
+
+
+def test_keys_ignore_argument_order():
+    key = ToolResultCache.make_key
+    assert key("ddg", "search", {"q": "x", "n": 5}) == key(
+        "ddg", "search", {"n": 5, "q": "x"}
+    )
+    assert key("ddg", "search", {"q": "x"}) != key("ddg", "fetch", {"q": "x"})
+    assert key("ddg", "search", {"q": "x"}) != key("web", "search", {"q": "x"})
+
+
+def test_results_expire_after_their_ttl(clock):
+    cache = ToolResultCache()
+    cache.put("k", result("a"), ttl_seconds=60)
+    clock[0] += 59
+    assert cache.get("k") == result("a")
+    clock[0] += 1
+    assert cache.get("k") is None
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 1, "misses": 1}
+
+
+def test_non_positive_ttl_is_not_cached():
+    cache = ToolResultCache()
+    cache.put("k", result("a"), ttl_seconds=0)
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ToolResultCache(max_entries=2)
+    cache.put("a", result("a"), 60)
+    cache.put("b", result("b"), 60)
+    cache.get("a")
+    cache.put("c", result("c"), 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == result("a")
+    assert cache.get("c") == result("c")
+
+
+def test_size_bound_evicts_and_rejects_oversized_results():
+    cache = ToolResultCache()
+    cache.put("probe", result("x" * 100), 60)
+    entry_size = cache.stats()["bytes"]
+
+    cache = ToolResultCache(max_bytes=entry_size * 2)
+    cache.put("a", result("a" * 100), 60)
+    cache.put("b", result("b" * 100), 60)
+    cache.put("c", result("c" * 100), 60)
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == entry_size * 2
+    assert cache.get("a") is None
+
+    cache.put("huge", result("x" * entry_size * 3), 60)
+    assert cache.get("huge") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_replacing_an_entry_keeps_the_byte_count_right():
+    cache = ToolResultCache()
+    cache.put("k", result("short"), 60)
+    cache.put("k", result("a much longer result"), 60)
+    fresh = ToolResultCache()
+    fresh.put("k", result("a much longer result"), 60)
+    assert cache.stats()["bytes"] == fresh.stats()["bytes"]
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
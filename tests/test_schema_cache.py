@@ -0,0 +1,77 @@
+import asyncio
+
+from open_llm_vtuber.mcpp.schema_cache import ToolSchemaCache
+from open_llm_vtuber.mcpp.types import MCPServer
+
+TOOLS = [{"name": "search", "description": "Search", "inputSchema": {}}]
+
+
+def test_tools_are_persisted_per_server_definition(tmp_path):
+    path = tmp_path / "tool_schemas.json"
+    server = MCPServer("search", "uvx", args=["search-server"])
+    cache = ToolSchemaCache(path)
+    assert cache.get_tools(server) is None
+    assert cache.put_tools(server, TOOLS)
+    assert not cache.put_tools(server, TOOLS)
+
+    reloaded = ToolSchemaCache(path)
+    assert reloaded.get_tools(server) == TOOLS
+    # A changed definition misses the cache
+    changed = MCPServer("search", "uvx", args=["search-server", "--fast"])
+    assert reloaded.get_tools(changed) is None
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = tmp_path / "tool_schemas.json"
+    path.write_text("{not json")
+    cache = ToolSchemaCache(path)
+    assert cache.get_tools(MCPServer("a", "cmd")) is None
+
+
+def test_revalidation_waits_for_the_server_loop(tmp_path):
+    cache = ToolSchemaCache(tmp_path / "tool_schemas.json")
+    server = MCPServer("a", "cmd")
+    runs = []
+
+    async def revalidate():
+        runs.append(asyncio.get_running_loop())
+        cache.mark_revalidated(server)
+
+    async def initialize():
+        # Like `asyncio.run(server.initialize())`: this loop ends right away
+        assert cache.needs_revalidation(server)
+        cache.schedule_revalidation([server], revalidate)
+        assert not cache.needs_revalidation(server)
+
+    asyncio.run(initialize())
+    assert runs == []
+
+    async def serve():
+        await cache.start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert runs == [asyncio.get_running_loop()]
+        await cache.stop()
+
+    asyncio.run(serve())
+    assert not cache.needs_revalidation(server)
+
+
+def test_failed_revalidation_is_retried(tmp_path):
+    cache = ToolSchemaCache(tmp_path / "tool_schemas.json")
+    server = MCPServer("a", "cmd")
+
+    async def fail():
+        raise RuntimeError("server did not start")
+
+    async def serve():
+        await cache.start()
+        cache.schedule_revalidation([server], fail)
+        # Scheduled on the running server loop at once
+        assert len(cache._tasks) == 1
+        await asyncio.gather(*cache._tasks, return_exceptions=True)
+        await cache.stop()
+
+    asyncio.run(serve())
+    # Not marked: the next session asks for it again
+    assert cache.needs_revalidation(server)
@@ -0,0 +1,119 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from open_llm_vtuber.agent.transformers import actions_extractor
+from open_llm_vtuber.utils.sentence_divider import (
+    DeltaFilter,
+    SentenceDivider,
+    SentenceWithTags,
+    stream_text_deltas,
+)
+
+
+async def tokens(items):
+    for item in items:
+        yield item
+
+
+def divide(items, divider=None, deltas=False):
+    divider = divider or SentenceDivider(
+        faster_first_response=False, valid_tags=["think"]
+    )
+
+    async def run():
+        token = stream_text_deltas.set(deltas)
+        try:
+            return [item async for item in divider.process_stream(tokens(items))]
+        finally:
+            stream_text_deltas.reset(token)
+
+    return asyncio.run(run())
+
+
+def sentences(items):
+    return [item for item in items if isinstance(item, SentenceWithTags)]
+
+
+def deltas(items):
+    return [item for item in items if isinstance(item, dict)]
+
+
+def test_tokens_are_divided_into_sentences():
+    result = divide(["Hello there. How", " are you? Fine"])
+    assert [s.text for s in sentences(result)] == [
+        "Hello there.",
+        "How are you?",
+        "Fine",
+    ]
+    assert deltas(result) == []
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        ["[joy]"],
+        ["[jo", "y] hi"],
+        ["[", "J", "OY", "]"],
+    ],
+)
+def test_delta_filter_removes_markers_split_across_tokens(chunks):
+    markers = DeltaFilter(["[joy]"])
+    shown = "".join(markers.feed(chunk) for chunk in chunks) + markers.flush()
+    assert shown == "".join(chunks)[5:]
+
+
+def test_delta_filter_releases_what_is_not_a_marker():
+    markers = DeltaFilter(["[joy]"])
+    assert markers.feed("a [jo") == "a "
+    assert markers.feed("b]") == "[job]"
+    assert markers.feed("[j") == ""
+    assert markers.flush() == "[j"
+
+
+def test_delta_filter_drops_hidden_spans():
+    markers = DeltaFilter(["<think/>"], hidden={"<think>": "</think>"})
+    chunks = ["Hi <thi", "nk>secret", " plans</think", "> there <think/>!"]
+    assert "".join(markers.feed(chunk) for chunk in chunks) == "Hi  there !"
+
+
+def test_deltas_hide_think_content_and_match_sentence_ids():
+    result = divide(
+        ["<think>Let me", " think.</think>", "Hello", " there. How", " are you?"],
+        deltas=True,
+    )
+    assert "".join(d["text"] for d in deltas(result)) == "Hello there. How are you?"
+    ids = {s.text: s.sentence_id for s in sentences(result)}
+    # Tag markers take no id, so ids follow the sentences deltas were sent for
+    assert ids == {
+        "<think>": None,
+        "Let me think.": 0,
+        "</think>": None,
+        "Hello there.": 1,
+        "How are you?": 2,
+    }
+    # " there. How" spans a boundary and goes to the first sentence
+    assert [d["sentence_id"] for d in deltas(result)] == [1, 1, 2]
+
+
+def test_actions_extractor_removes_emotion_keys_from_deltas():
+    live2d_model = SimpleNamespace(
+        emo_map={"joy": 3}, extract_emotion=lambda text: [3] if "[joy]" in text else []
+    )
+
+    divided = divide(["[jo", "y] Hello", " there. [", "sad"], deltas=True)
+
+    @actions_extractor(live2d_model)
+    async def pipeline():
+        for item in divided:
+            yield item
+
+    async def run():
+        return [item async for item in pipeline()]
+
+    result = asyncio.run(run())
+    delta_texts = [item["text"] for item in result if isinstance(item, dict)]
+    assert "".join(delta_texts) == " Hello there. [sad"
+    actions = [item[1] for item in result if isinstance(item, tuple)]
+    assert actions[0].expressions == [3]
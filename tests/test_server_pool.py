@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from open_llm_vtuber.mcpp import server_pool
+from open_llm_vtuber.mcpp.server_pool import MCPServerPool
+from open_llm_vtuber.mcpp.types import MCPServer
+
+
+@pytest.fixture
+def fake_servers(monkeypatch):
+    """Replace the stdio server process with a session object per start."""
+    started = []
+
+    async def run(self, ready, stop):
+        session = object()
+        started.append(session)
+        self.session = session
+        ready.set_result(session)
+        try:
+            await stop.wait()
+        finally:
+            self.session = None
+
+    monkeypatch.setattr(server_pool._PooledServer, "_run", run)
+    return started
+
+
+def test_sessions_share_one_server(fake_servers):
+    pool = MCPServerPool()
+    server = MCPServer("search", "uvx")
+
+    async def main():
+        pool.lease(server)
+        first = await pool.get_session(server)
+        second = await pool.get_session(MCPServer("search", "uvx"))
+        await pool.close()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert len(fake_servers) == 1
+
+
+def test_server_started_in_another_loop_is_replaced_not_restarted(fake_servers):
+    pool = MCPServerPool()
+    server = MCPServer("search", "uvx")
+
+    async def initialize():
+        # Tools are listed inside the `asyncio.run` of initialization
+        pool.lease(server)
+        await pool.get_session(server)
+        pool.release(server)
+
+    asyncio.run(initialize())
+
+    async def serve():
+        session = await pool.get_session(server)
+        stats = pool.stats()
+        await pool.close()
+        return session, stats
+
+    session, stats = asyncio.run(serve())
+    assert session is fake_servers[-1]
+    assert len(fake_servers) == 2
+    assert stats == {"search": {"running": True, "leases": 0, "restarts": 0}}
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from open_llm_vtuber.utils.sentence_divider import SentenceDivider
+from open_llm_vtuber.utils.speech_pacing import (
+    MIN_MERGE_CHARS,
+    SpeechPacer,
+    TTSRateTracker,
+)
+
+
+class Engine:
+    """Stands in for a TTS engine; the tracker only keeps weak references."""
+
+
+@pytest.fixture
+def engine():
+    return Engine()
+
+
+@pytest.fixture
+def tracker(engine):
+    tracker = TTSRateTracker()
+    # 0.01 s to synthesize and 0.1 s of audio per character
+    tracker.record(engine, chars=100, synthesis_seconds=1.0, audio_seconds=10.0)
+    return tracker
+
+
+def divide(text_chunks, pacer):
+    divider = SentenceDivider(faster_first_response=False, pacer=pacer)
+
+    async def tokens():
+        for chunk in text_chunks:
+            yield chunk
+
+    async def run():
+        return [s.text async for s in divider.process_stream(tokens())]
+
+    return asyncio.run(run())
+
+
+def test_rates_are_moving_averages_per_engine(engine, tracker):
+    tracker.record(engine, chars=100, synthesis_seconds=2.0, audio_seconds=10.0)
+    rates = tracker.get(engine)
+    assert rates.synthesis_per_char == pytest.approx(0.01 + 0.3 * 0.01)
+    assert rates.audio_per_char == pytest.approx(0.1)
+    assert tracker.get(Engine()) is None
+    assert tracker.get(None) is None
+
+
+def test_empty_measurements_are_ignored(engine, tracker):
+    tracker.record(engine, chars=0, synthesis_seconds=5.0, audio_seconds=1.0)
+    tracker.record(engine, chars=10, synthesis_seconds=5.0, audio_seconds=0.0)
+    assert tracker.get(engine).synthesis_per_char == pytest.approx(0.01)
+
+
+def test_an_unmeasured_engine_gives_no_advice(tracker):
+    pacer = SpeechPacer(Engine(), tracker)
+    assert pacer.runway_seconds() is None
+    assert not pacer.should_split_early()
+    assert pacer.merge_target_chars() == 0
+
+
+def test_runway_counts_unplayed_and_pending_audio(engine, tracker):
+    pacer = SpeechPacer(engine, tracker)
+    pacer.audio_sent(2.0, now=100.0)
+    # Queued after what the client has not played yet
+    pacer.audio_sent(1.0, now=101.0)
+    assert pacer.buffered_seconds(now=101.0) == pytest.approx(2.0)
+    pacer.sentence_queued(30)
+    assert pacer.runway_seconds(now=101.0) == pytest.approx(2.0 + 3.0)
+    pacer.sentence_finished(30)
+    assert pacer.runway_seconds(now=104.0) == 0.0
+
+
+def test_short_runway_splits_early_and_long_runway_merges(engine, tracker):
+    pacer = SpeechPacer(engine, tracker, max_chunk_chars=150)
+    assert pacer.should_split_early(now=0.0)
+    assert pacer.merge_target_chars(now=0.0) == 0
+
+    pacer.audio_sent(3.0, now=0.0)
+    assert not pacer.should_split_early(now=0.0)
+    # Half of 3 s of runway at 0.01 s per character
+    assert pacer.merge_target_chars(now=0.0) == 150
+    assert pacer.merge_target_chars(now=2.0) == 0
+    assert pacer.merge_target_chars(now=1.0) == 100 >= MIN_MERGE_CHARS
+
+
+def test_divider_cuts_at_commas_when_the_runway_is_short(engine, tracker):
+    pacer = SpeechPacer(engine, tracker)
+    assert divide(["Well, I think", " so, yes. Ok."], pacer) == [
+        "Well,",
+        "I think so,",
+        "yes.",
+        "Ok.",
+    ]
+
+
+def test_divider_merges_sentences_up_to_the_chunk_limit(engine, tracker):
+    pacer = SpeechPacer(engine, tracker, max_chunk_chars=100)
+    pacer.sentence_queued(100)
+    sentence = "I am fine, thanks for asking."
+    chunks = divide(
+        ["Hello there. ", "How are you? ", f"{sentence} " * 5, "Bye."], pacer
+    )
+    assert " ".join(chunks) == " ".join(
+        ["Hello there.", "How are you?"] + [sentence] * 5 + ["Bye."]
+    )
+    assert [len(chunk) for chunk in chunks] == [85, 89, 4]
+
+
+def test_divider_keeps_its_fixed_policy_without_measurements():
+    chunks = divide(["Well, I think so. Ok."], SpeechPacer(Engine(), TTSRateTracker()))
+    assert chunks == ["Well, I think so.", "Ok."]
@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from open_llm_vtuber.utils.stream_audio import (
+    MP3StreamDecoder,
+    incremental_mp3_available,
+)
+
+
+@pytest.fixture
+def mp3_bytes():
+    tone = (np.sin(np.arange(24000) / 5) * 0.5).astype(np.float32)
+    buffer = io.BytesIO()
+    try:
+        sf.write(buffer, tone, 24000, format="MP3")
+    except (sf.LibsndfileError, ValueError, TypeError):
+        pytest.skip("libsndfile cannot write MP3")
+    return buffer.getvalue()
+
+
+def decode_in_chunks(data, chunk_size=512):
+    decoder = MP3StreamDecoder()
+    chunks = []
+    for start in range(0, len(data), chunk_size):
+        chunks.extend(decoder.feed(data[start : start + chunk_size]))
+    chunks.extend(decoder.flush())
+    return decoder, chunks
+
+
+def test_decoder_reports_whether_it_is_incremental():
+    assert MP3StreamDecoder().incremental == incremental_mp3_available()
+
+
+def test_mp3_stream_is_decoded_to_mono_float32(mp3_bytes):
+    decoder, chunks = decode_in_chunks(mp3_bytes)
+    audio = np.concatenate(chunks)
+    assert decoder.sample_rate == 24000
+    assert audio.dtype == np.float32
+    # Encoder delay and padding add a few frames at most
+    assert 24000 <= len(audio) <= 24000 + 4 * 1152
+    assert np.abs(audio).max() == pytest.approx(0.5, abs=0.1)
+
+
+def test_incremental_decoding_yields_audio_before_the_end(mp3_bytes):
+    if not incremental_mp3_available():
+        pytest.skip("PyAV is not installed")
+    decoder = MP3StreamDecoder()
+    half = len(mp3_bytes) // 2
+    assert sum(len(chunk) for chunk in decoder.feed(mp3_bytes[:half])) > 0
+
+
+def test_frames_are_grouped_into_chunks_of_a_minimum_duration(mp3_bytes):
+    if not incremental_mp3_available():
+        pytest.skip("PyAV is not installed")
+    decoder, chunks = decode_in_chunks(mp3_bytes)
+    # 1 s of audio in ~24 ms frames: a handful of messages, not dozens
+    assert 2 <= len(chunks) <= 4
+    assert all(len(chunk) >= 0.25 * 24000 for chunk in chunks[:-1])
@@ -0,0 +1,96 @@
+import asyncio
+
+from open_llm_vtuber.conversations.tts_manager import (
+    OrderedDelivery,
+    synthesize_in_order,
+)
+
+
+def test_ordered_delivery_holds_later_sequences():
+    delivery = OrderedDelivery()
+    delivery.add(1, "b")
+    assert delivery.pop_ready() == []
+    delivery.add(0, "a")
+    assert delivery.pop_ready() == [(0, ["a"], True), (1, ["b"], True)]
+    assert delivery.next_sequence == 2
+
+
+def test_ordered_delivery_streams_the_sequence_next_in_line():
+    delivery = OrderedDelivery()
+    delivery.add(0, "a1", final=False)
+    assert delivery.pop_ready() == [(0, ["a1"], False)]
+    delivery.add(1, "b")
+    delivery.add(0, "a2", final=False)
+    assert delivery.pop_ready() == [(0, ["a2"], False)]
+    delivery.add(0, None)
+    assert delivery.pop_ready() == [(0, [], True), (1, ["b"], True)]
+
+
+def test_ordered_delivery_pending_returns_unreleased_items():
+    delivery = OrderedDelivery()
+    delivery.add(2, "c")
+    delivery.add(1, "b")
+    assert delivery.pending() == ["b", "c"]
+    assert delivery.pending() == []
+
+
+class FakeEngine:
+    """Finishes sentences in reverse order of length, fails on "fail"."""
+
+    def __init__(self):
+        self.removed = []
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        await asyncio.sleep(0.01 / len(text))
+        if text == "fail":
+            raise RuntimeError("boom")
+        if text == "none":
+            return None
+        return f"cache/{text}.wav"
+
+    def remove_file(self, path, verbose=True):
+        self.removed.append(path)
+
+
+def collect(engine, sentences, limit=None):
+    async def run():
+        results = []
+        generator = synthesize_in_order(engine, sentences, max_concurrency=2)
+        async for result in generator:
+            results.append(result)
+            if limit is not None and len(results) == limit:
+                break
+        await generator.aclose()
+        # Let the cancelled tasks finish
+        await asyncio.sleep(0.05)
+        return results
+
+    return asyncio.run(run())
+
+
+def test_synthesize_in_order_yields_in_sentence_order():
+    engine = FakeEngine()
+    results = collect(engine, ["a", "bbbb", "cc"])
+    assert [r.index for r in results] == [0, 1, 2]
+    assert [r.audio_path for r in results] == [
+        "cache/a.wav",
+        "cache/bbbb.wav",
+        "cache/cc.wav",
+    ]
+    assert engine.removed == []
+
+
+def test_synthesize_in_order_reports_failures_and_missing_audio():
+    results = collect(FakeEngine(), ["ok", "fail", "none"])
+    assert results[0].error is None
+    assert isinstance(results[1].error, RuntimeError)
+    assert isinstance(results[2].error, RuntimeError)
+    assert results[2].audio_path is None
+
+
+def test_synthesize_in_order_removes_undelivered_files():
+    engine = FakeEngine()
+    # The first sentence is the slowest, the others wait for it
+    results = collect(engine, ["a", "bbbbbb", "cccccc"], limit=1)
+    assert [r.audio_path for r in results] == ["cache/a.wav"]
+    assert sorted(engine.removed) == ["cache/bbbbbb.wav", "cache/cccccc.wav"]